@@ -1,3 +1,4 @@
+from datetime import datetime, timedelta
 from pathlib import Path
 from types import ModuleType
 from celery.schedules import crontab
@@ -32,6 +33,43 @@ DATABASES = (
         }
     }
 )
+# Caches. The "api" cache holds the serialized API responses, see
+# `api.cache`. Its keys include the versions of the data, so its entries
+# never go stale and are only evicted to make room. Set API_CACHE_LOCATION in
+# the local secrets to the url of a Redis database, like
+# "redis://127.0.0.1:6379/1", to enable it; without one the responses are not
+# cached.
+API_CACHE_LOCATION: str | None = getattr(
+    local_secrets, "API_CACHE_LOCATION", None
+)
+CACHES = getattr(
+    local_secrets,
+    "CACHES",
+    {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+        "api": (
+            {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": API_CACHE_LOCATION,
+                "TIMEOUT": 60 * 60 * 24,
+                "OPTIONS": {
+                    "socket_connect_timeout": 0.5,
+                    "socket_timeout": 0.5,
+                },
+            }
+            if API_CACHE_LOCATION
+            else {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+        ),
+    },
+)
+# Seconds the API response cache is skipped after it failed.
+API_CACHE_RETRY_AFTER = 30
+# Rows read from the database at a time by the streaming exports, see
+# `api.export`.
+API_EXPORT_CHUNK_SIZE = 2000
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -140,6 +178,9 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+# Media files, used for the PCA loading matrices stored as files.
+MEDIA_ROOT = BASE_DIR / "media"
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -157,9 +198,58 @@ CELERY_BEAT_SCHEDULE = {
         "task": "scraper.tasks.run_scheduled_pca_analysis",
         "schedule": crontab(minute=45, hour=0),
     },
+    "prune_pca_analyses": {
+        "task": "scraper.tasks.prune_pca_analyses",
+        "schedule": crontab(minute=15, hour=1),
+    },
 }
 CELERY_BROKER_URL = "redis://127.0.0.1:6379/0"
 
+# Import Settings
+# Base url of the Parliament OData API. Point it at a local stand-in (see
+# `manage.py odata_standin`) to test imports offline.
+PARLIAMENT_API_URL = "https://gegevensmagazijn.tweedekamer.nl/OData/v4/2.0/"
+# Besluit records modified after this date are imported by a full import.
+IMPORT_START_DATE = datetime.fromisoformat("2025-11-01T00:00:00+01:00")
+# Incremental imports re-request records modified this long before the
+# watermark of the previous import, to catch late upstream writes.
+IMPORT_WATERMARK_OVERLAP = timedelta(hours=6)
+
+# Analyzer Settings
+# PCA engine used by the analysis, see `analyzer.pca_engine`. Use
+# {"BACKEND": "pca"} for the third-party pca package (requirements/dev.txt).
+ANALYZER_PCA_ENGINE = {"BACKEND": "svd", "OPTIONS": {}}
+# Seconds the id of the latest analysis is cached. The id is cached per
+# analysis data version, so a new analysis is picked up by all processes as
+# soon as it is committed.
+ANALYZER_LATEST_ANALYSIS_CACHE_TIMEOUT = 300
+# Number of key items stored per analysis, overall and per component.
+ANALYZER_KEY_ITEMS_TOP_K = 10
+# How the item loadings of an analysis are stored: "rows" for a
+# PCAItemLoading row per item and component, "db" for a compact float32
+# matrix in the database or "file" for the matrix as an .npy file in
+# MEDIA_ROOT. See `analyzer.loadings`.
+ANALYZER_LOADINGS_STORAGE = "rows"
+# Incremental analyses update the SVD of the previous analysis with the new
+# items (see `analyzer.incremental`). A full refit is done every
+# REFIT_EVERY, and when the components rotated more than DRIFT_THRESHOLD
+# (0 to 1) since the last refit.
+ANALYZER_INCREMENTAL = {
+    "ENABLED": False,
+    "REFIT_EVERY": timedelta(days=7),
+    "DRIFT_THRESHOLD": 0.05,
+}
+# Which analyses `prune_pca_analyses` keeps, see `analyzer.retention`:
+# the KEEP_LAST most recent ones, the last one of each of the past
+# KEEP_DAILY_DAYS days and the last one of each of the past
+# KEEP_MONTHLY_MONTHS months (None keeps one per month forever). Pinned
+# analyses and the latest analysis are always kept.
+ANALYZER_RETENTION = {
+    "KEEP_LAST": 7,
+    "KEEP_DAILY_DAYS": 30,
+    "KEEP_MONTHLY_MONTHS": None,
+}
+
 
 # Debug Toolbar Settings
 INTERNAL_IPS = [
@@ -1,15 +1,34 @@
 from django.contrib import admin
-from analyzer.models import PCAAnalysis, PCAComponentPartyScore, PCAItemLoading
+from django.utils.html import format_html_join
+from django.utils.safestring import mark_safe
+from analyzer.loadings import read_loading_matrix
+from analyzer.models import (
+    KeyItemRanking,
+    PCAAnalysis,
+    PCAComponentPartyScore,
+    PCAItemLoading,
+    PCALoadingMatrix,
+)
+from scraper.admin import VersionedDataAdmin
+from scraper.versions import ANALYSIS_DATA
 
 
 @admin.register(PCAAnalysis)
 class PCAAnalysisAdmin(admin.ModelAdmin):
-    list_display = ["id", "created_at"]
-    readonly_fields = ["created_at"]
+    list_display = ["id", "created_at", "pinned"]
+    list_editable = ["pinned"]
+    list_filter = ["pinned"]
+    readonly_fields = [
+        "created_at",
+        "explained_variance",
+        "participation_rates",
+        "metrics",
+    ]
 
 
 @admin.register(PCAComponentPartyScore)
-class PCAComponentPartyScoreAdmin(admin.ModelAdmin):
+class PCAComponentPartyScoreAdmin(VersionedDataAdmin):
+    data_versions = (ANALYSIS_DATA,)
     list_display = ["analysis", "party", "component", "score"]
     list_filter = ["component", "party"]
     search_fields = ["party__name", "party__abbreviation", "analysis__id"]
@@ -18,7 +37,8 @@ class PCAComponentPartyScoreAdmin(admin.ModelAdmin):
 
 
 @admin.register(PCAItemLoading)
-class PCAItemLoadingAdmin(admin.ModelAdmin):
+class PCAItemLoadingAdmin(VersionedDataAdmin):
+    data_versions = (ANALYSIS_DATA,)
     list_display = ["analysis", "parliamentary_item", "component", "loading"]
     list_filter = ["component"]
     search_fields = [
@@ -27,3 +47,45 @@ class PCAItemLoadingAdmin(admin.ModelAdmin):
     ]
     raw_id_fields = ["analysis", "parliamentary_item"]
     readonly_fields = ["loading", "component"]
+
+
+@admin.register(KeyItemRanking)
+class KeyItemRankingAdmin(VersionedDataAdmin):
+    data_versions = (ANALYSIS_DATA,)
+    list_display = [
+        "analysis",
+        "component",
+        "rank",
+        "parliamentary_item",
+        "total_loading",
+    ]
+    list_filter = ["component"]
+    search_fields = [
+        "parliamentary_item__title",
+        "parliamentary_item__api_id",
+    ]
+    raw_id_fields = ["analysis", "parliamentary_item"]
+    readonly_fields = ["component", "rank", "total_loading"]
+
+
+@admin.register(PCALoadingMatrix)
+class PCALoadingMatrixAdmin(VersionedDataAdmin):
+    data_versions = (ANALYSIS_DATA,)
+    list_display = ["analysis", "n_components", "n_items", "storage"]
+    fields = ["analysis", "n_components", "n_items", "file", "components"]
+    readonly_fields = fields
+
+    @admin.display(description="Storage")
+    def storage(self, obj: PCALoadingMatrix) -> str:
+        return "file" if obj.file else "db"
+
+    @admin.display(description="Largest loadings")
+    def components(self, obj: PCALoadingMatrix) -> str:
+        matrix = read_loading_matrix(obj)
+        rows = []
+        for component in range(1, matrix.n_components + 1):
+            loadings = matrix.component(component)
+            top = sorted(loadings, key=lambda item: -abs(loadings[item]))[:5]
+            items = ", ".join(f"{item}: {loadings[item]:.3f}" for item in top)
+            rows.append((component, items))
+        return format_html_join(mark_safe("<br>"), "PC{}: {}", rows)
@@ -1,61 +1,143 @@
+import hashlib
+import json
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
-from pca import pca
-from django.db.models import QuerySet
-from analyzer.utils import generate_dataframe, log_to_stdout, AnalysisLogger
+from datetime import datetime
+from django.db.models import Count, QuerySet
+from analyzer.utils import (
+    generate_dataframe,
+    log_to_stdout,
+    AnalysisLogger,
+    StageTimer,
+)
+from analyzer.incremental import (
+    explained_variance_ratio,
+    factorization_frames,
+    fit_incremental,
+    save_factorization,
+)
+from analyzer.loadings import store_loading_matrix
+from analyzer.pca_engine import get_pca_engine
 from scraper.models import Party, PartyVote, ParliamentaryItem
-from analyzer.models import PCAAnalysis, PCAComponentPartyScore, PCAItemLoading
+from analyzer.models import (
+    KeyItemRanking,
+    PCAAnalysis,
+    PCAComponentPartyScore,
+    PCAItemLoading,
+)
 from typing import TextIO
-from django.db.transaction import atomic
+from django.conf import settings
+from django.db import connection
+from django.db.transaction import atomic, set_rollback
+from scraper.utils import chunked
 from django.core.management.base import OutputWrapper
 import logging
 
 logger = logging.getLogger(__name__)
 
+LOADING_BATCH_SIZE: int = 5000
 
-def calculate_party_participation_rate() -> None:
+
+def calculate_party_participation_rate(
+    start: datetime | None = None,
+    end: datetime | None = None,
+    save: bool | None = None,
+) -> dict[int, float]:
     """
     Calculate and update the participation rate for each party.
 
-    This function iterates through all parties in the database, calculates their
-    participation rate in parliamentary votes, and updates the corresponding
-    field in the Party model.
+    The votes cast per party are counted with a single grouped aggregate,
+    and all parties are updated with one bulk update.
+
+    Args:
+        start (datetime | None): Only count parliamentary items dated on or
+            after this moment.
+        end (datetime | None): Only count parliamentary items dated before
+            this moment.
+        save (bool | None): Store the rates in the participation_rate field
+            of the Party model. Defaults to True without a date window.
+            The field holds the all-time rate that selects the parties of
+            the analysis, so windowed rates are never stored.
+
+    Returns:
+        dict[int, float]: The participation rate (percentage) per party id.
+
+    Raises:
+        ValueError: If `save` is set together with `start` or `end`.
     """
-    parties: QuerySet[Party] = Party.objects.all()
-    total_items: int = ParliamentaryItem.objects.count()
-    parties_to_update = []
+    windowed = start is not None or end is not None
+    if save is None:
+        save = not windowed
+    elif save and windowed:
+        raise ValueError("Windowed participation rates cannot be saved.")
+
+    items: QuerySet[ParliamentaryItem] = ParliamentaryItem.objects.all()
+    votes: QuerySet[PartyVote] = PartyVote.objects.all()
+    if start is not None:
+        items = items.filter(date__gte=start)
+        votes = votes.filter(parliamentary_item__date__gte=start)
+    if end is not None:
+        items = items.filter(date__lt=end)
+        votes = votes.filter(parliamentary_item__date__lt=end)
+
+    total_items: int = items.count()
+    votes_cast: dict[int, int] = dict(
+        votes.values("party")
+        .annotate(votes_cast=Count("id"))
+        .values_list("party", "votes_cast")
+    )
+
+    parties: list[Party] = list(Party.objects.only("id", "participation_rate"))
+    rates: dict[int, float] = {}
     for party in parties:
-        votes_cast: int = PartyVote.objects.filter(party=party).count()
         if total_items > 0:
-            participation_rate: float = (votes_cast / total_items) * 100
+            participation_rate: float = (
+                votes_cast.get(party.id, 0) / total_items
+            ) * 100
         else:
             participation_rate = 0.0
         party.participation_rate = participation_rate
-        parties_to_update.append(party)
+        rates[party.id] = participation_rate
 
-    Party.objects.bulk_update(parties_to_update, ["participation_rate"])
+    if save:
+        Party.objects.bulk_update(parties, ["participation_rate"])
+    return rates
 
 
-# FIXME - test
 def generate_pca_object(
-    prepared_df: pd.DataFrame, labels: list[str], n_components: int = 5
-) -> pca:
+    prepared_df: pd.DataFrame, n_components: int = 5
+) -> tuple[pd.DataFrame, pd.DataFrame, list[float]]:
     """
-    Generate a PCA object and fit it to the provided data.
+    Fit the configured PCA engine to the provided data.
 
     Args:
         prepared_df (pd.DataFrame): The prepared DataFrame containing the data for PCA.
-        labels (list): The row labels for the PCA model.
         n_components (int, optional): The number of principal components to compute. Defaults to 5.
 
     Returns:
-        pca: The PCA model fitted to the data.
+        tuple: A tuple containing:
+            - components (pd.DataFrame): The scores, with the rows of
+              `prepared_df` as index and "PC1", "PC2", ... as columns.
+            - loadings (pd.DataFrame): The loadings, with "PC1", "PC2", ...
+              as index and the columns of `prepared_df` as columns.
+            - explained_variance (list[float]): The fraction of the variance
+              explained by each component.
     """
-    model = pca(n_components=n_components, normalize=True)
-    model.fit_transform(prepared_df, row_labels=labels)
-    return model
+    result = get_pca_engine().fit(prepared_df.to_numpy(), n_components)
+    names = [f"PC{i}" for i in range(1, result.n_components + 1)]
+    components = pd.DataFrame(
+        result.scores, index=prepared_df.index, columns=names
+    )
+    loadings = pd.DataFrame(
+        result.loadings, index=names, columns=prepared_df.columns
+    )
+    return components, loadings, result.explained_variance_ratio.tolist()
 
 
-def prepare_df(log: AnalysisLogger) -> tuple[pd.DataFrame, list[str]]:
+def prepare_df(
+    log: AnalysisLogger, items: QuerySet[ParliamentaryItem] | None = None
+) -> tuple[pd.DataFrame, list[str]]:
     """
     Prepare the DataFrame for PCA analysis.
 
@@ -71,13 +153,15 @@ def prepare_df(log: AnalysisLogger) -> tuple[pd.DataFrame, list[str]]:
     Args:
       log (AnalysisLogger): Logger instance for tracking dataframe generation
         and party exclusions.
+      items (QuerySet[ParliamentaryItem] | None): Only include these items.
+        Defaults to all items.
 
     Returns:
         tuple: A tuple containing:
             - prepared_df (pd.DataFrame): The transposed DataFrame ready for PCA.
             - labels (list): The column labels of the original DataFrame.
     """
-    df = generate_dataframe(log=log)
+    df = generate_dataframe(log=log, items=items)
     # Remove all rows with NaN values
     before = len(df)
     df = df.dropna()
@@ -96,7 +180,209 @@ def prepare_df(log: AnalysisLogger) -> tuple[pd.DataFrame, list[str]]:
     return prepared_df, labels
 
 
-def run_pca_analysis(n_components: int = 3) -> None:
+def loading_rows(
+    loadings: pd.DataFrame,
+) -> tuple[
+    npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.float64]
+]:
+    """
+    Flatten a loadings DataFrame into one row per item and component.
+
+    Args:
+        loadings (pd.DataFrame): The loadings, with "PC1", "PC2", ... as
+            index and the parliamentary item IDs as columns.
+
+    Returns:
+        tuple: Three arrays of equal length, ordered by item and then by
+        component:
+            - item_ids (np.ndarray): The parliamentary item IDs.
+            - components (np.ndarray): The component numbers.
+            - values (np.ndarray): The loadings.
+    """
+    item_ids = loadings.columns.to_numpy(dtype=np.int64)
+    components = np.array(
+        [int(str(name).removeprefix("PC")) for name in loadings.index],
+        dtype=np.int64,
+    )
+    values = loadings.to_numpy(dtype=np.float64).T.ravel()
+    return (
+        np.repeat(item_ids, len(components)),
+        np.tile(components, len(item_ids)),
+        values,
+    )
+
+
+def save_item_loadings(
+    analysis: PCAAnalysis,
+    loadings: pd.DataFrame,
+    batch_size: int = LOADING_BATCH_SIZE,
+) -> int:
+    """
+    Store the loadings of an analysis as PCAItemLoading rows.
+
+    The rows are written in batches of `batch_size`. On PostgreSQL they are
+    inserted with `executemany` on a raw cursor, which skips building model
+    instances; other databases use `bulk_create`.
+
+    Args:
+        analysis (PCAAnalysis): The analysis the loadings belong to.
+        loadings (pd.DataFrame): See `loading_rows`.
+        batch_size (int): Number of rows per insert.
+
+    Returns:
+        int: The number of rows written.
+    """
+    item_ids, components, values = loading_rows(loadings)
+    rows = zip(
+        item_ids.tolist(), components.tolist(), values.tolist(), strict=True
+    )
+
+    if connection.vendor == "postgresql":
+        table = connection.ops.quote_name(PCAItemLoading._meta.db_table)
+        sql = (
+            f"INSERT INTO {table} "
+            "(analysis_id, parliamentary_item_id, component, loading) "
+            "VALUES (%s, %s, %s, %s)"
+        )
+        with connection.cursor() as cursor:
+            for batch in chunked(rows, batch_size):
+                cursor.executemany(sql, [(analysis.id, *row) for row in batch])
+        return len(values)
+
+    for batch in chunked(rows, batch_size):
+        PCAItemLoading.objects.bulk_create(
+            [
+                PCAItemLoading(
+                    analysis=analysis,
+                    parliamentary_item_id=item_id,
+                    component=component,
+                    loading=loading,
+                )
+                for item_id, component, loading in batch
+            ]
+        )
+    return len(values)
+
+
+def save_loadings(
+    analysis: PCAAnalysis, loadings: pd.DataFrame, storage: str | None = None
+) -> int:
+    """
+    Store the loadings of an analysis in the configured storage.
+
+    Args:
+        analysis (PCAAnalysis): The analysis the loadings belong to.
+        loadings (pd.DataFrame): See `loading_rows`.
+        storage (str | None): "rows" for PCAItemLoading rows, "db" or "file"
+            for a PCALoadingMatrix. Defaults to the
+            `ANALYZER_LOADINGS_STORAGE` setting.
+
+    Returns:
+        int: The number of loadings stored.
+    """
+    if storage is None:
+        storage = settings.ANALYZER_LOADINGS_STORAGE
+    if storage == "rows":
+        return save_item_loadings(analysis, loadings)
+    store_loading_matrix(analysis, loadings, storage=storage)
+    return int(loadings.size)
+
+
+def save_key_item_rankings(
+    analysis: PCAAnalysis, loadings: pd.DataFrame, top_k: int | None = None
+) -> int:
+    """
+    Store the key items of an analysis as KeyItemRanking rows.
+
+    The key items are the `top_k` items with the largest sum of absolute
+    loadings over all components (stored with component None), and the
+    `top_k` items with the largest absolute loading on each component.
+
+    Args:
+        analysis (PCAAnalysis): The analysis the loadings belong to.
+        loadings (pd.DataFrame): See `loading_rows`.
+        top_k (int | None): Number of items per ranking. Defaults to the
+            `ANALYZER_KEY_ITEMS_TOP_K` setting.
+
+    Returns:
+        int: The number of rows written.
+    """
+    if top_k is None:
+        top_k = settings.ANALYZER_KEY_ITEMS_TOP_K
+    item_ids = loadings.columns.to_numpy(dtype=np.int64)
+    absolute = np.abs(loadings.to_numpy(dtype=np.float64))
+    rankings: list[tuple[int | None, npt.NDArray[np.float64]]] = [
+        (None, absolute.sum(axis=0))
+    ]
+    rankings += [
+        (int(str(name).removeprefix("PC")), row)
+        for name, row in zip(loadings.index, absolute)
+    ]
+
+    key_items: list[KeyItemRanking] = [
+        KeyItemRanking(
+            analysis=analysis,
+            parliamentary_item_id=int(item_ids[index]),
+            component=component,
+            rank=rank,
+            total_loading=float(totals[index]),
+        )
+        for component, totals in rankings
+        for rank, index in enumerate(
+            np.argsort(-totals, kind="stable")[:top_k], start=1
+        )
+    ]
+    KeyItemRanking.objects.bulk_create(key_items)
+    return len(key_items)
+
+
+def analysis_settings() -> str:
+    """
+    Return the settings that change the results of a PCA analysis or how
+    they are stored: the PCA engine and the loadings storage.
+    """
+    return json.dumps(
+        {
+            "engine": settings.ANALYZER_PCA_ENGINE,
+            "loadings_storage": settings.ANALYZER_LOADINGS_STORAGE,
+        },
+        sort_keys=True,
+        default=str,
+    )
+
+
+def analysis_fingerprint(prepared_df: pd.DataFrame, n_components: int) -> str:
+    """
+    Hash the input of a PCA analysis.
+
+    The fingerprint covers the included parties, the parliamentary items,
+    the votes, the number of components and the `analysis_settings`, so two
+    analyses with the same fingerprint have the same results.
+
+    Args:
+        prepared_df (pd.DataFrame): The DataFrame returned by `prepare_df`.
+        n_components (int): The number of principal components.
+
+    Returns:
+        str: The SHA-256 hex digest.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{n_components}\n".encode())
+    digest.update(analysis_settings().encode() + b"\n")
+    digest.update("\t".join(map(str, prepared_df.index)).encode() + b"\n")
+    digest.update("\t".join(map(str, prepared_df.columns)).encode() + b"\n")
+    digest.update(
+        np.ascontiguousarray(prepared_df.to_numpy(dtype=np.float64)).tobytes()
+    )
+    return digest.hexdigest()
+
+
+def run_pca_analysis(
+    n_components: int = 3,
+    force: bool = False,
+    incremental: bool | None = None,
+    timer: StageTimer | None = None,
+) -> PCAAnalysis | None:
     """
     Run PCA analysis and store the results in the database.
 
@@ -105,61 +391,179 @@ def run_pca_analysis(n_components: int = 3) -> None:
     corresponding party and analysis instance.
 
     The loadings for each parliamentary item for each component are also stored
-     in the database as PCAItemLoading instances.
+     in the database as PCAItemLoading instances or as a PCALoadingMatrix
+     (see `save_loadings`), and the items with the largest loadings as
+     KeyItemRanking instances.
+
+    The analysis is skipped if its input has the same fingerprint as the
+    latest analysis (see `analysis_fingerprint`), unless `force` is set.
+
+    In incremental mode the SVD of the latest analysis is updated with the
+    items added since, instead of refitting on all items. A full refit is
+    still done on a schedule and when the components drift, see
+    `analyzer.incremental`. The analysis is skipped if there are no new
+    items.
+
+    The duration, query count and row counts of the dataframe, PCA fit and
+    persistence stages are logged and stored in `PCAAnalysis.metrics`.
 
     Args:
         n_components (int, optional): The number of principal components to
         compute. Defaults to 3.
+        force (bool, optional): Run the analysis even if its input has not
+        changed. Defaults to False.
+        incremental (bool | None, optional): Use incremental mode. Defaults
+        to `ANALYZER_INCREMENTAL["ENABLED"]`.
+        timer (StageTimer | None, optional): Timer with the stages measured
+        before the analysis, such as the participation rate. Defaults to a
+        new timer.
+
+    Returns:
+        PCAAnalysis | None: The new analysis, or None if it was skipped.
     """
     with atomic():
         analysis: PCAAnalysis = PCAAnalysis.objects.create()
         log = AnalysisLogger(logger, {"analysis_id": analysis.id})
+        if timer is None:
+            timer = StageTimer()
+        timer.log = log
 
-        prepared_df, labels = prepare_df(log=log)
-        model = generate_pca_object(
-            prepared_df, labels, n_components=n_components
+        latest = (
+            PCAAnalysis.objects.exclude(id=analysis.id)
+            .order_by("-created_at")
+            .first()
         )
-        components = model.results.get("PC")
-
-        loadings = model.results.get("loadings")
-        item_loadings: list[PCAItemLoading] = []
-        for index, row in loadings.transpose().iterrows():
-            for pc_component_score in row.index:
-                item_loadings.append(
-                    PCAItemLoading(
-                        analysis=analysis,
-                        parliamentary_item_id=int(index),
-                        component=int(pc_component_score.strip("PC")),
-                        loading=row[pc_component_score],
-                    )
+        if incremental is None:
+            incremental = bool(settings.ANALYZER_INCREMENTAL["ENABLED"])
+
+        if incremental:
+            # Builds the dataframe of the new items and updates the SVD.
+            with timer.stage("incremental_fit") as stage:
+                fit = fit_incremental(log, n_components, latest, force=force)
+                if fit is not None:
+                    stage["parties"] = len(fit[0].parties)
+                    stage["items"] = len(fit[0].item_ids)
+            if fit is None:
+                log.info(
+                    "Skipped PCA analysis, there are no new items since "
+                    f"analysis {latest.id if latest else None}."
+                )
+                set_rollback(True)
+                return None
+            factorization, fingerprint = fit
+            components, loadings = factorization_frames(
+                factorization, n_components
+            )
+            explained_variance = explained_variance_ratio(
+                factorization, n_components
+            )
+        else:
+            with timer.stage("dataframe") as stage:
+                prepared_df, labels = prepare_df(log=log)
+                stage["parties"], stage["items"] = prepared_df.shape
+            fingerprint = analysis_fingerprint(prepared_df, n_components)
+            if not force and latest and latest.fingerprint == fingerprint:
+                log.info(
+                    "Skipped PCA analysis, the input has not changed since "
+                    f"analysis {latest.id}.",
+                    extra={"fingerprint": fingerprint},
                 )
+                set_rollback(True)
+                return None
+            with timer.stage("pca_fit") as stage:
+                components, loadings, explained_variance = generate_pca_object(
+                    prepared_df, n_components=n_components
+                )
+                stage["components"] = components.shape[1]
 
-        if item_loadings:
-            PCAItemLoading.objects.bulk_create(item_loadings)
+        with timer.stage("persistence") as stage:
+            if incremental:
+                save_factorization(analysis, factorization)
+            stage["loadings"] = save_loadings(analysis, loadings)
+            stage["key_items"] = save_key_item_rankings(analysis, loadings)
 
-        dict_version = components.to_dict()
-        for component, party_scores in dict_version.items():
-            for party_name, score in party_scores.items():
-                party = Party.objects.get(abbreviation=party_name)
-                PCAComponentPartyScore.objects.create(
+            party_ids: dict[str, int] = {}
+            participation_rates: dict[str, float | None] = {}
+            for abbreviation, party_id, rate in Party.objects.filter(
+                abbreviation__in=components.index
+            ).values_list("abbreviation", "id", "participation_rate"):
+                party_ids[abbreviation] = party_id
+                participation_rates[str(party_id)] = rate
+            party_scores: list[PCAComponentPartyScore] = [
+                PCAComponentPartyScore(
                     analysis=analysis,
-                    party=party,
+                    party_id=party_ids[party_name],
                     component=int(component.removeprefix("PC")),
                     score=score,
                 )
+                for component, scores in components.items()
+                for party_name, score in scores.items()
+            ]
+            if party_scores:
+                PCAComponentPartyScore.objects.bulk_create(party_scores)
+            stage["party_scores"] = len(party_scores)
+
+        analysis.fingerprint = fingerprint
+        analysis.explained_variance = explained_variance
+        analysis.participation_rates = participation_rates
+        analysis.metrics = timer.as_dict()
+        analysis.save(
+            update_fields=[
+                "fingerprint",
+                "explained_variance",
+                "participation_rates",
+                "metrics",
+            ]
+        )
+    return analysis
 
 
-# FIXME - test
 def run_full_analysis(
-    n_components: int, stdout: TextIO | OutputWrapper | None = None
+    n_components: int,
+    stdout: TextIO | OutputWrapper | None = None,
+    force: bool = False,
+    incremental: bool | None = None,
 ) -> None:
     """
     Run the full analysis pipeline.
 
     This function calculates party participation rates and performs PCA analysis.
+    The PCA analysis is skipped if its input has not changed, unless `force`
+    is set. See `run_pca_analysis` for `incremental`.
+
+    The participation rate is measured as the first stage of the analysis
+    metrics. The duration of every stage is logged, and written to `stdout`
+    if given.
     """
+    timer = StageTimer()
     log_to_stdout(msg="Calculating party participation rates...", stdout=stdout)
-    calculate_party_participation_rate()
+    with timer.stage("participation_rate") as stage:
+        stage["parties"] = len(calculate_party_participation_rate())
     log_to_stdout(msg="Done.\nRunning PCA analysis...", stdout=stdout)
-    run_pca_analysis(n_components=n_components)
-    log_to_stdout(msg="PCA analysis completed.", stdout=stdout)
+    analysis = run_pca_analysis(
+        n_components=n_components,
+        force=force,
+        incremental=incremental,
+        timer=timer,
+    )
+    if analysis is None:
+        log_to_stdout(
+            msg="PCA analysis skipped, the votes have not changed.",
+            stdout=stdout,
+        )
+    else:
+        log_to_stdout(msg="PCA analysis completed.", stdout=stdout)
+    for name, metrics in timer.stages.items():
+        message = (
+            f"{name}: {metrics['seconds']:.3f}s, {metrics['queries']} queries"
+        )
+        logger.info(
+            f"Analysis stage {message}",
+            extra={
+                "analysis_id": analysis.id if analysis else None,
+                "stage": name,
+                "metrics": metrics,
+            },
+        )
+        if stdout:
+            stdout.write(message)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AnalyzerConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "analyzer"
+
+    def ready(self) -> None:
+        # Connect the signal handlers.
+        from analyzer import signals  # noqa: F401
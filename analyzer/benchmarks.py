@@ -0,0 +1,299 @@
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from functools import partial
+from typing import Any, Callable
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import Client
+from django.utils import timezone
+from analyzer.analysis import (
+    calculate_party_participation_rate,
+    run_pca_analysis,
+)
+from analyzer.cache import latest_analysis_cache_key
+from analyzer.utils import AnalysisLogger, QueryCounter, generate_dataframe
+from scraper.odata_standin import ODataStandIn, ODataStandInAdapter
+from scraper.utils import ParliamentApi
+from scraper.versions import ANALYSIS_DATA, get_data_versions
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+# List endpoints requested by the API benchmarks, by benchmark name.
+API_ENDPOINTS: dict[str, str] = {
+    "api_parties": "/api/v1/parties/",
+    "api_items": "/api/v1/items/",
+    "api_key_items": "/api/v1/key-items/",
+    "api_votes": "/api/v1/votes/",
+    "api_analyses": "/api/v1/analysis/",
+    "api_pca_scores": "/api/v1/pca-scores/",
+    "api_pca_loadings": "/api/v1/pca-loadings/",
+    "api_pca_chart": "/api/v1/pca-chart/",
+}
+# API benchmarks that fail without an analysis, skipped for sizes without
+# analyses.
+NEEDS_ANALYSIS: set[str] = {"api_key_items", "api_pca_chart"}
+
+
+@dataclass
+class BenchmarkSize:
+    """
+    Size of the synthetic dataset of a benchmark run.
+
+    Attributes:
+        parties (int): Number of parties.
+        items (int): Number of parliamentary items, each with a vote of
+            every party.
+        analyses (int): Number of PCA analyses run on the data.
+    """
+
+    parties: int = 15
+    items: int = 1000
+    analyses: int = 3
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Measurements of a single benchmark.
+
+    Attributes:
+        name (str): Name of the benchmark.
+        parties (int): See `BenchmarkSize`.
+        items (int): See `BenchmarkSize`.
+        analyses (int): See `BenchmarkSize`.
+        runs (int): Number of times the benchmark was run.
+        wall_time (float): Mean seconds per run.
+        min_wall_time (float): Seconds of the fastest run.
+        queries (int): Database queries of the last run.
+        peak_memory (int | None): Highest memory allocated during a run,
+            traced by `tracemalloc`, in bytes. None if memory was not traced.
+    """
+
+    name: str
+    parties: int
+    items: int
+    analyses: int
+    runs: int
+    wall_time: float
+    min_wall_time: float
+    queries: int
+    peak_memory: int | None
+
+    @property
+    def key(self) -> tuple[str, int, int, int]:
+        return self.name, self.parties, self.items, self.analyses
+
+
+def measure(
+    name: str,
+    size: BenchmarkSize,
+    func: Callable[[], Any],
+    runs: int = 1,
+    trace_memory: bool = True,
+) -> BenchmarkResult:
+    """
+    Run `func` `runs` times and measure its wall time, database queries and
+    peak memory.
+
+    Tracing memory slows down Python code considerably, so the wall times
+    are only comparable between runs with the same `trace_memory`.
+    """
+    times: list[float] = []
+    queries: int = 0
+    peak_memory: int | None = 0 if trace_memory else None
+    for _ in range(max(1, runs)):
+        counter = QueryCounter()
+        if trace_memory:
+            tracemalloc.start()
+        try:
+            with connection.execute_wrapper(counter):
+                start = time.perf_counter()
+                func()
+                times.append(time.perf_counter() - start)
+        finally:
+            if trace_memory:
+                peak_memory = max(
+                    peak_memory or 0, tracemalloc.get_traced_memory()[1]
+                )
+                tracemalloc.stop()
+        queries = counter.count
+
+    return BenchmarkResult(
+        name=name,
+        runs=len(times),
+        wall_time=sum(times) / len(times),
+        min_wall_time=min(times),
+        queries=queries,
+        peak_memory=peak_memory,
+        **asdict(size),
+    )
+
+
+def get_ok(client: Client, url: str) -> None:
+    """
+    Request `url` and fail on anything but a 200 response.
+    """
+    response = client.get(url)
+    if response.status_code != 200:
+        raise RuntimeError(f"GET {url} returned {response.status_code}")
+
+
+def run_benchmarks(
+    size: BenchmarkSize,
+    repeat: int = 3,
+    trace_memory: bool = True,
+    seed: int = 0,
+) -> list[BenchmarkResult]:
+    """
+    Benchmark the import, analysis and API hot paths on a synthetic dataset.
+
+    The parties are created with `generate_parties`. The items and votes are
+    imported by `ParliamentApi.import_votes` from Besluit records generated
+    by `generate_besluit_records`, served by an `ODataStandIn`. The dataset
+    is created in a transaction that is rolled back afterwards, so this
+    should run against a test database.
+
+    Args:
+        size (BenchmarkSize): Size of the dataset.
+        repeat (int): Number of runs of the benchmarks that do not change
+            the data: `generate_dataframe` and the API requests.
+        trace_memory (bool): Measure the peak memory, see `measure`.
+        seed (int): Seed of the synthetic dataset.
+
+    Returns:
+        list[BenchmarkResult]: The results, in the order they were run.
+    """
+    # The factories are development requirements.
+    import factory.random
+    from scraper.tests.utils.testing_utils import (
+        generate_besluit_records,
+        generate_parties,
+    )
+
+    factory.random.reseed_random(seed)  # type: ignore[no-untyped-call]
+    rng = random.Random(seed)
+
+    def bench(
+        name: str, func: Callable[[], Any], runs: int = 1
+    ) -> BenchmarkResult:
+        return measure(name, size, func, runs=runs, trace_memory=trace_memory)
+
+    with transaction.atomic():
+        parties = list(generate_parties(size.parties))
+        standin = ODataStandIn(
+            {"Besluit": generate_besluit_records(parties, size.items, rng)}
+        )
+        api = ParliamentApi()
+        api.session.mount(api.api_url, ODataStandInAdapter(standin))
+
+        results = [
+            bench("import_votes", api.import_votes),
+            bench(
+                "import_votes_unchanged", lambda: api.import_votes(full=True)
+            ),
+        ]
+        calculate_party_participation_rate()
+        log = AnalysisLogger(logger, {})
+        results.append(
+            bench(
+                "generate_dataframe",
+                lambda: generate_dataframe(log=log),
+                runs=repeat,
+            )
+        )
+        if size.analyses:
+            results.append(
+                bench(
+                    "run_pca_analysis",
+                    lambda: run_pca_analysis(force=True),
+                    runs=size.analyses,
+                )
+            )
+
+        client = Client()
+        for name, url in API_ENDPOINTS.items():
+            if not size.analyses and name in NEEDS_ANALYSIS:
+                continue
+            results.append(
+                bench(name, partial(get_ok, client, url), runs=repeat)
+            )
+        transaction.set_rollback(True)
+    # The rolled back analyses can be cached as the latest one, under the
+    # analysis data version the rollback left unchanged.
+    versions, _ = get_data_versions([ANALYSIS_DATA])
+    cache.delete(latest_analysis_cache_key(versions[ANALYSIS_DATA]))
+    return results
+
+
+def git_commit() -> str | None:
+    """
+    Return the commit checked out in BASE_DIR, if it is a git repository.
+    """
+    try:
+        process = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    except OSError:
+        return None
+    return process.stdout.strip() or None
+
+
+def benchmark_report(results: list[BenchmarkResult]) -> dict[str, Any]:
+    """
+    Return the results with the environment they were measured in, as
+    written to the JSON report.
+    """
+    return {
+        "created_at": timezone.now().isoformat(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "database": connection.vendor,
+        "results": [asdict(result) for result in results],
+    }
+
+
+def compare_reports(
+    baseline: dict[str, Any], current: dict[str, Any]
+) -> list[str]:
+    """
+    Describe the changes from the `baseline` report to the `current` one.
+
+    Benchmarks are matched on their name and size; benchmarks that are not
+    in both reports are left out.
+
+    Returns:
+        list[str]: One line per benchmark.
+    """
+    before = {
+        BenchmarkResult(**result).key: BenchmarkResult(**result)
+        for result in baseline["results"]
+    }
+    lines: list[str] = []
+    for data in current["results"]:
+        result = BenchmarkResult(**data)
+        old = before.get(result.key)
+        if old is None:
+            continue
+        change = (
+            result.min_wall_time / old.min_wall_time - 1
+            if old.min_wall_time
+            else 0.0
+        )
+        lines.append(
+            f"{result.name} ({result.parties} x {result.items} x "
+            f"{result.analyses}): {old.min_wall_time:.3f}s -> "
+            f"{result.min_wall_time:.3f}s ({change:+.0%}), "
+            f"{old.queries} -> {result.queries} queries"
+        )
+    return lines
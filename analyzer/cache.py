@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.core.cache import cache
+from analyzer.models import PCAAnalysis
+
+
+LATEST_ANALYSIS_CACHE_KEY: str = "analyzer:latest_analysis_id"
+
+
+def latest_analysis_cache_key(version: int) -> str:
+    return f"{LATEST_ANALYSIS_CACHE_KEY}:{version}"
+
+
+def query_latest_analysis_id() -> int | None:
+    """
+    Return the id of the most recent PCA analysis, or None if there is none.
+    """
+    return (
+        PCAAnalysis.objects.order_by("-created_at")
+        .values_list("id", flat=True)
+        .first()
+    )
+
+
+def get_latest_analysis_id(version: int) -> int | None:
+    """
+    Return `query_latest_analysis_id`, cached for the given analysis data
+    version.
+
+    The id is kept in the Django cache for
+    `ANALYZER_LATEST_ANALYSIS_CACHE_TIMEOUT` seconds, keyed on the version.
+    Saving or deleting an analysis bumps the version (see
+    `analyzer.signals`), so every process, whatever cache it uses, looks the
+    id up again after a new analysis is committed. The API views pass the
+    version they already read for their ETag and cache key, see
+    `ConditionalGetMixin.latest_analysis_id`.
+
+    Args:
+        version (int): The analysis data version.
+    """
+    key = latest_analysis_cache_key(version)
+    analysis_id: int | None = cache.get(key)
+    if analysis_id is not None:
+        return analysis_id
+
+    analysis_id = query_latest_analysis_id()
+    if analysis_id is not None:
+        cache.set(
+            key, analysis_id, settings.ANALYZER_LATEST_ANALYSIS_CACHE_TIMEOUT
+        )
+    return analysis_id
@@ -0,0 +1,70 @@
+from typing import Any
+from analyzer.models import PCAAnalysis, PCAComponentPartyScore
+
+
+def chart_payload(analysis_id: int) -> dict[str, Any] | None:
+    """
+    Return the party scores of an analysis in the compact format of the
+    scatter plot, built with two queries however many parties there are.
+
+    The parties are sorted by abbreviation. `scores` holds a row per
+    component with a score per party, in the order of `parties`; a party
+    without a score for a component gets None. The participation rates are
+    those at the time of the analysis, None for analyses from before they
+    were recorded.
+
+    Returns:
+        dict[str, Any] | None: The payload, or None if there is no analysis
+        with the given id.
+    """
+    analysis = (
+        PCAAnalysis.objects.filter(id=analysis_id)
+        .values("id", "created_at", "explained_variance", "participation_rates")
+        .first()
+    )
+    if analysis is None:
+        return None
+
+    rows = (
+        PCAComponentPartyScore.objects.filter(analysis_id=analysis_id)
+        .order_by("party__abbreviation", "component")
+        .values_list(
+            "party_id",
+            "party__abbreviation",
+            "party__name",
+            "component",
+            "score",
+        )
+    )
+    parties: dict[int, dict[str, Any]] = {}
+    scores: dict[tuple[int, int], float] = {}
+    rates: dict[str, float | None] = analysis["participation_rates"]
+    for party_id, abbreviation, name, component, score in rows:
+        parties.setdefault(
+            party_id,
+            {
+                "id": party_id,
+                "abbreviation": abbreviation,
+                "name": name,
+                "participation_rate": rates.get(str(party_id)),
+            },
+        )
+        scores[component, party_id] = score
+
+    components = sorted({component for component, _ in scores})
+    return {
+        "analysis": analysis["id"],
+        "created_at": analysis["created_at"],
+        "components": components,
+        "explained_variance": analysis["explained_variance"],
+        "parties": [party["abbreviation"] for party in parties.values()],
+        "party_ids": list(parties),
+        "party_names": [party["name"] for party in parties.values()],
+        "participation_rates": [
+            party["participation_rate"] for party in parties.values()
+        ],
+        "scores": [
+            [scores.get((component, party_id)) for party_id in parties]
+            for component in components
+        ],
+    }
@@ -0,0 +1,389 @@
+import hashlib
+import io
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Any
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from django.conf import settings
+from django.utils import timezone
+from analyzer.loadings import loadings_storage
+from analyzer.models import PCAAnalysis, PCAFactorization
+from analyzer.pca_engine import svd_flip
+from analyzer.utils import AnalysisLogger
+from scraper.models import ParliamentaryItem
+
+
+FloatArray = npt.NDArray[np.float64]
+
+
+@dataclass
+class Factorization:
+    """
+    Thin SVD of the standardized parties x items vote matrix.
+
+    Every item column is standardized on its own, so new items can be
+    appended without touching the existing columns. The SVD is kept at full
+    rank, which makes appending columns exact.
+
+    Attributes:
+        parties (list[str]): Party abbreviations, one per row.
+        item_ids (npt.NDArray[np.int64]): Item IDs, one per column.
+        means (FloatArray): Mean vote of every item.
+        stds (FloatArray): Standard deviation of the votes of every item,
+            1 for items on which all parties voted the same.
+        u (FloatArray): Parties x rank left singular vectors.
+        s (FloatArray): Singular values, largest first.
+        vt (FloatArray): Rank x items right singular vectors.
+        refit_u (FloatArray): `u` at the last full refit.
+        refit_at (datetime): Time of the last full refit.
+        max_item_id (int): Highest item ID that was considered.
+        n_components (int): Number of components of the analysis.
+    """
+
+    parties: list[str]
+    item_ids: npt.NDArray[np.int64]
+    means: FloatArray
+    stds: FloatArray
+    u: FloatArray
+    s: FloatArray
+    vt: FloatArray
+    refit_u: FloatArray
+    refit_at: datetime
+    max_item_id: int
+    n_components: int
+
+
+def standardize_columns(
+    matrix: FloatArray,
+) -> tuple[FloatArray, FloatArray, FloatArray]:
+    """
+    Center every column and scale it to unit variance, like `SVDEngine`.
+
+    Returns:
+        tuple: The standardized matrix, the column means and the column
+        standard deviations.
+    """
+    means = matrix.mean(axis=0)
+    stds = matrix.std(axis=0)
+    stds[stds < 10 * np.finfo(np.float64).eps] = 1.0
+    return (matrix - means) / stds, means, stds
+
+
+def truncate(
+    u: FloatArray, s: FloatArray, vt: FloatArray
+) -> tuple[FloatArray, FloatArray, FloatArray]:
+    """
+    Drop the singular values that are zero up to rounding errors.
+    """
+    if not len(s):
+        return u, s, vt
+    tolerance = s[0] * max(u.shape[0], vt.shape[1]) * np.finfo(np.float64).eps
+    rank = int(np.sum(s > tolerance))
+    return u[:, :rank], s[:rank], vt[:rank]
+
+
+def factorize(
+    prepared_df: pd.DataFrame,
+    n_components: int,
+    max_item_id: int,
+    now: datetime | None = None,
+) -> Factorization:
+    """
+    Fit a new factorization on a DataFrame from `prepare_df`.
+    """
+    x, means, stds = standardize_columns(prepared_df.to_numpy(dtype=np.float64))
+    u, s, vt = truncate(*np.linalg.svd(x, full_matrices=False))
+    return Factorization(
+        parties=[str(party) for party in prepared_df.index],
+        item_ids=prepared_df.columns.to_numpy(dtype=np.int64),
+        means=means,
+        stds=stds,
+        u=u,
+        s=s,
+        vt=vt,
+        refit_u=u,
+        refit_at=now or timezone.now(),
+        max_item_id=max_item_id,
+        n_components=n_components,
+    )
+
+
+def append_items(
+    factorization: Factorization,
+    new_df: pd.DataFrame,
+    n_components: int,
+    max_item_id: int,
+) -> Factorization:
+    """
+    Add the item columns of `new_df` to the factorization.
+
+    Uses the column update of Brand's incremental SVD: the part of the new
+    columns outside the current left singular subspace is orthogonalized,
+    and only the small (rank + new items) core matrix is decomposed. The
+    cost grows with the number of new items, apart from the rotation of
+    the existing right singular vectors.
+
+    Args:
+        factorization (Factorization): The current factorization.
+        new_df (pd.DataFrame): The new items, with the same party rows.
+        n_components (int): Number of components of the analysis.
+        max_item_id (int): Highest item ID that was considered.
+
+    Returns:
+        Factorization: The updated factorization.
+
+    Raises:
+        ValueError: If `new_df` has other parties than the factorization.
+    """
+    if [str(party) for party in new_df.index] != factorization.parties:
+        raise ValueError("The new items have different parties.")
+    if new_df.empty:
+        return replace(
+            factorization, n_components=n_components, max_item_id=max_item_id
+        )
+
+    c, means, stds = standardize_columns(new_df.to_numpy(dtype=np.float64))
+    u, s, vt = factorization.u, factorization.s, factorization.vt
+    rank, added = len(s), c.shape[1]
+
+    projection = u.T @ c
+    residual = c - u @ projection
+    q, r = np.linalg.qr(residual)
+
+    core = np.zeros((rank + q.shape[1], rank + added))
+    core[:rank, :rank] = np.diag(s)
+    core[:rank, rank:] = projection
+    core[rank:, rank:] = r
+    core_u, new_s, core_vt = np.linalg.svd(core, full_matrices=False)
+
+    new_u = np.hstack([u, q]) @ core_u
+    new_vt = np.hstack([core_vt[:, :rank] @ vt, core_vt[:, rank:]])
+    new_u, new_s, new_vt = truncate(new_u, new_s, new_vt)
+    return replace(
+        factorization,
+        item_ids=np.concatenate(
+            [factorization.item_ids, new_df.columns.to_numpy(dtype=np.int64)]
+        ),
+        means=np.concatenate([factorization.means, means]),
+        stds=np.concatenate([factorization.stds, stds]),
+        u=new_u,
+        s=new_s,
+        vt=new_vt,
+        max_item_id=max_item_id,
+        n_components=n_components,
+    )
+
+
+def subspace_drift(factorization: Factorization, n_components: int) -> float:
+    """
+    Measure how far the first components rotated since the last full refit.
+
+    Returns:
+        float: 0 if the components span the same party space as at the last
+        refit, up to 1 if some direction is orthogonal to it (one minus the
+        cosine of the largest principal angle).
+    """
+    k = min(n_components, factorization.u.shape[1])
+    k = min(k, factorization.refit_u.shape[1])
+    if k == 0:
+        return 0.0
+    overlap = factorization.refit_u[:, :k].T @ factorization.u[:, :k]
+    cosines = np.linalg.svd(overlap, compute_uv=False)
+    return float(1.0 - cosines.min())
+
+
+def factorization_frames(
+    factorization: Factorization, n_components: int
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Return the scores and loadings of the first `n_components` components,
+    in the format of `generate_pca_object`.
+    """
+    u, vt = svd_flip(factorization.u, factorization.vt)
+    k = min(n_components, len(factorization.s))
+    names = [f"PC{i}" for i in range(1, k + 1)]
+    components = pd.DataFrame(
+        u[:, :k] * factorization.s[:k],
+        index=factorization.parties,
+        columns=names,
+    )
+    loadings = pd.DataFrame(vt[:k], index=names, columns=factorization.item_ids)
+    return components, loadings
+
+
+def explained_variance_ratio(
+    factorization: Factorization, n_components: int
+) -> list[float]:
+    """
+    Return the fraction of the variance explained by each of the first
+    `n_components` components. The factorization is kept at full rank, so
+    its singular values cover all of the variance.
+    """
+    variance = factorization.s**2
+    total = variance.sum()
+    if total <= 0:
+        return [0.0] * min(n_components, len(variance))
+    return [float(ratio) for ratio in variance[:n_components] / total]
+
+
+def save_factorization(
+    analysis: PCAAnalysis, factorization: Factorization
+) -> PCAFactorization:
+    """
+    Store the factorization of an analysis, replacing the older ones.
+    """
+    buffer = io.BytesIO()
+    np.savez(
+        buffer,
+        item_ids=factorization.item_ids,
+        means=factorization.means,
+        stds=factorization.stds,
+        u=factorization.u,
+        s=factorization.s,
+        vt=factorization.vt,
+        refit_u=factorization.refit_u,
+    )
+    PCAFactorization.objects.exclude(analysis=analysis).delete()
+    return PCAFactorization.objects.create(
+        analysis=analysis,
+        parties=factorization.parties,
+        max_item_id=factorization.max_item_id,
+        n_components=factorization.n_components,
+        refit_at=factorization.refit_at,
+        arrays=buffer.getvalue(),
+    )
+
+
+def load_factorization(stored: PCAFactorization) -> Factorization:
+    """
+    Read a stored factorization.
+    """
+    with np.load(io.BytesIO(stored.arrays), allow_pickle=False) as arrays:
+        return Factorization(
+            parties=list(stored.parties),
+            item_ids=arrays["item_ids"],
+            means=arrays["means"],
+            stds=arrays["stds"],
+            u=arrays["u"],
+            s=arrays["s"],
+            vt=arrays["vt"],
+            refit_u=arrays["refit_u"],
+            refit_at=stored.refit_at,
+            max_item_id=stored.max_item_id,
+            n_components=stored.n_components,
+        )
+
+
+def refit_reason(
+    factorization: Factorization | None,
+    n_components: int,
+    now: datetime | None = None,
+) -> str | None:
+    """
+    Return why the next analysis needs a full refit, or None if it can add
+    the new items to `factorization`.
+
+    A full refit is done on the schedule of `ANALYZER_INCREMENTAL`
+    ["REFIT_EVERY"] and when the components drifted more than
+    ["DRIFT_THRESHOLD"] (see `subspace_drift`). A refit also picks up
+    changed votes on existing items, and items whose votes were completed
+    after they were first seen.
+    """
+    config: dict[str, Any] = settings.ANALYZER_INCREMENTAL
+    if factorization is None:
+        return "no previous factorization"
+    if (now or timezone.now()) - factorization.refit_at >= config[
+        "REFIT_EVERY"
+    ]:
+        return "scheduled refit"
+    drift = subspace_drift(factorization, n_components)
+    if drift > config["DRIFT_THRESHOLD"]:
+        return f"drift {drift:.3f}"
+    return None
+
+
+def chain_fingerprint(
+    fingerprint: str, new_df: pd.DataFrame, n_components: int
+) -> str:
+    """
+    Fingerprint of an incremental analysis: the fingerprint of the previous
+    analysis combined with the new items.
+    """
+    digest = hashlib.sha256(fingerprint.encode())
+    digest.update(f"{n_components}\n".encode())
+    digest.update("\t".join(map(str, new_df.columns)).encode() + b"\n")
+    digest.update(
+        np.ascontiguousarray(new_df.to_numpy(dtype=np.float64)).tobytes()
+    )
+    return digest.hexdigest()
+
+
+def fit_incremental(
+    log: AnalysisLogger,
+    n_components: int,
+    latest: PCAAnalysis | None,
+    force: bool = False,
+) -> tuple[Factorization, str] | None:
+    """
+    Update the factorization of the latest analysis with the new items, or
+    fit a new one if a full refit is needed (see `refit_reason`).
+
+    Args:
+        log (AnalysisLogger): The analysis logger.
+        n_components (int): The number of principal components.
+        latest (PCAAnalysis | None): The latest analysis.
+        force (bool): Return a result even if nothing changed.
+
+    Returns:
+        tuple[Factorization, str] | None: The factorization and the
+        fingerprint of the analysis, or None if there are no new items and
+        neither `n_components` nor the loadings storage changed.
+    """
+    # Avoid circular import.
+    from analyzer.analysis import analysis_fingerprint, prepare_df
+
+    stored = PCAFactorization.objects.filter(analysis=latest).first()
+    factorization = load_factorization(stored) if stored else None
+    max_item_id = (
+        ParliamentaryItem.objects.order_by("-id")
+        .values_list("id", flat=True)
+        .first()
+    ) or 0
+
+    reason = refit_reason(factorization, n_components)
+    if factorization is not None and reason is None and latest is not None:
+        new_df, _ = prepare_df(
+            log=log,
+            items=ParliamentaryItem.objects.filter(
+                id__gt=factorization.max_item_id
+            ).order_by("-date"),
+        )
+        if [str(party) for party in new_df.index] != factorization.parties:
+            reason = "included parties changed"
+        elif (
+            new_df.empty
+            and n_components == factorization.n_components
+            and not force
+            and loadings_storage(latest.id)
+            == settings.ANALYZER_LOADINGS_STORAGE
+        ):
+            return None
+        else:
+            log.info(
+                f"Adding {new_df.shape[1]} parliamentary items to the PCA "
+                f"of analysis {latest.id}.",
+                extra={"added": new_df.shape[1]},
+            )
+            return (
+                append_items(factorization, new_df, n_components, max_item_id),
+                chain_fingerprint(latest.fingerprint, new_df, n_components),
+            )
+
+    log.info(f"Refitting PCA: {reason}.", extra={"reason": reason})
+    prepared_df, _ = prepare_df(log=log)
+    return (
+        factorize(prepared_df, n_components, max_item_id),
+        analysis_fingerprint(prepared_df, n_components),
+    )
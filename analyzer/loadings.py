@@ -0,0 +1,202 @@
+import io
+from typing import Any
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from django.core.files.base import ContentFile
+from analyzer.models import PCAAnalysis, PCAItemLoading, PCALoadingMatrix
+
+
+LOADINGS_STORAGES: tuple[str, ...] = ("rows", "db", "file")
+
+
+class LoadingMatrix:
+    """
+    Read access to the loadings of an analysis.
+
+    Wraps a components x items matrix and the parliamentary item IDs of its
+    columns. A matrix read from a local file is memory-mapped, so reading a
+    single item or component only reads that part of the file.
+
+    Methods:
+        - component: The loadings of all items on a component.
+        - item: The loadings of an item on all components.
+        - to_frame: The whole matrix as a DataFrame.
+    """
+
+    def __init__(
+        self,
+        item_ids: npt.NDArray[np.int64],
+        matrix: npt.NDArray[np.floating[Any]],
+    ) -> None:
+        """
+        Args:
+            item_ids (npt.NDArray[np.int64]): The item ID of every column.
+            matrix (npt.NDArray[np.floating[Any]]): Components x items
+                array, component 1 first.
+        """
+        self.item_ids: npt.NDArray[np.int64] = item_ids
+        self.matrix: npt.NDArray[np.floating[Any]] = matrix
+        self._columns: dict[int, int] | None = None
+
+    @property
+    def n_components(self) -> int:
+        return int(self.matrix.shape[0])
+
+    def component(self, component: int) -> dict[int, float]:
+        """
+        Return the loadings on `component` (starting at 1) by item ID.
+
+        Raises:
+            KeyError: If the analysis has no such component.
+        """
+        if not 1 <= component <= self.n_components:
+            raise KeyError(component)
+        values = np.asarray(self.matrix[component - 1], dtype=np.float64)
+        return dict(zip(self.item_ids.tolist(), values.tolist()))
+
+    def item(self, item_id: int) -> dict[int, float]:
+        """
+        Return the loadings of item `item_id` by component.
+
+        Raises:
+            KeyError: If the item was not part of the analysis.
+        """
+        if self._columns is None:
+            self._columns = {
+                int(item): column
+                for column, item in enumerate(self.item_ids.tolist())
+            }
+        column = self._columns[item_id]
+        values = np.asarray(self.matrix[:, column], dtype=np.float64)
+        return dict(enumerate(values.tolist(), start=1))
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Return the matrix as a loadings DataFrame, with "PC1", "PC2", ...
+        as index and the item IDs as columns.
+        """
+        return pd.DataFrame(
+            np.asarray(self.matrix, dtype=np.float64),
+            index=[f"PC{i}" for i in range(1, self.n_components + 1)],
+            columns=self.item_ids,
+        )
+
+
+def store_loading_matrix(
+    analysis: PCAAnalysis, loadings: pd.DataFrame, storage: str = "db"
+) -> PCALoadingMatrix:
+    """
+    Store the loadings of an analysis as a float32 PCALoadingMatrix.
+
+    Args:
+        analysis (PCAAnalysis): The analysis the loadings belong to.
+        loadings (pd.DataFrame): The loadings, with "PC1", "PC2", ... as
+            index and the parliamentary item IDs as columns.
+        storage (str): "db" to store the matrix in the database, "file" to
+            store it as an .npy file in the default file storage.
+
+    Returns:
+        PCALoadingMatrix: The saved matrix.
+
+    Raises:
+        ValueError: If the storage is not "db" or "file".
+    """
+    if storage not in ("db", "file"):
+        raise ValueError(f"Unknown loading matrix storage: {storage}")
+
+    matrix = np.ascontiguousarray(loadings.to_numpy(dtype=np.float32))
+    loading_matrix = PCALoadingMatrix(
+        analysis=analysis,
+        n_components=matrix.shape[0],
+        n_items=matrix.shape[1],
+        item_ids=loadings.columns.to_numpy(dtype=np.int64).tobytes(),
+    )
+    if storage == "db":
+        loading_matrix.data = matrix.tobytes()
+    else:
+        buffer = io.BytesIO()
+        np.save(buffer, matrix, allow_pickle=False)
+        loading_matrix.file.save(
+            f"analysis_{analysis.id}.npy",
+            ContentFile(buffer.getvalue()),
+            save=False,
+        )
+    loading_matrix.save()
+    return loading_matrix
+
+
+def read_loading_matrix(loading_matrix: PCALoadingMatrix) -> LoadingMatrix:
+    """
+    Wrap a stored PCALoadingMatrix, without copying the data.
+    """
+    item_ids = np.frombuffer(loading_matrix.item_ids, dtype=np.int64)
+    if not loading_matrix.file:
+        matrix = np.frombuffer(loading_matrix.data, dtype=np.float32)
+        shape = (loading_matrix.n_components, loading_matrix.n_items)
+        return LoadingMatrix(item_ids, matrix.reshape(shape))
+
+    try:
+        path = loading_matrix.file.path
+    except NotImplementedError:
+        # Remote storage; read the whole file.
+        with loading_matrix.file.open("rb") as file:
+            data = io.BytesIO(file.read())
+        return LoadingMatrix(item_ids, np.load(data, allow_pickle=False))
+    return LoadingMatrix(
+        item_ids, np.load(path, mmap_mode="r", allow_pickle=False)
+    )
+
+
+def loadings_storage(analysis_id: int) -> str:
+    """
+    Return how the loadings of an analysis are stored, one of
+    `LOADINGS_STORAGES`.
+    """
+    loading_matrix = (
+        PCALoadingMatrix.objects.filter(analysis_id=analysis_id)
+        .only("file")
+        .first()
+    )
+    if loading_matrix is None:
+        return "rows"
+    return "file" if loading_matrix.file else "db"
+
+
+def get_loading_matrix(
+    analysis_id: int, from_rows: bool = True
+) -> LoadingMatrix | None:
+    """
+    Return the loadings of an analysis, however they are stored.
+
+    Args:
+        analysis_id (int): The ID of the analysis.
+        from_rows (bool): Whether to build the matrix from PCAItemLoading
+            rows if the analysis has no PCALoadingMatrix.
+
+    Returns:
+        LoadingMatrix | None: The loadings, or None if none are stored.
+    """
+    loading_matrix = PCALoadingMatrix.objects.filter(
+        analysis_id=analysis_id
+    ).first()
+    if loading_matrix is not None:
+        return read_loading_matrix(loading_matrix)
+    if not from_rows:
+        return None
+
+    rows = np.array(
+        PCAItemLoading.objects.filter(analysis_id=analysis_id)
+        .order_by("parliamentary_item_id", "component")
+        .values_list("parliamentary_item_id", "component", "loading"),
+        dtype=np.float64,
+    )
+    if not len(rows):
+        return None
+    item_ids, columns = np.unique(
+        rows[:, 0].astype(np.int64), return_inverse=True
+    )
+    components = rows[:, 1].astype(np.int64)
+    matrix = np.zeros((int(components.max()), len(item_ids)))
+    matrix[components - 1, columns] = rows[:, 2]
+    return LoadingMatrix(item_ids, matrix)
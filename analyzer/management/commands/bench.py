@@ -0,0 +1,134 @@
+import json
+from argparse import ArgumentParser
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Any
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import get_runner
+from api.tests.utils.testing_utils import without_api_cache
+from analyzer.benchmarks import (
+    BenchmarkResult,
+    BenchmarkSize,
+    benchmark_report,
+    compare_reports,
+    run_benchmarks,
+)
+
+
+class Command(BaseCommand):
+    """
+    Management command to benchmark the import, analysis and API hot paths
+    on synthetic datasets, see `analyzer.benchmarks`.
+
+    The benchmarks run against a test database, created and destroyed like
+    the test runner does, without the API response cache, and need the
+    development requirements.
+    """
+
+    help = "Benchmark the import, analysis and API hot paths."
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--parties",
+            type=int,
+            default=BenchmarkSize.parties,
+            help="Number of parties.",
+        )
+        parser.add_argument(
+            "--items",
+            type=int,
+            nargs="+",
+            default=[BenchmarkSize.items],
+            help="Number of parliamentary items. Pass several numbers to "
+            "benchmark several dataset sizes.",
+        )
+        parser.add_argument(
+            "--analyses",
+            type=int,
+            default=BenchmarkSize.analyses,
+            help="Number of PCA analyses run on each dataset.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Number of runs of the read-only benchmarks.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Seed of the synthetic datasets.",
+        )
+        parser.add_argument(
+            "--no-memory",
+            action="store_true",
+            help="Do not trace the peak memory, which slows down the runs.",
+        )
+        parser.add_argument(
+            "--output",
+            type=Path,
+            help="Write the results to this JSON file.",
+        )
+        parser.add_argument(
+            "--compare",
+            type=Path,
+            help="Compare the results to this JSON file of an earlier run.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if find_spec("factory") is None:
+            raise CommandError(
+                "The benchmarks need the development requirements, install "
+                "them with pip install -r requirements/dev.txt."
+            )
+        baseline = (
+            json.loads(options["compare"].read_text())
+            if options["compare"]
+            else None
+        )
+
+        runner = get_runner(settings)(verbosity=0, interactive=False)
+        runner.setup_test_environment()
+        api_cache_override = without_api_cache()
+        api_cache_override.enable()
+        old_config = runner.setup_databases()
+        try:
+            results: list[BenchmarkResult] = []
+            for items in options["items"]:
+                results += run_benchmarks(
+                    BenchmarkSize(
+                        parties=options["parties"],
+                        items=items,
+                        analyses=options["analyses"],
+                    ),
+                    repeat=options["repeat"],
+                    trace_memory=not options["no_memory"],
+                    seed=options["seed"],
+                )
+            report = benchmark_report(results)
+        finally:
+            runner.teardown_databases(old_config)
+            api_cache_override.disable()
+            runner.teardown_test_environment()
+
+        for result in results:
+            memory = (
+                f", {result.peak_memory / 2**20:.1f} MiB"
+                if result.peak_memory is not None
+                else ""
+            )
+            self.stdout.write(
+                f"{result.name} ({result.items} items): "
+                f"{result.min_wall_time:.3f}s, {result.queries} queries"
+                f"{memory}"
+            )
+        if baseline is not None:
+            self.stdout.write("Compared to the baseline:")
+            for line in compare_reports(baseline, report):
+                self.stdout.write(line)
+        if options["output"]:
+            options["output"].write_text(json.dumps(report, indent=2))
+            self.stdout.write(f"Results written to {options['output']}")
+        self.stdout.write(self.style.SUCCESS("Completed benchmarks"))
@@ -0,0 +1,62 @@
+from argparse import ArgumentParser
+from dataclasses import fields
+from typing import Any
+from django.core.management.base import BaseCommand
+from analyzer.retention import (
+    DEFAULT_PRUNE_BATCH_SIZE,
+    RetentionPolicy,
+    prune_analyses,
+)
+
+
+class Command(BaseCommand):
+    """
+    Management command to delete old PCA analyses according to the
+    retention policy.
+    """
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--keep-last",
+            type=int,
+            help="Number of most recent analyses to keep.",
+        )
+        parser.add_argument(
+            "--keep-daily-days",
+            type=int,
+            help="Keep the last analysis of each of this many days.",
+        )
+        parser.add_argument(
+            "--keep-monthly-months",
+            type=int,
+            help="Keep the last analysis of each of this many months.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_PRUNE_BATCH_SIZE,
+            help="Number of rows deleted per transaction.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report what would be deleted.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        # Options that are not given fall back to ANALYZER_RETENTION.
+        policy = RetentionPolicy.from_settings()
+        for name in ("keep_last", "keep_daily_days", "keep_monthly_months"):
+            if options[name] is not None:
+                setattr(policy, name, options[name])
+
+        stats = prune_analyses(
+            policy, batch_size=options["batch_size"], dry_run=options["dry_run"]
+        )
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        for field in fields(stats):
+            self.stdout.write(
+                f"{verb} {getattr(stats, field.name)} "
+                f"{field.name.replace('_', ' ')}"
+            )
+        self.stdout.write(self.style.SUCCESS("Completed pruning"))
@@ -1,8 +1,28 @@
+from argparse import ArgumentParser, BooleanOptionalAction
+from typing import Any
 from django.core.management.base import BaseCommand
 from analyzer.analysis import run_full_analysis
 
 
 class Command(BaseCommand):
-    def handle(self, *args: list[str], **options: dict[str, str]) -> None:
-        run_full_analysis(n_components=3, stdout=self.stdout)
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Run the PCA analysis even if the votes have not changed.",
+        )
+        parser.add_argument(
+            "--incremental",
+            action=BooleanOptionalAction,
+            help="Update the previous PCA with the new items instead of "
+            "refitting. Defaults to ANALYZER_INCREMENTAL['ENABLED'].",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        run_full_analysis(
+            n_components=3,
+            stdout=self.stdout,
+            force=options["force"],
+            incremental=options["incremental"],
+        )
         self.stdout.write(self.style.SUCCESS("Analysis completed"))
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.7 on 2026-10-18 13:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analyzer", "0001_initial"),
+        ("scraper", "0002_importrun"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="KeyItemRanking",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("component", models.IntegerField(blank=True, null=True)),
+                ("rank", models.PositiveIntegerField()),
+                ("total_loading", models.FloatField()),
+                (
+                    "analysis",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="key_items",
+                        to="analyzer.pcaanalysis",
+                    ),
+                ),
+                (
+                    "parliamentary_item",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="key_rankings",
+                        to="scraper.parliamentaryitem",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Key Item Ranking",
+                "verbose_name_plural": "Key Item Rankings",
+                "ordering": ["analysis", "component", "rank"],
+            },
+        ),
+    ]
@@ -0,0 +1,52 @@
+from collections import defaultdict
+from django.conf import settings
+from django.db import migrations
+
+
+def backfill_key_item_rankings(apps, schema_editor):
+    """
+    Store the key items of the analyses that were run before the rankings
+    were computed at analysis time.
+    """
+    PCAAnalysis = apps.get_model("analyzer", "PCAAnalysis")
+    PCAItemLoading = apps.get_model("analyzer", "PCAItemLoading")
+    KeyItemRanking = apps.get_model("analyzer", "KeyItemRanking")
+    top_k = getattr(settings, "ANALYZER_KEY_ITEMS_TOP_K", 10)
+
+    for analysis_id in PCAAnalysis.objects.values_list("id", flat=True):
+        totals = defaultdict(float)
+        per_component = defaultdict(dict)
+        for item_id, component, loading in PCAItemLoading.objects.filter(
+            analysis_id=analysis_id
+        ).values_list("parliamentary_item_id", "component", "loading"):
+            totals[item_id] += abs(loading)
+            per_component[component][item_id] = abs(loading)
+
+        rankings = [(None, totals)] + sorted(per_component.items())
+        KeyItemRanking.objects.bulk_create(
+            KeyItemRanking(
+                analysis_id=analysis_id,
+                parliamentary_item_id=item_id,
+                component=component,
+                rank=rank,
+                total_loading=total,
+            )
+            for component, items in rankings
+            for rank, (item_id, total) in enumerate(
+                sorted(items.items(), key=lambda item: -item[1])[:top_k],
+                start=1,
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analyzer", "0002_keyitemranking"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            backfill_key_item_rankings, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-18 13:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analyzer", "0003_backfill_keyitemranking"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PCALoadingMatrix",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("n_components", models.PositiveIntegerField()),
+                ("n_items", models.PositiveIntegerField()),
+                ("item_ids", models.BinaryField()),
+                ("data", models.BinaryField(blank=True, default=b"")),
+                ("file", models.FileField(blank=True, upload_to="loadings/")),
+                (
+                    "analysis",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="loading_matrix",
+                        to="analyzer.pcaanalysis",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "PCA Loading Matrix",
+                "verbose_name_plural": "PCA Loading Matrices",
+            },
+        ),
+    ]
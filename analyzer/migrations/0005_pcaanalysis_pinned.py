@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analyzer", "0004_pcaloadingmatrix"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pcaanalysis",
+            name="pinned",
+            field=models.BooleanField(default=False),
+        ),
+    ]
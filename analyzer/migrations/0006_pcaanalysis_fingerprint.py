@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 13:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analyzer", "0005_pcaanalysis_pinned"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pcaanalysis",
+            name="fingerprint",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+    ]
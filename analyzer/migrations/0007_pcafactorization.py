@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-18 13:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analyzer", "0006_pcaanalysis_fingerprint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PCAFactorization",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("parties", models.JSONField()),
+                ("max_item_id", models.BigIntegerField()),
+                ("n_components", models.PositiveIntegerField()),
+                ("refit_at", models.DateTimeField()),
+                ("arrays", models.BinaryField()),
+                (
+                    "analysis",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="factorization",
+                        to="analyzer.pcaanalysis",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "PCA Factorization",
+                "verbose_name_plural": "PCA Factorizations",
+            },
+        ),
+    ]
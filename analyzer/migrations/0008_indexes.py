@@ -0,0 +1,73 @@
+# Generated by Django 5.2.7 on 2026-10-18 13:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analyzer", "0007_pcafactorization"),
+        ("scraper", "0003_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="keyitemranking",
+            name="analysis",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="key_items",
+                to="analyzer.pcaanalysis",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="pcacomponentpartyscore",
+            name="analysis",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="party_scores",
+                to="analyzer.pcaanalysis",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="pcaitemloading",
+            name="analysis",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="item_loadings",
+                to="analyzer.pcaanalysis",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="keyitemranking",
+            index=models.Index(
+                fields=["analysis", "component", "rank"],
+                name="analyzer_ranking_analysis_comp",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pcacomponentpartyscore",
+            index=models.Index(
+                fields=["analysis", "party", "component"],
+                name="analyzer_score_analysis_party",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pcaitemloading",
+            index=models.Index(
+                fields=["analysis", "parliamentary_item", "component"],
+                name="analyzer_loading_analysis_item",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pcaitemloading",
+            index=models.Index(
+                fields=["analysis", "component"],
+                name="analyzer_loading_analysis_comp",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 13:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analyzer", "0008_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pcaanalysis",
+            name="metrics",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
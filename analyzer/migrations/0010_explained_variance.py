@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analyzer", "0009_metrics"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pcaanalysis",
+            name="explained_variance",
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
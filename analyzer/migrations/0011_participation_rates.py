@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analyzer", "0010_explained_variance"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pcaanalysis",
+            name="participation_rates",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
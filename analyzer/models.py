@@ -8,6 +8,19 @@ class PCAAnalysis(models.Model):
     """
 
     created_at = models.DateTimeField(auto_now_add=True)
+    # Pinned analyses are never removed by the retention policy.
+    pinned = models.BooleanField(default=False)
+    # Hash of the input of the analysis, see `analysis_fingerprint`.
+    fingerprint = models.CharField(max_length=64, blank=True, default="")
+    # Duration, query count and row counts per stage of the analysis, see
+    # `StageTimer`.
+    metrics = models.JSONField(blank=True, default=dict)
+    # Fraction of the variance explained by each component, first component
+    # first.
+    explained_variance = models.JSONField(blank=True, default=list)
+    # Participation rate of each party at the time of the analysis, keyed on
+    # the party id. Empty for analyses from before it was recorded.
+    participation_rates = models.JSONField(blank=True, default=dict)
 
     class Meta:
         verbose_name = "PCA Analysis"
@@ -22,8 +35,12 @@ class PCAComponentPartyScore(models.Model):
     Model to store PCA scores for each party
     """
 
+    # Indexed by the composite index below.
     analysis = models.ForeignKey(
-        PCAAnalysis, on_delete=models.CASCADE, related_name="party_scores"
+        PCAAnalysis,
+        on_delete=models.CASCADE,
+        related_name="party_scores",
+        db_index=False,
     )
     party = models.ForeignKey(
         Party, on_delete=models.CASCADE, related_name="pca_scores"
@@ -34,6 +51,12 @@ class PCAComponentPartyScore(models.Model):
     class Meta:
         verbose_name = "PCA Component Party Score"
         verbose_name_plural = "PCA Component Party Scores"
+        indexes = [
+            models.Index(
+                fields=["analysis", "party", "component"],
+                name="analyzer_score_analysis_party",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.party} PC: {self.component}- score: {self.score}"
@@ -44,8 +67,12 @@ class PCAItemLoading(models.Model):
     Model to store PCA loadings for each parliamentary item
     """
 
+    # Indexed by the composite indexes below.
     analysis = models.ForeignKey(
-        PCAAnalysis, on_delete=models.CASCADE, related_name="item_loadings"
+        PCAAnalysis,
+        on_delete=models.CASCADE,
+        related_name="item_loadings",
+        db_index=False,
     )
     parliamentary_item = models.ForeignKey(
         ParliamentaryItem, on_delete=models.CASCADE, related_name="pca_loadings"
@@ -56,6 +83,113 @@ class PCAItemLoading(models.Model):
     class Meta:
         verbose_name = "PCA Item Loading"
         verbose_name_plural = "PCA Item Loadings"
+        indexes = [
+            models.Index(
+                fields=["analysis", "parliamentary_item", "component"],
+                name="analyzer_loading_analysis_item",
+            ),
+            models.Index(
+                fields=["analysis", "component"],
+                name="analyzer_loading_analysis_comp",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"Item ID: {self.parliamentary_item_id} PC: {self.component}- loading: {self.loading}"
+
+
+class KeyItemRanking(models.Model):
+    """
+    Model to store the parliamentary items with the largest absolute
+    loadings of an analysis, overall and per component
+    """
+
+    # Indexed by the composite index below.
+    analysis = models.ForeignKey(
+        PCAAnalysis,
+        on_delete=models.CASCADE,
+        related_name="key_items",
+        db_index=False,
+    )
+    parliamentary_item = models.ForeignKey(
+        ParliamentaryItem, on_delete=models.CASCADE, related_name="key_rankings"
+    )
+    # Null for the ranking over all components.
+    component = models.IntegerField(null=True, blank=True)
+    rank = models.PositiveIntegerField()
+    total_loading = models.FloatField()
+
+    class Meta:
+        verbose_name = "Key Item Ranking"
+        verbose_name_plural = "Key Item Rankings"
+        ordering = ["analysis", "component", "rank"]
+        indexes = [
+            models.Index(
+                fields=["analysis", "component", "rank"],
+                name="analyzer_ranking_analysis_comp",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        component = self.component or "all"
+        return (
+            f"Item ID: {self.parliamentary_item_id} PC: {component}- "
+            f"rank: {self.rank}"
+        )
+
+
+class PCALoadingMatrix(models.Model):
+    """
+    Model to store the loadings of an analysis as a compact float32 matrix,
+    instead of a PCAItemLoading row per item and component
+    """
+
+    analysis = models.OneToOneField(
+        PCAAnalysis, on_delete=models.CASCADE, related_name="loading_matrix"
+    )
+    n_components = models.PositiveIntegerField()
+    n_items = models.PositiveIntegerField()
+    # int64 parliamentary item IDs, in column order of the matrix.
+    item_ids = models.BinaryField()
+    # float32 components x items matrix, in row-major order. Empty when the
+    # matrix is stored in `file`.
+    data = models.BinaryField(blank=True, default=b"")
+    file = models.FileField(upload_to="loadings/", blank=True)
+
+    class Meta:
+        verbose_name = "PCA Loading Matrix"
+        verbose_name_plural = "PCA Loading Matrices"
+
+    def __str__(self) -> str:
+        return (
+            f"Loadings of analysis {self.analysis_id}: "
+            f"{self.n_components} x {self.n_items}"
+        )
+
+
+class PCAFactorization(models.Model):
+    """
+    Model to store the SVD of the standardized vote matrix of an analysis,
+    so the next analysis can add new items to it instead of refitting
+    """
+
+    analysis = models.OneToOneField(
+        PCAAnalysis, on_delete=models.CASCADE, related_name="factorization"
+    )
+    # Abbreviations of the parties, in row order.
+    parties = models.JSONField()
+    # Highest ParliamentaryItem ID that was considered.
+    max_item_id = models.BigIntegerField()
+    n_components = models.PositiveIntegerField()
+    # Time of the last full refit.
+    refit_at = models.DateTimeField()
+    # NumPy .npz archive with the item IDs, per-item mean and standard
+    # deviation, U, S and V^T of the SVD and U at the last full refit.
+    arrays = models.BinaryField()
+
+    class Meta:
+        verbose_name = "PCA Factorization"
+        verbose_name_plural = "PCA Factorizations"
+
+    def __str__(self) -> str:
+        return f"Factorization of analysis {self.analysis_id}"
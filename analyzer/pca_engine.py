@@ -0,0 +1,187 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Protocol
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+
+@dataclass
+class PCAResult:
+    """
+    Output of a PCA engine.
+
+    Attributes:
+        scores (npt.NDArray[np.floating[Any]]): Samples x components array
+            with the principal component scores (the parties).
+        loadings (npt.NDArray[np.floating[Any]]): Components x features array
+            with the loadings (the parliamentary items).
+        explained_variance_ratio (npt.NDArray[np.floating[Any]]): Fraction
+            of the total variance explained by each component.
+    """
+
+    scores: npt.NDArray[np.floating[Any]]
+    loadings: npt.NDArray[np.floating[Any]]
+    explained_variance_ratio: npt.NDArray[np.floating[Any]]
+
+    @property
+    def n_components(self) -> int:
+        return int(self.loadings.shape[0])
+
+
+class PCAEngine(Protocol):
+    """
+    Interface for the PCA backends used by the analyzer.
+    """
+
+    def fit(self, matrix: npt.ArrayLike, n_components: int) -> PCAResult:
+        """
+        Fit the PCA on a samples x features matrix without missing values.
+        """
+        ...
+
+
+def svd_flip(
+    u: npt.NDArray[np.floating[Any]], vt: npt.NDArray[np.floating[Any]]
+) -> tuple[npt.NDArray[np.floating[Any]], npt.NDArray[np.floating[Any]]]:
+    """
+    Make the signs of an SVD deterministic.
+
+    The largest absolute value in every row of `vt` is made positive, which
+    is the convention scikit-learn's PCA (and thus the `pca` package) uses.
+    """
+    max_abs_rows = np.argmax(np.abs(vt), axis=1)
+    signs = np.sign(vt[np.arange(vt.shape[0]), max_abs_rows])
+    signs[signs == 0] = 1
+    return u * signs, vt * signs[:, np.newaxis]
+
+
+class SVDEngine:
+    """
+    PCA through a single truncated SVD of the centered (and optionally
+    normalized) matrix.
+
+    Gives the same scores, loadings and explained variance as the `pca`
+    package with `normalize=True`, without computing anything else.
+    """
+
+    def __init__(
+        self, normalize: bool = True, dtype: npt.DTypeLike = np.float64
+    ) -> None:
+        """
+        Args:
+            normalize (bool): Scale every feature to unit variance.
+            dtype (npt.DTypeLike): Floating point type used for the
+                calculation, e.g. "float32" to halve the memory use.
+        """
+        self.normalize: bool = normalize
+        self.dtype: np.dtype[Any] = np.dtype(dtype)
+
+    def standardize(
+        self, matrix: npt.ArrayLike
+    ) -> npt.NDArray[np.floating[Any]]:
+        """
+        Center every column and, when normalizing, scale it to unit variance.
+        Constant columns are only centered.
+        """
+        x = np.array(matrix, dtype=self.dtype)
+        x -= x.mean(axis=0)
+        if self.normalize:
+            std = x.std(axis=0)
+            std[std < 10 * np.finfo(self.dtype).eps] = 1.0
+            x /= std
+        return x
+
+    def fit(self, matrix: npt.ArrayLike, n_components: int) -> PCAResult:
+        """
+        Fit the PCA on a samples x features matrix.
+
+        Args:
+            matrix (npt.ArrayLike): The data, without missing values.
+            n_components (int): Number of components to return. Capped at
+                the rank limit of the matrix.
+
+        Returns:
+            PCAResult: The scores, loadings and explained variance ratio.
+        """
+        x = self.standardize(matrix)
+        u, s, vt = np.linalg.svd(x, full_matrices=False)
+        u, vt = svd_flip(u, vt)
+
+        n_components = min(n_components, s.shape[0])
+        variance = s**2
+        total_variance = variance.sum()
+        ratio = (
+            variance / total_variance
+            if total_variance > 0
+            else np.zeros_like(variance)
+        )
+        return PCAResult(
+            scores=u[:, :n_components] * s[:n_components],
+            loadings=vt[:n_components],
+            explained_variance_ratio=ratio[:n_components],
+        )
+
+
+class PcaPackageEngine:
+    """
+    PCA through the third-party `pca` package.
+
+    The package is an optional dependency; it computes additional output
+    (outlier statistics, plots) that the analyzer does not use.
+    """
+
+    def __init__(self, normalize: bool = True) -> None:
+        self.normalize: bool = normalize
+
+    def fit(self, matrix: npt.ArrayLike, n_components: int) -> PCAResult:
+        try:
+            from pca import pca
+        except ImportError as e:
+            raise ImproperlyConfigured(
+                "The 'pca' PCA engine requires the pca package."
+            ) from e
+
+        model = pca(
+            n_components=n_components, normalize=self.normalize, verbose=0
+        )
+        model.fit_transform(pd.DataFrame(np.asarray(matrix)))
+        cumulative = np.asarray(model.results["explained_var"])
+        ratio = np.diff(cumulative, prepend=0.0)
+        return PCAResult(
+            scores=model.results["PC"].to_numpy(),
+            loadings=model.results["loadings"].to_numpy(),
+            explained_variance_ratio=ratio[:n_components],
+        )
+
+
+PCA_ENGINES: dict[str, Callable[..., PCAEngine]] = {
+    "svd": SVDEngine,
+    "pca": PcaPackageEngine,
+}
+
+
+def get_pca_engine(backend: str | None = None, **options: Any) -> PCAEngine:
+    """
+    Return the configured PCA engine.
+
+    Without arguments, the engine is built from the `ANALYZER_PCA_ENGINE`
+    setting, e.g. `{"BACKEND": "svd", "OPTIONS": {"dtype": "float32"}}`.
+
+    Args:
+        backend (str | None): Name of the engine in `PCA_ENGINES`.
+        **options: Keyword arguments for the engine.
+
+    Raises:
+        ImproperlyConfigured: If the backend is unknown.
+    """
+    if backend is None:
+        config: dict[str, Any] = settings.ANALYZER_PCA_ENGINE
+        backend = config.get("BACKEND", "svd")
+        options = {**config.get("OPTIONS", {}), **options}
+    try:
+        engine_class = PCA_ENGINES[str(backend)]
+    except KeyError as e:
+        raise ImproperlyConfigured(f"Unknown PCA engine: {backend}") from e
+    return engine_class(**options)
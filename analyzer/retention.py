@@ -0,0 +1,215 @@
+from collections import Counter
+from dataclasses import dataclass, fields
+from datetime import date, datetime
+from typing import Any
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
+from analyzer.models import (
+    KeyItemRanking,
+    PCAAnalysis,
+    PCAComponentPartyScore,
+    PCAFactorization,
+    PCAItemLoading,
+    PCALoadingMatrix,
+)
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PRUNE_BATCH_SIZE: int = 10000
+
+# The models deleted with an analysis, by `PruneStats` field, with the
+# lookup that selects the rows of a list of analyses.
+PRUNED_MODELS: dict[str, tuple[type[models.Model], str]] = {
+    "analyses": (PCAAnalysis, "id__in"),
+    "party_scores": (PCAComponentPartyScore, "analysis_id__in"),
+    "item_loadings": (PCAItemLoading, "analysis_id__in"),
+    "key_items": (KeyItemRanking, "analysis_id__in"),
+    "loading_matrices": (PCALoadingMatrix, "analysis_id__in"),
+    "factorizations": (PCAFactorization, "analysis_id__in"),
+}
+
+
+@dataclass
+class RetentionPolicy:
+    """
+    Which PCA analyses to keep.
+
+    Attributes:
+        keep_last (int): Number of most recent analyses to keep. The latest
+            analysis is always kept.
+        keep_daily_days (int): Keep the last analysis of each of this many
+            days, counting back from today.
+        keep_monthly_months (int | None): Keep the last analysis of each of
+            this many months, counting back from this month. None keeps one
+            analysis per month forever.
+    """
+
+    keep_last: int = 7
+    keep_daily_days: int = 30
+    keep_monthly_months: int | None = None
+
+    @classmethod
+    def from_settings(cls) -> "RetentionPolicy":
+        """
+        Build the policy from the `ANALYZER_RETENTION` setting.
+        """
+        config: dict[str, Any] = settings.ANALYZER_RETENTION
+        defaults = cls()
+        return cls(
+            keep_last=config.get("KEEP_LAST", defaults.keep_last),
+            keep_daily_days=config.get(
+                "KEEP_DAILY_DAYS", defaults.keep_daily_days
+            ),
+            keep_monthly_months=config.get(
+                "KEEP_MONTHLY_MONTHS", defaults.keep_monthly_months
+            ),
+        )
+
+
+@dataclass
+class PruneStats:
+    """
+    Number of rows deleted (or to be deleted, for a dry run) per table.
+    """
+
+    analyses: int = 0
+    party_scores: int = 0
+    item_loadings: int = 0
+    key_items: int = 0
+    loading_matrices: int = 0
+    factorizations: int = 0
+
+    @property
+    def total(self) -> int:
+        return sum(getattr(self, field.name) for field in fields(self))
+
+
+def months_between(start: date, end: date) -> int:
+    """
+    Return the number of calendar months from `start` to `end`.
+    """
+    return (end.year - start.year) * 12 + end.month - start.month
+
+
+def select_analyses_to_prune(
+    policy: RetentionPolicy, now: datetime | None = None
+) -> list[int]:
+    """
+    Return the IDs of the analyses the policy does not keep.
+
+    Days and months are calendar days and months in the current time zone.
+
+    Args:
+        policy (RetentionPolicy): The retention policy.
+        now (datetime | None): The current time. Defaults to now.
+
+    Returns:
+        list[int]: The IDs, most recent analysis first.
+    """
+    today = timezone.localtime(now).date()
+    analyses = PCAAnalysis.objects.order_by("-created_at", "-id").values_list(
+        "id", "created_at", "pinned"
+    )
+
+    prune: list[int] = []
+    days: set[date] = set()
+    months: set[tuple[int, int]] = set()
+    for position, (analysis_id, created_at, pinned) in enumerate(analyses):
+        day = timezone.localtime(created_at).date()
+        month = (day.year, day.month)
+        # Analyses are sorted newest first, so the first one seen for a day
+        # or month is the last one of that day or month.
+        keep_day = (today - day).days < policy.keep_daily_days and (
+            day not in days
+        )
+        keep_month = (
+            policy.keep_monthly_months is None
+            or months_between(day, today) < policy.keep_monthly_months
+        ) and month not in months
+        days.add(day)
+        months.add(month)
+
+        if pinned or position < max(policy.keep_last, 1):
+            continue
+        if keep_day or keep_month:
+            continue
+        prune.append(analysis_id)
+    return prune
+
+
+def delete_in_batches(
+    queryset: models.QuerySet[Any], batch_size: int
+) -> Counter[str]:
+    """
+    Delete the rows of `queryset` `batch_size` at a time, each batch in its
+    own transaction.
+
+    Returns:
+        Counter[str]: The number of deleted rows per model label.
+    """
+    deleted: Counter[str] = Counter()
+    while True:
+        with transaction.atomic():
+            ids = list(queryset.values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                return deleted
+            _, counts = queryset.model._default_manager.filter(
+                pk__in=ids
+            ).delete()
+        deleted.update(counts)
+
+
+def prune_analyses(
+    policy: RetentionPolicy | None = None,
+    batch_size: int = DEFAULT_PRUNE_BATCH_SIZE,
+    dry_run: bool = False,
+    now: datetime | None = None,
+) -> PruneStats:
+    """
+    Delete the analyses the retention policy does not keep, with their
+    scores, loadings and rankings.
+
+    The rows of an analysis are deleted `batch_size` rows at a time, each
+    batch in its own transaction, so the locks on the large loadings table
+    are short however many items an analysis has. The analysis itself is
+    deleted last; an interrupted run leaves it to the next run.
+
+    Args:
+        policy (RetentionPolicy | None): The policy. Defaults to the
+            `ANALYZER_RETENTION` setting.
+        batch_size (int): Number of rows deleted per transaction.
+        dry_run (bool): Only count the rows that would be deleted.
+        now (datetime | None): The current time. Defaults to now.
+
+    Returns:
+        PruneStats: The number of deleted rows per table.
+    """
+    if policy is None:
+        policy = RetentionPolicy.from_settings()
+
+    stats = PruneStats()
+    for analysis_id in select_analyses_to_prune(policy, now):
+        deleted: Counter[str] = Counter()
+        for model, lookup in PRUNED_MODELS.values():
+            rows = model._default_manager.filter(**{lookup: [analysis_id]})
+            if dry_run:
+                deleted[model._meta.label] = rows.count()
+            elif model is not PCAAnalysis:
+                deleted.update(delete_in_batches(rows, batch_size))
+        if not dry_run:
+            with transaction.atomic():
+                _, counts = PCAAnalysis.objects.filter(id=analysis_id).delete()
+            deleted.update(counts)
+
+        for name, (model, _) in PRUNED_MODELS.items():
+            setattr(
+                stats, name, getattr(stats, name) + deleted[model._meta.label]
+            )
+        logger.info(
+            f"Pruned PCA analysis {analysis_id}.",
+            extra={"analysis_id": analysis_id, "dry_run": dry_run},
+        )
+    return stats
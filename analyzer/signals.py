@@ -0,0 +1,24 @@
+from typing import Any
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from analyzer.models import PCAAnalysis, PCALoadingMatrix
+from scraper.versions import ANALYSIS_DATA, bump_data_version
+
+
+@receiver(post_save, sender=PCAAnalysis)
+@receiver(post_delete, sender=PCAAnalysis)
+def bump_analysis_version(
+    sender: type[PCAAnalysis], created: bool = False, **kwargs: Any
+) -> None:
+    # `run_pca_analysis` creates the analysis before its results and saves
+    # it again once they are stored, so a new analysis bumps only then.
+    if not created:
+        bump_data_version(ANALYSIS_DATA)
+
+
+@receiver(post_delete, sender=PCALoadingMatrix)
+def delete_loading_matrix_file(
+    sender: type[PCALoadingMatrix], instance: PCALoadingMatrix, **kwargs: Any
+) -> None:
+    if instance.file:
+        instance.file.delete(save=False)
@@ -1,9 +1,30 @@
+from io import StringIO
+from unittest import mock
+import numpy as np
+import pandas as pd
 from analyzer.analysis import run_pca_analysis, prepare_df
-from django.test import TestCase
+from analyzer.analysis import (
+    loading_rows,
+    save_item_loadings,
+    save_key_item_rankings,
+)
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from django.db.models import QuerySet
-from scraper.models import ParliamentaryItem
-from analyzer.models import PCAAnalysis, PCAComponentPartyScore, PCAItemLoading
-from analyzer.analysis import calculate_party_participation_rate
+from scraper.models import ParliamentaryItem, PartyVote, VoteType
+from scraper.versions import ANALYSIS_DATA, get_data_versions
+from analyzer.models import (
+    KeyItemRanking,
+    PCAAnalysis,
+    PCAComponentPartyScore,
+    PCAItemLoading,
+)
+from analyzer.analysis import (
+    calculate_party_participation_rate,
+    run_full_analysis,
+)
 from analyzer.utils import AnalysisLogger
 from scraper.tests.utils.testing_utils import (
     generate_party_votes,
@@ -39,6 +60,41 @@ class TestCalculatePartyParticipationRate(TestCase):
             party.refresh_from_db()
             self.assertEqual(party.participation_rate, expected_rate)
 
+    def test_uses_constant_number_of_queries(self) -> None:
+        generate_party_votes(
+            parliamentary_items=self.items,
+            parties=self.parties,
+            calculate_participation_rate=False,
+        )
+        # Item count, grouped vote count, parties and one bulk update
+        with self.assertNumQueries(4):
+            calculate_party_participation_rate()
+
+    def test_rate_within_date_window(self) -> None:
+        generate_party_votes(
+            parliamentary_items=self.items,
+            parties=self.parties,
+            calculate_participation_rate=False,
+        )
+        party = self.parties.first()
+        assert party is not None
+        ordered = list(self.items.order_by("date"))
+        # The party skipped the two oldest items.
+        PartyVote.objects.filter(
+            party=party, parliamentary_item__in=ordered[:2]
+        ).delete()
+
+        rates = calculate_party_participation_rate(start=ordered[2].date)
+        self.assertEqual(100.0, rates[party.id])
+        rates = calculate_party_participation_rate(end=ordered[2].date)
+        self.assertEqual(0.0, rates[party.id])
+        # The all-time rate is kept.
+        party.refresh_from_db()
+        self.assertIsNone(party.participation_rate)
+
+        with self.assertRaises(ValueError):
+            calculate_party_participation_rate(end=ordered[2].date, save=True)
+
 
 class TestPrepareDF(TestCase):
     def setUp(self) -> None:
@@ -85,3 +141,277 @@ class TestRunPCAAnalysis(TestCase):
         self.assertEqual(1, PCAAnalysis.objects.count())
         self.assertEqual(45, PCAComponentPartyScore.objects.count())
         self.assertEqual(10 * 3, PCAItemLoading.objects.count())
+
+    def test_party_scores_are_written_at_once(self) -> None:
+        generate_party_votes(
+            parliamentary_items=generate_parliamentary_items(10),
+            parties=generate_parties(),
+        )
+        with CaptureQueriesContext(connection) as context:
+            run_pca_analysis(n_components=3)
+        score_inserts = [
+            query
+            for query in context.captured_queries
+            if query["sql"].startswith(
+                'INSERT INTO "analyzer_pcacomponentpartyscore"'
+            )
+        ]
+        self.assertEqual(1, len(score_inserts))
+
+        score = PCAComponentPartyScore.objects.select_related("party").get(
+            component=2, party__abbreviation="VVD"
+        )
+        self.assertEqual(score.analysis, PCAAnalysis.objects.get())
+
+    def test_stage_metrics_are_stored(self) -> None:
+        generate_party_votes(
+            parliamentary_items=generate_parliamentary_items(10),
+            parties=generate_parties(),
+        )
+        analysis = run_pca_analysis(n_components=3)
+        assert analysis is not None
+        analysis.refresh_from_db()
+
+        stages = analysis.metrics["stages"]
+        self.assertListEqual(
+            ["dataframe", "pca_fit", "persistence"], list(stages)
+        )
+        self.assertEqual(15, stages["dataframe"]["parties"])
+        self.assertEqual(10, stages["dataframe"]["items"])
+        self.assertEqual(0, stages["pca_fit"]["queries"])
+        self.assertEqual(30, stages["persistence"]["loadings"])
+        self.assertEqual(45, stages["persistence"]["party_scores"])
+        self.assertGreater(stages["persistence"]["queries"], 0)
+        self.assertAlmostEqual(
+            sum(stage["seconds"] for stage in stages.values()),
+            analysis.metrics["seconds"],
+        )
+
+    def test_explained_variance_is_stored(self) -> None:
+        generate_party_votes(
+            parliamentary_items=generate_parliamentary_items(10),
+            parties=generate_parties(),
+        )
+        analysis = run_pca_analysis(n_components=3)
+        assert analysis is not None
+        analysis.refresh_from_db()
+
+        variance = analysis.explained_variance
+        self.assertEqual(3, len(variance))
+        self.assertListEqual(sorted(variance, reverse=True), variance)
+        self.assertLessEqual(sum(variance), 1.0 + 1e-9)
+
+    def test_analysis_data_version_is_bumped_once(self) -> None:
+        generate_party_votes(
+            parliamentary_items=generate_parliamentary_items(10),
+            parties=generate_parties(),
+        )
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            run_pca_analysis(n_components=3)
+        self.assertEqual(1, len(callbacks))
+        self.assertEqual(
+            {ANALYSIS_DATA: 1}, get_data_versions([ANALYSIS_DATA])[0]
+        )
+
+    def test_full_analysis_measures_participation_rate(self) -> None:
+        generate_party_votes(
+            parliamentary_items=generate_parliamentary_items(10),
+            parties=generate_parties(),
+        )
+        stdout = StringIO()
+        call_command("run_analysis", stdout=stdout)
+        analysis = PCAAnalysis.objects.get()
+
+        stages = analysis.metrics["stages"]
+        self.assertEqual("participation_rate", next(iter(stages)))
+        self.assertEqual(15, stages["participation_rate"]["parties"])
+        self.assertIn("persistence: ", stdout.getvalue())
+
+    def test_full_analysis_logs_stages(self) -> None:
+        generate_party_votes(
+            parliamentary_items=generate_parliamentary_items(10),
+            parties=generate_parties(),
+        )
+        with mock.patch("builtins.print") as print_mock:
+            with self.assertLogs("analyzer.analysis", "INFO") as logs:
+                run_full_analysis(n_components=3)
+        stages = [
+            record.getMessage().split(":")[0].removeprefix("Analysis stage ")
+            for record in logs.records
+            if record.getMessage().startswith("Analysis stage ")
+        ]
+        self.assertListEqual(
+            list(PCAAnalysis.objects.get().metrics["stages"]), stages
+        )
+        for call in print_mock.call_args_list:
+            self.assertNotIn("queries", call.args[0])
+
+
+class TestAnalysisFingerprint(TestCase):
+    def setUp(self) -> None:
+        generate_party_votes(
+            parliamentary_items=generate_parliamentary_items(10),
+            parties=generate_parties(),
+        )
+
+    def test_unchanged_input_is_skipped(self) -> None:
+        first = run_pca_analysis(n_components=3)
+        assert first is not None
+        self.assertEqual(len(first.fingerprint), 64)
+        self.assertIsNone(run_pca_analysis(n_components=3))
+        self.assertEqual(1, PCAAnalysis.objects.count())
+        self.assertEqual(45, PCAComponentPartyScore.objects.count())
+
+    def test_force(self) -> None:
+        first = run_pca_analysis(n_components=3)
+        second = run_pca_analysis(n_components=3, force=True)
+        assert first is not None and second is not None
+        self.assertEqual(first.fingerprint, second.fingerprint)
+        self.assertEqual(2, PCAAnalysis.objects.count())
+
+    def test_changed_vote_runs_analysis(self) -> None:
+        run_pca_analysis(n_components=3)
+        vote = PartyVote.objects.first()
+        assert vote is not None
+        vote.vote = (
+            VoteType.AGAINST if vote.vote != VoteType.AGAINST else VoteType.FOR
+        )
+        vote.save()
+        self.assertIsNotNone(run_pca_analysis(n_components=3))
+
+    def test_changed_n_components_runs_analysis(self) -> None:
+        run_pca_analysis(n_components=3)
+        self.assertIsNotNone(run_pca_analysis(n_components=2))
+
+    def test_changed_engine_runs_analysis(self) -> None:
+        run_pca_analysis(n_components=3)
+        with override_settings(
+            ANALYZER_PCA_ENGINE={
+                "BACKEND": "svd",
+                "OPTIONS": {"dtype": "float32"},
+            }
+        ):
+            self.assertIsNotNone(run_pca_analysis(n_components=3))
+
+    def test_changed_loadings_storage_runs_analysis(self) -> None:
+        run_pca_analysis(n_components=3)
+        with override_settings(ANALYZER_LOADINGS_STORAGE="db"):
+            self.assertIsNotNone(run_pca_analysis(n_components=3))
+            self.assertIsNone(run_pca_analysis(n_components=3))
+
+    def test_command_force(self) -> None:
+        call_command("run_analysis", stdout=StringIO())
+        stdout = StringIO()
+        call_command("run_analysis", stdout=stdout)
+        self.assertIn("PCA analysis skipped", stdout.getvalue())
+        call_command("run_analysis", "--force", stdout=StringIO())
+        self.assertEqual(2, PCAAnalysis.objects.count())
+
+
+class TestSaveItemLoadings(TestCase):
+    def setUp(self) -> None:
+        self.items = generate_parliamentary_items(4)
+        self.analysis = PCAAnalysis.objects.create()
+        self.loadings = pd.DataFrame(
+            np.arange(8, dtype=np.float64).reshape(2, 4) / 10,
+            index=["PC1", "PC2"],
+            columns=[item.id for item in self.items],
+        )
+
+    def test_loading_rows(self) -> None:
+        item_ids, components, values = loading_rows(self.loadings)
+        first, second = self.items[0].id, self.items[1].id
+        self.assertEqual(item_ids[:4].tolist(), [first, first, second, second])
+        self.assertEqual(components[:4].tolist(), [1, 2, 1, 2])
+        self.assertEqual(values[:4].tolist(), [0.0, 0.4, 0.1, 0.5])
+
+    def test_loadings_are_saved(self) -> None:
+        written = save_item_loadings(self.analysis, self.loadings)
+        self.assertEqual(written, 8)
+        loading = PCAItemLoading.objects.get(
+            parliamentary_item=self.items[3], component=2
+        )
+        self.assertEqual(loading.loading, 0.7)
+        self.assertEqual(loading.analysis, self.analysis)
+
+    def test_loadings_are_written_in_batches(self) -> None:
+        with self.assertNumQueries(3):
+            save_item_loadings(self.analysis, self.loadings, batch_size=3)
+        self.assertEqual(8, PCAItemLoading.objects.count())
+
+    def test_raw_insert(self) -> None:
+        # The PostgreSQL path only uses portable SQL, so it runs here too.
+        with mock.patch.object(connection, "vendor", "postgresql"):
+            with CaptureQueriesContext(connection) as queries:
+                written = save_item_loadings(
+                    self.analysis, self.loadings, batch_size=3
+                )
+        self.assertEqual(written, 8)
+        # One executemany per batch, with the raw column list.
+        self.assertListEqual(
+            [
+                f'{rows} times: INSERT INTO "analyzer_pcaitemloading" '
+                "(analysis_id, parliamentary_item_id, component, loading)"
+                for rows in (3, 3, 2)
+            ],
+            [query["sql"].split(" VALUES")[0] for query in queries],
+        )
+        self.assertListEqual(
+            [
+                (item.id, component, value / 10)
+                for item, values in zip(
+                    self.items, [(0, 4), (1, 5), (2, 6), (3, 7)]
+                )
+                for component, value in zip((1, 2), values)
+            ],
+            list(
+                PCAItemLoading.objects.filter(analysis=self.analysis)
+                .order_by("parliamentary_item_id", "component")
+                .values_list("parliamentary_item_id", "component", "loading")
+            ),
+        )
+
+
+class TestSaveKeyItemRankings(TestCase):
+    def setUp(self) -> None:
+        self.items = generate_parliamentary_items(4)
+        self.analysis = PCAAnalysis.objects.create()
+        self.loadings = pd.DataFrame(
+            [[0.1, -0.9, 0.3, 0.0], [0.8, 0.2, -0.5, 0.1]],
+            index=["PC1", "PC2"],
+            columns=[item.id for item in self.items],
+        )
+
+    def ranked_items(self, component: int | None) -> list[int]:
+        return list(
+            KeyItemRanking.objects.filter(
+                analysis=self.analysis, component=component
+            )
+            .order_by("rank")
+            .values_list("parliamentary_item_id", flat=True)
+        )
+
+    def test_rankings(self) -> None:
+        written = save_key_item_rankings(self.analysis, self.loadings, top_k=2)
+        self.assertEqual(written, 6)
+        ids = [item.id for item in self.items]
+        self.assertEqual(self.ranked_items(None), [ids[1], ids[0]])
+        self.assertEqual(self.ranked_items(1), [ids[1], ids[2]])
+        self.assertEqual(self.ranked_items(2), [ids[0], ids[2]])
+
+        overall = KeyItemRanking.objects.get(component=None, rank=1)
+        self.assertAlmostEqual(overall.total_loading, 1.1)
+
+    def test_top_k_defaults_to_setting(self) -> None:
+        with self.settings(ANALYZER_KEY_ITEMS_TOP_K=3):
+            save_key_item_rankings(self.analysis, self.loadings)
+        self.assertEqual(len(self.ranked_items(None)), 3)
+
+    def test_run_pca_analysis_stores_rankings(self) -> None:
+        generate_party_votes(
+            parliamentary_items=generate_parliamentary_items(20),
+            parties=generate_parties(),
+        )
+        run_pca_analysis(n_components=3)
+        # 10 items overall and 10 for each of the 3 components.
+        self.assertEqual(40, KeyItemRanking.objects.count())
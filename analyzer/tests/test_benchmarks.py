@@ -0,0 +1,76 @@
+from unittest import mock
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from analyzer.benchmarks import (
+    API_ENDPOINTS,
+    BenchmarkSize,
+    benchmark_report,
+    compare_reports,
+    run_benchmarks,
+)
+from analyzer.models import PCAAnalysis
+from scraper.models import Party, PartyVote
+
+
+class TestRunBenchmarks(TestCase):
+    def test_benchmarks_measure_hot_paths_and_roll_back(self) -> None:
+        size = BenchmarkSize(parties=5, items=20, analyses=2)
+        results = run_benchmarks(size, repeat=1)
+
+        self.assertListEqual(
+            [
+                "import_votes",
+                "import_votes_unchanged",
+                "generate_dataframe",
+                "run_pca_analysis",
+                *API_ENDPOINTS,
+            ],
+            [result.name for result in results],
+        )
+        for result in results:
+            self.assertGreater(result.queries, 0)
+            self.assertGreater(result.peak_memory or 0, 0)
+            self.assertEqual(20, result.items)
+        self.assertEqual(2, results[3].runs)
+
+        # The dataset is rolled back.
+        self.assertFalse(Party.objects.exists())
+        self.assertFalse(PartyVote.objects.exists())
+        self.assertFalse(PCAAnalysis.objects.exists())
+
+    def test_same_seed_imports_same_votes(self) -> None:
+        size = BenchmarkSize(parties=3, items=5, analyses=0)
+        first = run_benchmarks(size, repeat=1, trace_memory=False)
+        second = run_benchmarks(size, repeat=1, trace_memory=False)
+        self.assertListEqual(
+            [result.queries for result in first],
+            [result.queries for result in second],
+        )
+        self.assertIsNone(first[0].peak_memory)
+
+
+class TestCompareReports(TestCase):
+    def test_matching_benchmarks_are_compared(self) -> None:
+        size = BenchmarkSize(parties=3, items=5, analyses=1)
+        report = benchmark_report(run_benchmarks(size, repeat=1))
+        slower = {
+            **report,
+            "results": [
+                {**result, "min_wall_time": result["min_wall_time"] * 2}
+                for result in report["results"]
+            ],
+        }
+
+        lines = compare_reports(report, slower)
+        self.assertEqual(len(report["results"]), len(lines))
+        self.assertIn("(+100%)", lines[0])
+        self.assertEqual([], compare_reports(report, {"results": []}))
+
+
+class TestBenchCommand(TestCase):
+    def test_without_development_requirements(self) -> None:
+        with mock.patch(
+            "analyzer.management.commands.bench.find_spec", return_value=None
+        ):
+            with self.assertRaisesMessage(CommandError, "requirements/dev.txt"):
+                call_command("bench")
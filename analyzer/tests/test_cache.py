@@ -0,0 +1,59 @@
+from django.core.cache import cache
+from django.test import TestCase
+from analyzer.cache import (
+    get_latest_analysis_id,
+    latest_analysis_cache_key,
+    query_latest_analysis_id,
+)
+from analyzer.models import PCAAnalysis
+from scraper.versions import ANALYSIS_DATA, get_data_versions
+
+
+def analysis_version() -> int:
+    return get_data_versions([ANALYSIS_DATA])[0][ANALYSIS_DATA]
+
+
+class TestLatestAnalysisCache(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_no_analysis(self) -> None:
+        self.assertIsNone(query_latest_analysis_id())
+        self.assertIsNone(get_latest_analysis_id(0))
+
+    def test_latest_analysis_id_is_cached(self) -> None:
+        PCAAnalysis.objects.create()
+        latest = PCAAnalysis.objects.create()
+        with self.assertNumQueries(1):
+            self.assertEqual(get_latest_analysis_id(0), latest.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_latest_analysis_id(0), latest.id)
+
+    def test_new_analysis_invalidates_cache(self) -> None:
+        PCAAnalysis.objects.create()
+        get_latest_analysis_id(analysis_version())
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            latest = PCAAnalysis.objects.create()
+            latest.save()
+        # The analysis data version bump, once the results are saved.
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(get_latest_analysis_id(analysis_version()), latest.id)
+
+    def test_cached_id_of_other_process_is_not_used(self) -> None:
+        # A process that did not save the analysis still has the previous
+        # id in its cache, under the previous version.
+        previous = PCAAnalysis.objects.create()
+        cache.set(latest_analysis_cache_key(0), previous.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            latest = PCAAnalysis.objects.create()
+            latest.save()
+        self.assertEqual(get_latest_analysis_id(0), previous.id)
+        self.assertEqual(get_latest_analysis_id(analysis_version()), latest.id)
+
+    def test_deleted_analysis_invalidates_cache(self) -> None:
+        first = PCAAnalysis.objects.create()
+        latest = PCAAnalysis.objects.create()
+        get_latest_analysis_id(analysis_version())
+        with self.captureOnCommitCallbacks(execute=True):
+            latest.delete()
+        self.assertEqual(get_latest_analysis_id(analysis_version()), first.id)
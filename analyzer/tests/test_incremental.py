@@ -0,0 +1,186 @@
+from datetime import timedelta
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from analyzer.analysis import run_pca_analysis
+from analyzer.incremental import (
+    append_items,
+    factorization_frames,
+    factorize,
+    load_factorization,
+    refit_reason,
+    subspace_drift,
+)
+from analyzer.models import (
+    PCAAnalysis,
+    PCAComponentPartyScore,
+    PCAFactorization,
+)
+from scraper.models import ParliamentaryItem, Party
+from scraper.tests.utils.testing_utils import (
+    generate_party_votes,
+    generate_parliamentary_items,
+    generate_parties,
+)
+
+
+def random_votes(items: int, first_id: int = 1) -> pd.DataFrame:
+    rng = np.random.default_rng(first_id)
+    return pd.DataFrame(
+        rng.choice([-1.0, 0.0, 1.0], size=(8, items)),
+        index=[f"P{i}" for i in range(8)],
+        columns=range(first_id, first_id + items),
+    )
+
+
+class TestFactorization(SimpleTestCase):
+    def test_append_items_matches_full_fit(self) -> None:
+        old, new = random_votes(30), random_votes(6, first_id=31)
+        updated = append_items(factorize(old, 3, 30), new, 3, 36)
+        refit = factorize(pd.concat([old, new], axis=1), 3, 36)
+
+        for result, expected in zip(
+            factorization_frames(updated, 3), factorization_frames(refit, 3)
+        ):
+            self.assertTrue(np.allclose(result, expected))
+            self.assertEqual(list(result.columns), list(expected.columns))
+        self.assertTrue(np.allclose(updated.s, refit.s))
+        self.assertEqual(updated.max_item_id, 36)
+
+    def test_append_items_one_at_a_time(self) -> None:
+        factorization = factorize(random_votes(10), 3, 10)
+        for item_id in range(11, 16):
+            factorization = append_items(
+                factorization, random_votes(1, first_id=item_id), 3, item_id
+            )
+        votes = pd.concat(
+            [random_votes(10)]
+            + [random_votes(1, first_id=item_id) for item_id in range(11, 16)],
+            axis=1,
+        )
+        refit = factorize(votes, 3, 15)
+        scores, _ = factorization_frames(factorization, 3)
+        expected, _ = factorization_frames(refit, 3)
+        self.assertTrue(np.allclose(scores, expected))
+
+    def test_append_items_with_other_parties(self) -> None:
+        new = random_votes(2, first_id=31).rename(index={"P0": "X"})
+        with self.assertRaises(ValueError):
+            append_items(factorize(random_votes(30), 3, 30), new, 3, 32)
+
+    def test_drift(self) -> None:
+        factorization = factorize(random_votes(30), 3, 30)
+        self.assertAlmostEqual(subspace_drift(factorization, 3), 0.0)
+        updated = append_items(
+            factorization, random_votes(30, first_id=31), 3, 60
+        )
+        self.assertGreater(subspace_drift(updated, 3), 0.0)
+
+    def test_refit_reason(self) -> None:
+        factorization = factorize(random_votes(30), 3, 30)
+        self.assertIsNone(refit_reason(factorization, 3))
+        self.assertEqual(refit_reason(None, 3), "no previous factorization")
+        factorization.refit_at -= timedelta(days=8)
+        self.assertEqual(refit_reason(factorization, 3), "scheduled refit")
+
+
+class TestIncrementalAnalysis(TestCase):
+    def setUp(self) -> None:
+        self.parties = generate_parties()
+        generate_party_votes(
+            parliamentary_items=generate_parliamentary_items(12),
+            parties=self.parties,
+        )
+
+    def add_items(self, count: int) -> None:
+        max_id = ParliamentaryItem.objects.order_by("-id").first()
+        assert max_id is not None
+        generate_parliamentary_items(count)
+        generate_party_votes(
+            parliamentary_items=ParliamentaryItem.objects.filter(
+                id__gt=max_id.id
+            ),
+            parties=self.parties,
+        )
+
+    def scores(self, analysis: PCAAnalysis) -> dict[tuple[int, int], float]:
+        return {
+            (score.party_id, score.component): score.score
+            for score in PCAComponentPartyScore.objects.filter(
+                analysis=analysis
+            )
+        }
+
+    def test_first_run_fits_and_stores_factorization(self) -> None:
+        analysis = run_pca_analysis(n_components=3, incremental=True)
+        assert analysis is not None
+        stored = PCAFactorization.objects.get()
+        self.assertEqual(stored.analysis, analysis)
+        self.assertEqual(
+            stored.max_item_id, ParliamentaryItem.objects.order_by("-id")[0].id
+        )
+        factorization = load_factorization(stored)
+        self.assertEqual(len(factorization.item_ids), 12)
+        self.assertEqual(len(factorization.parties), self.parties.count())
+        self.assertListEqual(
+            ["incremental_fit", "persistence"], list(analysis.metrics["stages"])
+        )
+        self.assertEqual(
+            12, analysis.metrics["stages"]["incremental_fit"]["items"]
+        )
+
+    def test_no_new_items_is_skipped(self) -> None:
+        run_pca_analysis(n_components=3, incremental=True)
+        self.assertIsNone(run_pca_analysis(n_components=3, incremental=True))
+        self.assertIsNotNone(
+            run_pca_analysis(n_components=3, incremental=True, force=True)
+        )
+
+    def test_changed_loadings_storage_runs_analysis(self) -> None:
+        run_pca_analysis(n_components=3, incremental=True)
+        with override_settings(ANALYZER_LOADINGS_STORAGE="db"):
+            self.assertIsNotNone(
+                run_pca_analysis(n_components=3, incremental=True)
+            )
+            self.assertIsNone(
+                run_pca_analysis(n_components=3, incremental=True)
+            )
+
+    def test_new_items_match_full_refit(self) -> None:
+        run_pca_analysis(n_components=3, incremental=True)
+        self.add_items(4)
+        incremental = run_pca_analysis(n_components=3, incremental=True)
+        full = run_pca_analysis(n_components=3, incremental=False, force=True)
+        assert incremental is not None and full is not None
+
+        self.assertEqual(PCAFactorization.objects.get().analysis, incremental)
+        result, expected = self.scores(incremental), self.scores(full)
+        self.assertEqual(result.keys(), expected.keys())
+        for key, score in result.items():
+            self.assertAlmostEqual(score, expected[key])
+        self.assertTrue(
+            np.allclose(incremental.explained_variance, full.explained_variance)
+        )
+
+    def test_scheduled_refit(self) -> None:
+        run_pca_analysis(n_components=3, incremental=True)
+        PCAFactorization.objects.update(
+            refit_at=timezone.now() - timedelta(days=8)
+        )
+        with self.assertLogs("analyzer.analysis", "INFO") as logs:
+            analysis = run_pca_analysis(n_components=3, incremental=True)
+        self.assertIsNotNone(analysis)
+        self.assertIn("Refitting PCA: scheduled refit.", "\n".join(logs.output))
+
+    def test_changed_parties_refit(self) -> None:
+        run_pca_analysis(n_components=3, incremental=True)
+        self.add_items(2)
+        # Exclude a party from the next analysis.
+        Party.objects.filter(abbreviation="VVD").update(participation_rate=0)
+        with self.assertLogs("analyzer.analysis", "INFO") as logs:
+            analysis = run_pca_analysis(n_components=3, incremental=True)
+        self.assertIn("included parties changed", "\n".join(logs.output))
+        factorization = load_factorization(PCAFactorization.objects.get())
+        self.assertNotIn("VVD", factorization.parties)
+        self.assertEqual(PCAFactorization.objects.get().analysis, analysis)
@@ -0,0 +1,43 @@
+from django.test import TestCase
+from analyzer.models import (
+    KeyItemRanking,
+    PCAComponentPartyScore,
+    PCAItemLoading,
+)
+from scraper.tests.utils.testing_utils import explain
+
+
+class TestIndexes(TestCase):
+    """
+    The hot queries use the composite indexes, on SQLite and PostgreSQL.
+    """
+
+    def test_loadings_by_analysis_and_item(self) -> None:
+        plan = explain(
+            PCAItemLoading.objects.filter(
+                analysis_id=1, parliamentary_item_id=2
+            )
+        )
+        self.assertIn("analyzer_loading_analysis_item", plan)
+
+    def test_loadings_by_analysis_and_component(self) -> None:
+        plan = explain(
+            PCAItemLoading.objects.filter(
+                analysis_id=1, component=2
+            ).values_list("parliamentary_item_id", "loading")
+        )
+        self.assertIn("analyzer_loading_analysis_comp", plan)
+
+    def test_scores_by_analysis_and_party(self) -> None:
+        plan = explain(
+            PCAComponentPartyScore.objects.filter(analysis_id=1, party_id=2)
+        )
+        self.assertIn("analyzer_score_analysis_party", plan)
+
+    def test_key_items_by_analysis_and_component(self) -> None:
+        plan = explain(
+            KeyItemRanking.objects.filter(
+                analysis_id=1, component__isnull=True
+            ).order_by("rank")
+        )
+        self.assertIn("analyzer_ranking_analysis_comp", plan)
@@ -0,0 +1,106 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from django.test import TestCase, override_settings
+from analyzer.analysis import run_pca_analysis, save_item_loadings
+from analyzer.loadings import (
+    LoadingMatrix,
+    get_loading_matrix,
+    store_loading_matrix,
+)
+from analyzer.models import PCAAnalysis, PCAItemLoading, PCALoadingMatrix
+from scraper.models import ParliamentaryItem
+from scraper.tests.utils.testing_utils import (
+    generate_party_votes,
+    generate_parliamentary_items,
+    generate_parties,
+)
+
+
+class TestLoadingMatrix(TestCase):
+    def setUp(self) -> None:
+        self.media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media_root.cleanup)
+        media = override_settings(MEDIA_ROOT=self.media_root.name)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.items = generate_parliamentary_items(3)
+        self.ids = [item.id for item in self.items]
+        self.analysis = PCAAnalysis.objects.create()
+        self.loadings = pd.DataFrame(
+            [[0.5, -0.25, 0.125], [0.75, 0.0, -1.0]],
+            index=["PC1", "PC2"],
+            columns=self.ids,
+        )
+
+    def assert_matrix(self, matrix: LoadingMatrix | None) -> None:
+        assert matrix is not None
+        self.assertEqual(matrix.n_components, 2)
+        self.assertEqual(
+            matrix.component(1),
+            {self.ids[0]: 0.5, self.ids[1]: -0.25, self.ids[2]: 0.125},
+        )
+        self.assertEqual(matrix.item(self.ids[2]), {1: 0.125, 2: -1.0})
+        self.assertTrue(np.allclose(matrix.to_frame(), self.loadings))
+
+    def test_db_storage(self) -> None:
+        loading_matrix = store_loading_matrix(self.analysis, self.loadings)
+        self.assertEqual(len(loading_matrix.data), 2 * 3 * 4)
+        self.assertFalse(loading_matrix.file)
+        self.assert_matrix(get_loading_matrix(self.analysis.id))
+
+    def test_file_storage(self) -> None:
+        loading_matrix = store_loading_matrix(
+            self.analysis, self.loadings, storage="file"
+        )
+        self.assertEqual(loading_matrix.data, b"")
+        self.assertTrue(os.path.exists(loading_matrix.file.path))
+        matrix = get_loading_matrix(self.analysis.id)
+        assert matrix is not None
+        self.assertIsInstance(matrix.matrix, np.memmap)
+        self.assert_matrix(matrix)
+
+    def test_file_is_deleted_with_matrix(self) -> None:
+        loading_matrix = store_loading_matrix(
+            self.analysis, self.loadings, storage="file"
+        )
+        path = loading_matrix.file.path
+        loading_matrix.delete()
+        self.assertFalse(os.path.exists(path))
+
+    def test_unknown_storage(self) -> None:
+        with self.assertRaises(ValueError):
+            store_loading_matrix(self.analysis, self.loadings, storage="s3")
+
+    def test_rows_storage(self) -> None:
+        save_item_loadings(self.analysis, self.loadings)
+        self.assert_matrix(get_loading_matrix(self.analysis.id))
+        self.assertIsNone(get_loading_matrix(self.analysis.id, from_rows=False))
+
+    def test_no_loadings(self) -> None:
+        self.assertIsNone(get_loading_matrix(self.analysis.id))
+
+    def test_missing_item_and_component(self) -> None:
+        store_loading_matrix(self.analysis, self.loadings)
+        matrix = get_loading_matrix(self.analysis.id)
+        assert matrix is not None
+        with self.assertRaises(KeyError):
+            matrix.item(0)
+        with self.assertRaises(KeyError):
+            matrix.component(3)
+
+    @override_settings(ANALYZER_LOADINGS_STORAGE="db")
+    def test_run_pca_analysis_stores_matrix(self) -> None:
+        generate_party_votes(
+            parliamentary_items=generate_parliamentary_items(10),
+            parties=generate_parties(),
+        )
+        run_pca_analysis(n_components=3)
+        loading_matrix = PCALoadingMatrix.objects.get()
+        self.assertEqual(loading_matrix.n_components, 3)
+        self.assertEqual(
+            loading_matrix.n_items, ParliamentaryItem.objects.count()
+        )
+        self.assertEqual(0, PCAItemLoading.objects.count())
@@ -0,0 +1,97 @@
+import importlib.util
+import numpy as np
+from django.core.exceptions import ImproperlyConfigured
+from unittest import skipUnless
+from django.test import SimpleTestCase, override_settings
+from analyzer.pca_engine import (
+    PcaPackageEngine,
+    SVDEngine,
+    get_pca_engine,
+)
+
+
+HAS_PCA_PACKAGE = importlib.util.find_spec("pca") is not None
+
+
+def random_votes(parties: int = 12, items: int = 40) -> np.ndarray:
+    rng = np.random.default_rng(42)
+    return rng.choice([-1.0, 0.0, 1.0], size=(parties, items))
+
+
+class TestSVDEngine(SimpleTestCase):
+    def test_result_shapes(self) -> None:
+        result = SVDEngine().fit(random_votes(), n_components=3)
+        self.assertEqual(result.scores.shape, (12, 3))
+        self.assertEqual(result.loadings.shape, (3, 40))
+        self.assertEqual(result.explained_variance_ratio.shape, (3,))
+        self.assertEqual(result.n_components, 3)
+
+    def test_n_components_is_capped(self) -> None:
+        result = SVDEngine().fit(random_votes(parties=4), n_components=10)
+        self.assertEqual(result.n_components, 4)
+
+    def test_explained_variance_is_decreasing(self) -> None:
+        result = SVDEngine().fit(random_votes(), n_components=5)
+        ratio = result.explained_variance_ratio
+        self.assertTrue(np.all(np.diff(ratio) <= 0))
+        self.assertLessEqual(ratio.sum(), 1.0 + 1e-12)
+
+    def test_scores_project_the_standardized_matrix(self) -> None:
+        engine = SVDEngine()
+        votes = random_votes()
+        result = engine.fit(votes, n_components=3)
+        self.assertTrue(
+            np.allclose(
+                engine.standardize(votes) @ result.loadings.T, result.scores
+            )
+        )
+
+    def test_constant_column(self) -> None:
+        votes = random_votes()
+        votes[:, 0] = 1.0
+        result = SVDEngine().fit(votes, n_components=3)
+        self.assertTrue(np.all(np.isfinite(result.scores)))
+        self.assertTrue(np.allclose(result.loadings[:, 0], 0.0))
+
+    def test_float32(self) -> None:
+        votes = random_votes()
+        result = SVDEngine(dtype="float32").fit(votes, n_components=3)
+        expected = SVDEngine().fit(votes, n_components=3)
+        self.assertEqual(result.scores.dtype, np.float32)
+        self.assertTrue(np.allclose(result.scores, expected.scores, atol=1e-4))
+
+
+@skipUnless(HAS_PCA_PACKAGE, "The pca package is not installed.")
+class TestPcaPackageEngine(SimpleTestCase):
+    def test_svd_engine_matches_pca_package(self) -> None:
+        votes = random_votes()
+        expected = PcaPackageEngine().fit(votes, n_components=3)
+        result = SVDEngine().fit(votes, n_components=3)
+        self.assertTrue(np.allclose(result.scores, expected.scores))
+        self.assertTrue(np.allclose(result.loadings, expected.loadings))
+        self.assertTrue(
+            np.allclose(
+                result.explained_variance_ratio,
+                expected.explained_variance_ratio,
+            )
+        )
+
+
+class TestGetPCAEngine(SimpleTestCase):
+    def test_default_engine(self) -> None:
+        self.assertIsInstance(get_pca_engine(), SVDEngine)
+
+    @override_settings(
+        ANALYZER_PCA_ENGINE={"BACKEND": "svd", "OPTIONS": {"dtype": "float32"}}
+    )
+    def test_options_from_settings(self) -> None:
+        engine = get_pca_engine()
+        assert isinstance(engine, SVDEngine)
+        self.assertEqual(engine.dtype, np.float32)
+
+    def test_backend_argument(self) -> None:
+        self.assertIsInstance(get_pca_engine("pca"), PcaPackageEngine)
+
+    def test_unknown_backend(self) -> None:
+        with self.assertRaises(ImproperlyConfigured):
+            get_pca_engine("sklearn")
@@ -0,0 +1,180 @@
+from datetime import datetime
+from io import StringIO
+from zoneinfo import ZoneInfo
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from analyzer.models import (
+    KeyItemRanking,
+    PCAAnalysis,
+    PCAComponentPartyScore,
+    PCAItemLoading,
+)
+from analyzer.retention import (
+    RetentionPolicy,
+    prune_analyses,
+    select_analyses_to_prune,
+)
+from scraper.tests.utils.testing_utils import (
+    generate_parliamentary_items,
+    generate_parties,
+)
+
+
+AMSTERDAM = ZoneInfo("Europe/Amsterdam")
+NOW = datetime(2026, 3, 15, 12, tzinfo=AMSTERDAM)
+
+
+def create_analysis(created_at: str, pinned: bool = False) -> PCAAnalysis:
+    analysis = PCAAnalysis.objects.create(pinned=pinned)
+    analysis.created_at = datetime.fromisoformat(created_at).replace(
+        tzinfo=AMSTERDAM
+    )
+    analysis.save()
+    return analysis
+
+
+class TestSelectAnalysesToPrune(TestCase):
+    def setUp(self) -> None:
+        self.analyses = {
+            name: create_analysis(created_at, pinned=name == "pinned")
+            for name, created_at in [
+                ("latest", "2026-03-15T10:00"),
+                ("second", "2026-03-15T08:00"),
+                ("same_day", "2026-03-15T06:00"),
+                ("yesterday", "2026-03-14T23:00"),
+                ("yesterday_early", "2026-03-14T10:00"),
+                ("old_day", "2026-03-12T10:00"),
+                ("february", "2026-02-20T10:00"),
+                ("february_early", "2026-02-10T10:00"),
+                ("pinned", "2026-01-05T10:00"),
+                ("december", "2025-12-31T10:00"),
+            ]
+        }
+
+    def pruned(self, policy: RetentionPolicy) -> set[str]:
+        ids = set(select_analyses_to_prune(policy, now=NOW))
+        return {
+            name
+            for name, analysis in self.analyses.items()
+            if analysis.id in ids
+        }
+
+    def test_policy(self) -> None:
+        policy = RetentionPolicy(
+            keep_last=2, keep_daily_days=3, keep_monthly_months=2
+        )
+        self.assertEqual(
+            self.pruned(policy),
+            {
+                "same_day",
+                "yesterday_early",
+                "old_day",
+                "february_early",
+                "december",
+            },
+        )
+
+    def test_keep_monthly_forever(self) -> None:
+        policy = RetentionPolicy(
+            keep_last=1, keep_daily_days=0, keep_monthly_months=None
+        )
+        self.assertEqual(
+            self.pruned(policy),
+            {
+                "second",
+                "same_day",
+                "yesterday",
+                "yesterday_early",
+                "old_day",
+                "february_early",
+            },
+        )
+
+    def test_latest_analysis_is_always_kept(self) -> None:
+        policy = RetentionPolicy(
+            keep_last=0, keep_daily_days=0, keep_monthly_months=0
+        )
+        pruned = self.pruned(policy)
+        self.assertNotIn("latest", pruned)
+        self.assertNotIn("pinned", pruned)
+        self.assertEqual(len(pruned), 8)
+
+
+class TestPruneAnalyses(TestCase):
+    def setUp(self) -> None:
+        party = generate_parties()[0]
+        item = generate_parliamentary_items(1)[0]
+        self.old = create_analysis("2026-01-01T10:00")
+        self.latest = create_analysis("2026-03-15T10:00")
+        for analysis in (self.old, self.latest):
+            for component in (1, 2):
+                PCAComponentPartyScore.objects.create(
+                    analysis=analysis, party=party, component=component, score=1
+                )
+                PCAItemLoading.objects.create(
+                    analysis=analysis,
+                    parliamentary_item=item,
+                    component=component,
+                    loading=1,
+                )
+            KeyItemRanking.objects.create(
+                analysis=analysis,
+                parliamentary_item=item,
+                rank=1,
+                total_loading=2,
+            )
+        self.policy = RetentionPolicy(
+            keep_last=1, keep_daily_days=0, keep_monthly_months=0
+        )
+
+    def test_prune(self) -> None:
+        stats = prune_analyses(self.policy, now=NOW)
+        self.assertEqual(stats.analyses, 1)
+        self.assertEqual(stats.party_scores, 2)
+        self.assertEqual(stats.item_loadings, 2)
+        self.assertEqual(stats.key_items, 1)
+        self.assertEqual(stats.loading_matrices, 0)
+        self.assertEqual(stats.total, 6)
+        self.assertEqual(list(PCAAnalysis.objects.all()), [self.latest])
+        self.assertEqual(PCAItemLoading.objects.count(), 2)
+
+    def test_dry_run(self) -> None:
+        stats = prune_analyses(self.policy, dry_run=True, now=NOW)
+        self.assertEqual(stats.total, 6)
+        self.assertEqual(PCAAnalysis.objects.count(), 2)
+        self.assertEqual(PCAItemLoading.objects.count(), 4)
+
+    def test_batches(self) -> None:
+        create_analysis("2026-01-02T10:00")
+        with CaptureQueriesContext(connection) as queries:
+            stats = prune_analyses(self.policy, batch_size=1, now=NOW)
+        self.assertEqual(stats.analyses, 2)
+        self.assertEqual(stats.item_loadings, 2)
+        loading_deletes = [
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith('DELETE FROM "analyzer_pcaitemloading"')
+        ]
+        # A row per batch, then the cascades of the analyses find none.
+        self.assertEqual(len(loading_deletes), 4)
+        self.assertEqual(PCAItemLoading.objects.count(), 2)
+
+    def test_pinned_analysis_is_kept(self) -> None:
+        self.old.pinned = True
+        self.old.save()
+        self.assertEqual(prune_analyses(self.policy, now=NOW).total, 0)
+
+    def test_command(self) -> None:
+        stdout = StringIO()
+        call_command(
+            "prune_analyses",
+            "--keep-last=1",
+            "--keep-daily-days=0",
+            "--keep-monthly-months=0",
+            stdout=stdout,
+        )
+        self.assertIn("Deleted 1 analyses", stdout.getvalue())
+        self.assertIn("Deleted 2 item loadings", stdout.getvalue())
+        self.assertEqual(PCAAnalysis.objects.count(), 1)
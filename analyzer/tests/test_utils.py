@@ -1,8 +1,16 @@
 from django.test import TestCase
 import io
-
-from analyzer.utils import generate_dataframe, AnalysisLogger, log_to_stdout
-from scraper.models import PartyVote, VoteType
+import numpy as np
+
+from analyzer.utils import (
+    generate_dataframe,
+    AnalysisLogger,
+    StageTimer,
+    build_vote_matrix,
+    log_to_stdout,
+    party_vote_mapper,
+)
+from scraper.models import Party, PartyVote, VoteType
 from scraper.tests.utils.testing_utils import (
     generate_parties,
     generate_parliamentary_items,
@@ -59,6 +67,32 @@ class TestAnalysisLogger(TestCase):
         self.assertEqual(record.new_key, "new_value")
 
 
+class TestStageTimer(TestCase):
+    def test_stage_records_duration_queries_and_counts(self) -> None:
+        timer = StageTimer(AnalysisLogger(logger, {"analysis_id": 42}))
+        with self.assertLogs(logger, level="INFO") as cm:
+            with timer.stage("parties") as stage:
+                stage["parties"] = Party.objects.count()
+                Party.objects.exists()
+
+        metrics = timer.stages["parties"]
+        self.assertEqual(2, metrics["queries"])
+        self.assertEqual(0, metrics["parties"])
+        self.assertGreaterEqual(metrics["seconds"], 0)
+
+        record = cm.records[0]
+        self.assertEqual("parties", getattr(record, "stage"))
+        self.assertEqual(2, getattr(record, "queries"))
+        self.assertEqual(42, getattr(record, "analysis_id"))
+
+    def test_failed_stage_is_not_recorded(self) -> None:
+        timer = StageTimer()
+        with self.assertRaises(ValueError):
+            with timer.stage("broken"):
+                raise ValueError
+        self.assertDictEqual({"stages": {}, "seconds": 0}, timer.as_dict())
+
+
 class TestGenerateDataFrame(TestCase):
     def setUp(self) -> None:
         self.parties = generate_parties().order_by("abbreviation")
@@ -101,3 +135,46 @@ class TestGenerateDataFrame(TestCase):
                 self.assertEqual(
                     df.iloc[index][party.abbreviation], expected_vote
                 )
+
+
+class TestBuildVoteMatrix(TestCase):
+    def setUp(self) -> None:
+        self.parties = generate_parties().order_by("abbreviation")
+        self.items = generate_parliamentary_items(5).order_by("-date")
+        generate_party_votes(
+            parliamentary_items=self.items, parties=self.parties
+        )
+        self.party_ids = [party.id for party in self.parties]
+
+    def test_matrix_matches_votes(self) -> None:
+        vote_matrix = build_vote_matrix(party_ids=self.party_ids)
+
+        self.assertEqual(vote_matrix.matrix.shape, (5, len(self.party_ids)))
+        self.assertListEqual(
+            vote_matrix.item_ids.tolist(), [item.id for item in self.items]
+        )
+        self.assertListEqual(vote_matrix.party_ids.tolist(), self.party_ids)
+        for vote in PartyVote.objects.all():
+            row = vote_matrix.item_ids.tolist().index(
+                vote.parliamentary_item_id
+            )
+            column = self.party_ids.index(vote.party_id)
+            self.assertEqual(
+                vote_matrix.matrix[row, column], party_vote_mapper(vote.vote)
+            )
+
+    def test_missing_votes_are_nan(self) -> None:
+        vote = PartyVote.objects.first()
+        assert vote is not None
+        vote.delete()
+        vote_matrix = build_vote_matrix(party_ids=self.party_ids)
+
+        row = vote_matrix.item_ids.tolist().index(vote.parliamentary_item_id)
+        column = self.party_ids.index(vote.party_id)
+        self.assertTrue(np.isnan(vote_matrix.matrix[row, column]))
+        self.assertEqual(1, int(np.isnan(vote_matrix.matrix).sum()))
+
+    def test_uses_constant_number_of_queries(self) -> None:
+        # One query for the item ids, one for the votes
+        with self.assertNumQueries(2):
+            build_vote_matrix(party_ids=self.party_ids)
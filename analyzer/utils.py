@@ -1,9 +1,24 @@
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
+from contextlib import contextmanager
+from dataclasses import dataclass
 from django.core.management.base import OutputWrapper
+from django.db import connection
 from django.db.models import QuerySet
 import statistics
+import time
 from scraper.models import Party, PartyVote, ParliamentaryItem
-from typing import List, TextIO, MutableMapping, Any, Mapping, cast
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    TextIO,
+    cast,
+)
 import logging
 
 
@@ -27,6 +42,95 @@ class AnalysisLogger(logging.LoggerAdapter[logging.Logger]):
         return msg, kwargs
 
 
+class QueryCounter:
+    """
+    Database execute wrapper that counts the executed queries.
+
+    Unlike `CaptureQueriesContext` it keeps no SQL, so it has no limit and
+    little overhead:
+
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            ...
+        counter.count
+    """
+
+    def __init__(self) -> None:
+        self.count: int = 0
+
+    def __call__(
+        self,
+        execute: Callable[..., Any],
+        sql: str,
+        params: Any,
+        many: bool,
+        context: Mapping[str, Any],
+    ) -> Any:
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class StageTimer:
+    """
+    Records the duration, database queries and row counts of the stages of
+    an analysis.
+
+    Every stage is logged through `log` with its measurements as extra
+    fields, and collected in `stages` for `PCAAnalysis.metrics`:
+
+        timer = StageTimer(log)
+        with timer.stage("dataframe") as stage:
+            df = ...
+            stage["items"] = len(df)
+
+    Attributes:
+        log (logging.Logger | AnalysisLogger): The logger the stages are
+            reported to.
+        stages (dict[str, dict[str, float | int]]): Measurements per stage,
+            in the order the stages finished: "seconds", "queries" and the
+            counts set by the stage.
+    """
+
+    def __init__(self, log: logging.Logger | AnalysisLogger = logger) -> None:
+        self.log: logging.Logger | AnalysisLogger = log
+        self.stages: dict[str, dict[str, float | int]] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[dict[str, float | int]]:
+        """
+        Measure the code in the block as stage `name`. The block can add
+        counts to the yielded dict. Stages that raise are not recorded.
+        """
+        counter = QueryCounter()
+        counts: dict[str, float | int] = {}
+        start = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            yield counts
+        metrics: dict[str, float | int] = {
+            "seconds": round(time.perf_counter() - start, 6),
+            "queries": counter.count,
+            **counts,
+        }
+        self.stages[name] = metrics
+        self.log.info(
+            f"Stage {name} took {metrics['seconds']:.3f}s and "
+            f"{counter.count} queries.",
+            extra={"stage": name, **metrics},
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """
+        Return the stages and their total duration, as stored in
+        `PCAAnalysis.metrics`.
+        """
+        return {
+            "stages": self.stages,
+            "seconds": round(
+                sum(stage["seconds"] for stage in self.stages.values()), 6
+            ),
+        }
+
+
 def log_to_stdout(
     msg: str, stdout: TextIO | OutputWrapper | None = None
 ) -> None:
@@ -48,15 +152,84 @@ def party_vote_mapper(vote: str) -> int:
     return mapping.get(vote, 0)
 
 
-def generate_dataframe(log: AnalysisLogger) -> pd.DataFrame:
+@dataclass
+class VoteMatrix:
     """
-    Load data from the database and return it as a pandas DataFrame.
+    Dense representation of the votes cast on parliamentary items.
+
+    Attributes:
+        matrix (npt.NDArray[np.float64]): Items x parties array of mapped votes
+            (see `party_vote_mapper`). Missing votes are stored as NaN.
+        item_ids (npt.NDArray[np.int64]): ParliamentaryItem ids, one per row.
+        party_ids (npt.NDArray[np.int64]): Party ids, one per column.
+    """
+
+    matrix: npt.NDArray[np.float64]
+    item_ids: npt.NDArray[np.int64]
+    party_ids: npt.NDArray[np.int64]
+
+
+def build_vote_matrix(
+    party_ids: list[int],
+    items: QuerySet[ParliamentaryItem] | None = None,
+    chunk_size: int = 2000,
+) -> VoteMatrix:
+    """
+    Build a dense vote matrix for the given parties.
+
+    All votes are pulled in a single streamed `values_list` query and pivoted
+    into a NumPy array, instead of looking up every (item, party) cell
+    separately.
+
+    Args:
+        party_ids (list[int]): Ids of the parties to include, in column order.
+        items (QuerySet[ParliamentaryItem] | None): Items to include, in row
+            order. Defaults to all items ordered by descending date.
+        chunk_size (int): Number of votes fetched per database round trip.
+
+    Returns:
+        VoteMatrix: The items x parties vote matrix.
+    """
+    votes: QuerySet[PartyVote] = PartyVote.objects.filter(
+        party_id__in=party_ids
+    )
+    if items is None:
+        items = ParliamentaryItem.objects.all().order_by("-date")
+    else:
+        votes = votes.filter(parliamentary_item__in=items.values("id"))
+
+    item_ids = np.fromiter(items.values_list("id", flat=True), dtype=np.int64)
+    party_id_array = np.array(party_ids, dtype=np.int64)
+    item_index: dict[int, int] = {
+        item_id: index for index, item_id in enumerate(item_ids.tolist())
+    }
+    party_index: dict[int, int] = {
+        party_id: index for index, party_id in enumerate(party_ids)
+    }
+
+    matrix = np.full((len(item_ids), len(party_ids)), np.nan, dtype=np.float64)
+    for item_id, party_id, vote in votes.values_list(
+        "parliamentary_item_id", "party_id", "vote"
+    ).iterator(chunk_size=chunk_size):
+        row = item_index.get(item_id)
+        if row is None:
+            continue
+        matrix[row, party_index[party_id]] = party_vote_mapper(vote)
+
+    return VoteMatrix(
+        matrix=matrix, item_ids=item_ids, party_ids=party_id_array
+    )
+
+
+def get_included_parties(log: AnalysisLogger) -> QuerySet[Party]:
+    """
+    Return the Parties that should be included in the analysis.
 
     Since we skip ParliamentaryItems where Parties did not vote, we use
     the IQR method to determine a participation cutoff threshold for Parties.
-    Only Parties with a participation rate above this threshold are included
-    in the DataFrame. This way, we ensure that the PCA analysis is not skewed
-    by Parties with very low participation rates.
+    Only Parties with a participation rate above this threshold are included.
+    This way, we ensure that the PCA analysis is not skewed by Parties with
+    very low participation rates.
     """
     # Use IQR to determine participation cutoff threshold
     participation_rates: List[float] = list(
@@ -90,37 +263,40 @@ def generate_dataframe(log: AnalysisLogger) -> pd.DataFrame:
             "cutoff": party_participation_cutoff_threshold,
         },
     )
+    return included_parties
+
+
+def generate_dataframe(
+    log: AnalysisLogger, items: QuerySet[ParliamentaryItem] | None = None
+) -> pd.DataFrame:
+    """
+    Load data from the database and return it as a pandas DataFrame.
+
+    Only Parties selected by `get_included_parties` are included. The votes
+    are loaded with `build_vote_matrix`; items on which a Party did not vote
+    contain NaN for that Party. `items` limits the DataFrame to those items,
+    see `build_vote_matrix`.
+    """
+    included_parties = list(get_included_parties(log=log))
+    vote_matrix = build_vote_matrix(
+        party_ids=[party.id for party in included_parties], items=items
+    )
 
-    items: QuerySet[
-        ParliamentaryItem
-    ] = ParliamentaryItem.objects.all().order_by("-date")
-
-    # Add row for each motion and fill in votes
-    data = []
-    for item in items:
-        row: dict[str, str | int]
-        row = {"Motion ID": item.id}
-        for party in included_parties:
-            try:
-                party_vote = PartyVote.objects.get(
-                    parliamentary_item=item, party=party
-                )
-                row[party.abbreviation] = party_vote_mapper(party_vote.vote)
-            except PartyVote.DoesNotExist:
-                log.info(
-                    f"Party {party.abbreviation} did not vote for item: {item.id}",
-                    extra={
-                        "party_id": party.id,
-                        "party": party.abbreviation,
-                        "item_id": item.id,
-                    },
-                )
-                continue
-        data.append(row)
+    for row, column in np.argwhere(np.isnan(vote_matrix.matrix)):
+        party = included_parties[column]
+        item_id = int(vote_matrix.item_ids[row])
+        log.info(
+            f"Party {party.abbreviation} did not vote for item: {item_id}",
+            extra={
+                "party_id": party.id,
+                "party": party.abbreviation,
+                "item_id": item_id,
+            },
+        )
 
     df = pd.DataFrame(
-        data,
-        columns=["Motion ID"]
-        + [party.abbreviation for party in included_parties],
+        vote_matrix.matrix,
+        columns=[party.abbreviation for party in included_parties],
     )
+    df.insert(0, "Motion ID", vote_matrix.item_ids)
     return df
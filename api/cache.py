@@ -0,0 +1,183 @@
+import hashlib
+import time
+from typing import Any, Callable
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from redis.exceptions import RedisError
+from rest_framework.request import Request
+from rest_framework.response import Response
+from api.conditional import (
+    ConditionalGetMixin,
+    request_data_versions,
+    version_tag,
+)
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+# Alias of the cache in CACHES that holds the API responses.
+API_CACHE: str = "api"
+RESPONSE_KEY_PREFIX: str = "api:response"
+HITS_KEY: str = "api:metrics:hits"
+MISSES_KEY: str = "api:metrics:misses"
+
+# Errors of an unavailable cache: Redis errors, and socket errors of other
+# backends.
+CACHE_ERRORS: tuple[type[Exception], ...] = (RedisError, OSError)
+
+# Until when the cache is skipped after it failed, in `time.monotonic()`
+# seconds.
+_unavailable_until: float = 0.0
+
+
+def get_api_cache() -> BaseCache | None:
+    """
+    Return the API response cache, or None while it is skipped after a
+    failure, see `cache_failed`.
+    """
+    if time.monotonic() < _unavailable_until:
+        return None
+    return caches[API_CACHE]
+
+
+def cache_failed(error: Exception) -> None:
+    """
+    Skip the API response cache for `API_CACHE_RETRY_AFTER` seconds, so an
+    unavailable cache does not slow down every request.
+    """
+    global _unavailable_until
+    logger.warning(
+        "API cache unavailable, skipping it for %s seconds: %s",
+        settings.API_CACHE_RETRY_AFTER,
+        error,
+    )
+    _unavailable_until = time.monotonic() + settings.API_CACHE_RETRY_AFTER
+
+
+def response_cache_key(
+    request: Request, view_name: str, versions: dict[str, int]
+) -> str:
+    """
+    Return the cache key of the response to `request`.
+
+    The key covers the url with the query parameters sorted by name, leaving
+    out blank ones as the filters ignore them, and the versions of the data
+    the response depends on. A new import or analysis thereby invalidates
+    the responses that depend on it, without deleting any keys.
+    """
+    params = sorted(
+        (name, values)
+        for name, values in request.query_params.lists()
+        if any(values)
+    )
+    normalized = "\n".join(
+        (
+            request.build_absolute_uri(request.path),
+            urlencode(params, doseq=True),
+            version_tag(versions),
+        )
+    )
+    digest = hashlib.sha256(normalized.encode()).hexdigest()
+    return f"{RESPONSE_KEY_PREFIX}:{view_name}:{digest}"
+
+
+def count(cache: BaseCache, key: str) -> None:
+    """
+    Increment the `key` counter in `cache`, creating it if needed.
+    """
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def get_cache_metrics() -> dict[str, Any]:
+    """
+    Return the hits and misses of the API response cache over all processes
+    that share it, and the hit rate (None before the first lookup).
+
+    While the cache is unavailable, `available` is False and the counters
+    are None.
+    """
+    cache = get_api_cache()
+    counters: dict[str, int] | None = None
+    if cache is not None:
+        try:
+            counters = cache.get_many([HITS_KEY, MISSES_KEY])
+        except CACHE_ERRORS as error:
+            cache_failed(error)
+    if counters is None:
+        return {
+            "available": False,
+            "hits": None,
+            "misses": None,
+            "hit_rate": None,
+        }
+
+    hits: int = counters.get(HITS_KEY, 0)
+    misses: int = counters.get(MISSES_KEY, 0)
+    lookups = hits + misses
+    return {
+        "available": True,
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / lookups if lookups else None,
+    }
+
+
+def reset_cache_metrics() -> None:
+    caches[API_CACHE].delete_many([HITS_KEY, MISSES_KEY])
+
+
+class CachedResponseMixin(ConditionalGetMixin):
+    """
+    Viewset mixin that stores the data of successful list and retrieve
+    responses in the `API_CACHE` cache, keyed on `response_cache_key`.
+
+    The cache fails open: when it raises, the response is built from the
+    database and the cache is skipped for a while, see `cache_failed`.
+    """
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return self.cached_response(
+            super().list, request, *args, **kwargs  # type: ignore[misc]
+        )
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs  # type: ignore[misc]
+        )
+
+    def cached_response(
+        self,
+        handler: Callable[..., Response],
+        request: Request,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Response:
+        cache = get_api_cache()
+        if cache is None:
+            return handler(request, *args, **kwargs)
+
+        versions, _ = request_data_versions(request, self.data_versions)
+        key = response_cache_key(request, str(self.basename), versions)
+        try:
+            data = cache.get(key)
+            count(cache, MISSES_KEY if data is None else HITS_KEY)
+        except CACHE_ERRORS as error:
+            cache_failed(error)
+            return handler(request, *args, **kwargs)
+        if data is not None:
+            return Response(data)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            try:
+                cache.set(key, response.data)
+            except CACHE_ERRORS as error:
+                cache_failed(error)
+        return response
@@ -0,0 +1,76 @@
+import zlib
+from datetime import datetime
+from typing import Any
+from django.http import HttpRequest
+from django.views.decorators.http import condition
+from rest_framework.viewsets import ViewSetMixin
+from analyzer.cache import get_latest_analysis_id
+from scraper.versions import ANALYSIS_DATA, IMPORT_DATA, get_data_versions
+
+
+def request_data_versions(
+    request: HttpRequest, names: tuple[str, ...]
+) -> tuple[dict[str, int], datetime | None]:
+    """
+    Return `get_data_versions` for `names`, queried once per request.
+    """
+    cached: tuple[dict[str, int], datetime | None] | None = getattr(
+        request, "_data_versions", None
+    )
+    if cached is None:
+        cached = get_data_versions(names)
+        request._data_versions = cached  # type: ignore[attr-defined]
+    return cached
+
+
+def version_tag(versions: dict[str, int]) -> str:
+    """
+    Return the versions as a string like "analysis3-import12".
+    """
+    return "-".join(f"{name}{versions[name]}" for name in sorted(versions))
+
+
+class ConditionalGetMixin(ViewSetMixin):
+    """
+    Viewset mixin that adds ETag and Last-Modified headers based on the
+    versions of the data the responses depend on (see `scraper.versions`),
+    and answers requests with a matching If-None-Match or If-Modified-Since
+    header with 304 Not Modified.
+
+    The versions are read with a single query before the view runs, so a
+    304 response costs no other queries. The ETag also covers the Accept
+    header, since the browsable API and JSON share urls.
+
+    Attributes:
+        data_versions (tuple[str, ...]): The data the responses depend on.
+    """
+
+    data_versions: tuple[str, ...] = (IMPORT_DATA, ANALYSIS_DATA)
+
+    @classmethod
+    def etag(cls, request: HttpRequest, *args: Any, **kwargs: Any) -> str:
+        versions, _ = request_data_versions(request, cls.data_versions)
+        accept = zlib.crc32(request.headers.get("Accept", "").encode())
+        return f'"{version_tag(versions)}-{accept:08x}"'
+
+    @classmethod
+    def last_modified(
+        cls, request: HttpRequest, *args: Any, **kwargs: Any
+    ) -> datetime | None:
+        _, updated_at = request_data_versions(request, cls.data_versions)
+        return updated_at
+
+    def latest_analysis_id(self, request: HttpRequest) -> int | None:
+        """
+        Return the id of the latest analysis at the analysis data version of
+        the request, so it matches the ETag and the cached responses.
+        """
+        versions, _ = request_data_versions(request, self.data_versions)
+        return get_latest_analysis_id(versions[ANALYSIS_DATA])
+
+    @classmethod
+    def as_view(cls, *args: Any, **initkwargs: Any) -> Any:
+        view = super().as_view(*args, **initkwargs)
+        return condition(
+            etag_func=cls.etag, last_modified_func=cls.last_modified
+        )(view)
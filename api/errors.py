@@ -5,3 +5,12 @@ class NoAnalysisFoundException(APIException):
     status_code = 500
     default_detail = "No PCA analysis has been run yet."
     default_code = "no_analysis_found"
+
+
+class LoadingsStoredAsMatrixException(APIException):
+    status_code = 409
+    default_detail = (
+        "The loadings of this analysis are stored as a matrix; read them "
+        "from the loadings endpoint of the analysis."
+    )
+    default_code = "loadings_stored_as_matrix"
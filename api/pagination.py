@@ -0,0 +1,212 @@
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import Any, Sequence
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Field, Model, Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
+
+
+def after(ordering: Sequence[str], values: Sequence[Any]) -> Q:
+    """
+    Return the condition for the rows after `values` in `ordering`, like
+    the row comparison (a, b, c) > (x, y, z) for an ascending ordering.
+    Fields prefixed with "-" are descending.
+
+    The redundant a >= x lets the database scan an index on the first
+    field from the cursor on.
+    """
+    first, *rest = ordering
+    name = first.removeprefix("-")
+    operator = "lt" if first.startswith("-") else "gt"
+    condition = Q(**{f"{name}__{operator}": values[0]})
+    if rest:
+        condition |= Q(**{name: values[0]}) & after(rest, values[1:])
+    return Q(**{f"{name}__{operator[0]}te": values[0]}) & condition
+
+
+class KeysetPagination(BasePagination):
+    """
+    Pagination on the values of the last row of the previous page, instead
+    of an offset, so every page is an index range scan however deep it is.
+
+    The rows are sorted by `ordering`, non-null fields that together are
+    unique, or by the ordering of the view's `OrderingFilter` with the id
+    as tiebreaker. The `next` link has an opaque `cursor` parameter with
+    the ordering and the ordering values of the last row. The page size is
+    set with `limit` as with `LimitOffsetPagination`. The total `count` is
+    left out (null) with `count=false`, which saves a count over the whole
+    table per page.
+
+    Only forward pagination is supported.
+    """
+
+    ordering: tuple[str, ...] = ("id",)
+    cursor_query_param: str = "cursor"
+    limit_query_param: str = "limit"
+    count_query_param: str = "count"
+    max_limit: int = 1000
+
+    def paginate_queryset(
+        self,
+        queryset: QuerySet[Any, Any] | Sequence[Any],
+        request: Request,
+        view: APIView | None = None,
+    ) -> list[Any]:
+        if not isinstance(queryset, QuerySet):
+            raise TypeError("Keyset pagination needs a QuerySet.")
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.count: int | None = None
+        if request.query_params.get(self.count_query_param) != "false":
+            self.count = queryset.count()
+
+        self.row_ordering = self.get_ordering(request, queryset, view)
+        queryset = queryset.order_by(*self.row_ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            try:
+                queryset = queryset.filter(after(self.row_ordering, position))
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound("Invalid cursor")
+
+        rows = list(queryset[: self.limit + 1])
+        self.next_position: list[Any] | None = None
+        if len(rows) > self.limit:
+            rows = rows[: self.limit]
+            self.next_position = self.position(rows[-1])
+        return rows
+
+    def get_ordering(
+        self, request: Request, queryset: QuerySet[Any], view: APIView | None
+    ) -> tuple[str, ...]:
+        for backend in getattr(view, "filter_backends", []):
+            if issubclass(backend, OrderingFilter):
+                ordering = backend().get_ordering(request, queryset, view)
+                if ordering:
+                    fields = tuple(ordering)
+                    if not {"id", "-id", "pk", "-pk"} & set(fields):
+                        fields += ("id",)
+                    return fields
+        return self.ordering
+
+    def get_limit(self, request: Request) -> int:
+        default = api_settings.PAGE_SIZE or self.max_limit
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return int(default)
+        return min(limit, self.max_limit) if limit > 0 else int(default)
+
+    def position(self, row: Model) -> list[Any]:
+        """
+        Return the ordering values of `row`, the ids of foreign keys.
+        """
+        position: list[Any] = []
+        for name in self.row_ordering:
+            field = row._meta.get_field(name.removeprefix("-"))
+            assert isinstance(field, Field)
+            position.append(getattr(row, field.attname))
+        return position
+
+    def encode_cursor(self, position: list[Any]) -> str:
+        cursor = {"ordering": self.row_ordering, "position": position}
+        data = json.dumps(cursor, cls=DjangoJSONEncoder).encode()
+        return urlsafe_b64encode(data).decode()
+
+    def decode_cursor(self, request: Request) -> list[Any] | None:
+        """
+        Return the position in the cursor parameter, None without one.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode()))
+            ordering, position = cursor["ordering"], cursor["position"]
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise NotFound("Invalid cursor")
+        # A cursor is only valid for the ordering it was made with.
+        if (
+            ordering != list(self.row_ordering)
+            or not isinstance(position, list)
+            or len(position) != len(ordering)
+        ):
+            raise NotFound("Invalid cursor")
+        return position
+
+    def get_next_link(self) -> str | None:
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.next_position)
+        )
+
+    def get_paginated_response(self, data: Any) -> Response:
+        return Response(
+            {
+                "count": self.count,
+                "next": self.get_next_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(
+        self, schema: dict[str, Any]
+    ) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "required": ["count", "results"],
+            "properties": {
+                "count": {"type": "integer", "nullable": True},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(
+        self, view: APIView
+    ) -> list[dict[str, Any]]:
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.limit_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Set to false to leave out the total count.",
+                "schema": {"type": "boolean"},
+            },
+        ]
+
+
+class VotePagination(KeysetPagination):
+    # Unique, and covered by the scraper_vote_item_party_vote index.
+    ordering = ("parliamentary_item", "party")
+
+
+class LoadingPagination(KeysetPagination):
+    # Covered by the analyzer_loading_analysis_comp index, which holds the
+    # row id on SQLite.
+    ordering = ("analysis", "component", "id")
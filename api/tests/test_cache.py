@@ -0,0 +1,144 @@
+from unittest import mock
+from django.core.cache import cache, caches
+from django.test import override_settings
+from django.urls import reverse
+from redis.exceptions import TimeoutError as RedisTimeoutError
+from rest_framework.test import APITestCase
+from analyzer.cache import latest_analysis_cache_key
+from analyzer.models import PCAAnalysis
+from api import cache as api_cache
+from api.cache import API_CACHE, get_api_cache, get_cache_metrics
+from scraper.tests.utils.testing_utils import (
+    generate_parliamentary_items,
+    generate_parties,
+    generate_party_votes,
+)
+from scraper.versions import (
+    ANALYSIS_DATA,
+    IMPORT_DATA,
+    increment_data_version,
+)
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+        API_CACHE: {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "api-tests",
+        },
+    }
+)
+class TestCachedResponseMixin(APITestCase):
+    def setUp(self) -> None:
+        generate_party_votes(
+            parliamentary_items=generate_parliamentary_items(5),
+            parties=generate_parties(3),
+        )
+        cache.clear()
+        caches[API_CACHE].clear()
+        self.url = reverse("parliamentaryitem-list")
+
+    def tearDown(self) -> None:
+        api_cache._unavailable_until = 0.0
+
+    def test_second_request_is_served_from_cache(self) -> None:
+        response = self.client.get(self.url)
+        # Only the data versions are queried.
+        with self.assertNumQueries(1):
+            cached = self.client.get(self.url)
+        self.assertEqual(200, cached.status_code)
+        self.assertEqual(response.json(), cached.json())
+        self.assertEqual(
+            {"available": True, "hits": 1, "misses": 1, "hit_rate": 0.5},
+            get_cache_metrics(),
+        )
+
+    def test_query_string_is_normalized(self) -> None:
+        self.client.get(self.url, {"item_type": "Motion", "limit": "2"})
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                f"{self.url}?limit=2&title=&item_type=Motion&status="
+            )
+        self.assertEqual(2, len(response.json()["results"]))
+        # Versions, count and items.
+        with self.assertNumQueries(3):
+            self.client.get(self.url, {"item_type": "Motion", "limit": "3"})
+
+    def test_new_import_invalidates_responses(self) -> None:
+        self.client.get(self.url)
+        item = generate_parliamentary_items(1)[0]
+        increment_data_version(IMPORT_DATA)
+        response = self.client.get(self.url)
+        self.assertIn(
+            item.id, [row["id"] for row in response.json()["results"]]
+        )
+
+    def test_new_analysis_of_other_process_invalidates_responses(
+        self,
+    ) -> None:
+        previous = PCAAnalysis.objects.create()
+        url = reverse("pca-chart-list")
+        self.assertEqual(previous.id, self.client.get(url).json()["analysis"])
+        # Committed by another process: the latest analysis id of the
+        # previous version is still in the cache of this one.
+        latest = PCAAnalysis.objects.create()
+        increment_data_version(ANALYSIS_DATA)
+        self.assertEqual(previous.id, cache.get(latest_analysis_cache_key(0)))
+        self.assertEqual(latest.id, self.client.get(url).json()["analysis"])
+
+    def test_unavailable_cache_fails_open(self) -> None:
+        with mock.patch.object(
+            caches[API_CACHE], "get", side_effect=ConnectionError("down")
+        ):
+            with self.assertLogs("api.cache", "WARNING"):
+                response = self.client.get(self.url)
+        self.assertEqual(200, response.status_code)
+        self.assertIsNone(get_api_cache())
+        # Skipped until API_CACHE_RETRY_AFTER has passed.
+        self.assertEqual(200, self.client.get(self.url).status_code)
+        self.assertFalse(get_cache_metrics()["available"])
+        api_cache._unavailable_until = 0.0
+        self.assertEqual(0, get_cache_metrics()["hits"])
+
+    def test_redis_error_fails_open(self) -> None:
+        with mock.patch.object(
+            caches[API_CACHE], "set", side_effect=RedisTimeoutError("slow")
+        ):
+            with self.assertLogs("api.cache", "WARNING"):
+                response = self.client.get(self.url)
+        self.assertEqual(200, response.status_code)
+        self.assertIsNone(get_api_cache())
+
+    def test_other_errors_are_raised(self) -> None:
+        with mock.patch.object(
+            caches[API_CACHE], "get", side_effect=KeyError("bug")
+        ):
+            with self.assertRaises(KeyError):
+                self.client.get(self.url)
+
+    def test_metrics_endpoint(self) -> None:
+        response = self.client.get(reverse("cache-metrics"))
+        self.assertEqual(
+            {"available": True, "hits": 0, "misses": 0, "hit_rate": None},
+            response.json(),
+        )
+
+    def test_metrics_endpoint_with_unavailable_cache(self) -> None:
+        with mock.patch.object(
+            caches[API_CACHE], "get_many", side_effect=RedisTimeoutError("slow")
+        ):
+            with self.assertLogs("api.cache", "WARNING"):
+                response = self.client.get(reverse("cache-metrics"))
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            {
+                "available": False,
+                "hits": None,
+                "misses": None,
+                "hit_rate": None,
+            },
+            response.json(),
+        )
@@ -0,0 +1,86 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from analyzer.analysis import run_pca_analysis
+from api.tests.utils.testing_utils import without_api_cache
+from scraper.tests.utils.testing_utils import (
+    generate_parliamentary_items,
+    generate_parties,
+    generate_party_votes,
+)
+from scraper.versions import (
+    ANALYSIS_DATA,
+    IMPORT_DATA,
+    get_data_versions,
+    increment_data_version,
+)
+
+
+@without_api_cache()
+class TestConditionalGet(APITestCase):
+    def setUp(self) -> None:
+        generate_party_votes(
+            parliamentary_items=generate_parliamentary_items(5),
+            parties=generate_parties(3),
+        )
+        increment_data_version(IMPORT_DATA)
+        increment_data_version(ANALYSIS_DATA)
+
+    def test_responses_have_validators(self) -> None:
+        response = self.client.get(reverse("party-list"))
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(response.headers["ETag"].startswith('"analysis1-'))
+        self.assertIn("Last-Modified", response.headers)
+
+    def test_matching_etag_is_not_modified(self) -> None:
+        url = reverse("party-list")
+        etag = self.client.get(url).headers["ETag"]
+        # Only the data versions are queried.
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(304, response.status_code)
+        self.assertEqual(b"", response.content)
+
+    def test_etag_depends_on_accept_header(self) -> None:
+        url = reverse("party-list")
+        json_etag = self.client.get(url, HTTP_ACCEPT="application/json")
+        html_etag = self.client.get(url, HTTP_ACCEPT="text/html")
+        self.assertNotEqual(
+            json_etag.headers["ETag"], html_etag.headers["ETag"]
+        )
+
+    def test_etag_changes_with_the_data(self) -> None:
+        url = reverse("party-list")
+        etag = self.client.get(url).headers["ETag"]
+        increment_data_version(IMPORT_DATA)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, response.status_code)
+        self.assertNotEqual(etag, response.headers["ETag"])
+
+    def test_etag_only_depends_on_the_data_of_the_endpoint(self) -> None:
+        votes_url = reverse("partyvote-list")
+        scores_url = reverse("pcacomponentpartyscore-list")
+        votes_etag = self.client.get(votes_url).headers["ETag"]
+        scores_etag = self.client.get(scores_url).headers["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            run_pca_analysis(n_components=2)
+
+        response = self.client.get(votes_url, HTTP_IF_NONE_MATCH=votes_etag)
+        self.assertEqual(304, response.status_code)
+        response = self.client.get(scores_url, HTTP_IF_NONE_MATCH=scores_etag)
+        self.assertEqual(200, response.status_code)
+
+
+class TestDataVersions(TestCase):
+    def test_unknown_versions_are_zero(self) -> None:
+        self.assertEqual(
+            ({IMPORT_DATA: 0, ANALYSIS_DATA: 0}, None),
+            get_data_versions([IMPORT_DATA, ANALYSIS_DATA]),
+        )
+
+    def test_increment(self) -> None:
+        increment_data_version(IMPORT_DATA)
+        increment_data_version(IMPORT_DATA)
+        versions, updated_at = get_data_versions([IMPORT_DATA, ANALYSIS_DATA])
+        self.assertEqual({IMPORT_DATA: 2, ANALYSIS_DATA: 0}, versions)
+        self.assertIsNotNone(updated_at)
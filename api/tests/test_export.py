@@ -0,0 +1,101 @@
+import csv
+import json
+from typing import Any
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from analyzer.analysis import run_pca_analysis
+from analyzer.models import PCAItemLoading
+from scraper.models import Party, PartyVote
+from api.tests.utils.testing_utils import without_api_cache
+from scraper.tests.utils.testing_utils import (
+    generate_parliamentary_items,
+    generate_parties,
+    generate_party_votes,
+)
+
+
+@without_api_cache()
+class TestExport(APITestCase):
+    def setUp(self) -> None:
+        generate_party_votes(
+            parliamentary_items=generate_parliamentary_items(6),
+            parties=generate_parties(4),
+        )
+        self.url = reverse("partyvote-export")
+
+    def content(self, response: Any) -> str:
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(response.streaming)
+        return str(response.getvalue().decode())
+
+    def test_ndjson(self) -> None:
+        response = self.client.get(self.url)
+        self.assertEqual("application/x-ndjson", response["Content-Type"])
+        rows = [
+            json.loads(line) for line in self.content(response).splitlines()
+        ]
+        expected = list(
+            PartyVote.objects.order_by("parliamentary_item", "party").values(
+                "id", "party", "parliamentary_item", "vote"
+            )
+        )
+        self.assertListEqual(expected, rows)
+
+    def test_csv(self) -> None:
+        response = self.client.get(self.url, {"output": "csv"})
+        self.assertEqual("text/csv", response["Content-Type"])
+        self.assertIn("partyvote.csv", response["Content-Disposition"])
+        rows = list(csv.reader(self.content(response).splitlines()))
+        self.assertListEqual(
+            ["id", "party", "parliamentary_item", "vote"], rows[0]
+        )
+        self.assertEqual(PartyVote.objects.count(), len(rows) - 1)
+
+    def test_filters_and_ordering(self) -> None:
+        party = Party.objects.first()
+        assert party is not None
+        response = self.client.get(
+            self.url,
+            {"party": str(party.id), "ordering": "-parliamentary_item"},
+        )
+        rows = [
+            json.loads(line) for line in self.content(response).splitlines()
+        ]
+        expected = list(
+            PartyVote.objects.filter(party=party)
+            .order_by("-parliamentary_item")
+            .values_list("id", flat=True)
+        )
+        self.assertListEqual(expected, [row["id"] for row in rows])
+
+    @override_settings(API_EXPORT_CHUNK_SIZE=5)
+    def test_rows_are_read_with_one_query(self) -> None:
+        # Data versions and the rows, read in chunks from one cursor.
+        with self.assertNumQueries(2):
+            content = self.content(self.client.get(self.url))
+        self.assertEqual(24, len(content.splitlines()))
+
+    def test_unknown_output(self) -> None:
+        response = self.client.get(self.url, {"output": "xml"})
+        self.assertEqual(400, response.status_code)
+
+    def test_loadings_of_analysis(self) -> None:
+        run_pca_analysis(n_components=2)
+        analysis = run_pca_analysis(n_components=3, force=True)
+        assert analysis is not None
+        response = self.client.get(
+            reverse("pcaitemloading-export"),
+            {"analysis": str(analysis.id), "output": "csv"},
+        )
+        rows = list(csv.DictReader(self.content(response).splitlines()))
+        self.assertEqual(
+            PCAItemLoading.objects.filter(analysis=analysis).count(), len(rows)
+        )
+        self.assertEqual({str(analysis.id)}, {row["analysis"] for row in rows})
+        self.assertListEqual(
+            sorted(
+                rows, key=lambda row: (int(row["component"]), int(row["id"]))
+            ),
+            rows,
+        )
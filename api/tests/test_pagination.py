@@ -0,0 +1,104 @@
+from typing import Any
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from analyzer.analysis import run_pca_analysis
+from analyzer.models import PCAItemLoading
+from api.tests.utils.testing_utils import without_api_cache
+from api.pagination import after
+from scraper.models import PartyVote
+from scraper.tests.utils.testing_utils import (
+    explain,
+    generate_parliamentary_items,
+    generate_parties,
+    generate_party_votes,
+)
+
+
+@without_api_cache()
+class TestKeysetPagination(APITestCase):
+    def setUp(self) -> None:
+        generate_party_votes(
+            parliamentary_items=generate_parliamentary_items(6),
+            parties=generate_parties(4),
+        )
+        self.url = reverse("partyvote-list")
+
+    def walk(self, url: str, **params: str) -> list[dict[str, Any]]:
+        rows: list[dict[str, Any]] = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(200, response.status_code)
+            data = response.json()
+            rows += data["results"]
+            if data["next"] is None:
+                return rows
+            response = self.client.get(data["next"])
+
+    def test_pages_cover_all_rows_in_order(self) -> None:
+        rows = self.walk(self.url, limit="5")
+        expected = list(
+            PartyVote.objects.order_by(
+                "parliamentary_item", "party"
+            ).values_list("id", flat=True)
+        )
+        self.assertListEqual(expected, [row["id"] for row in rows])
+
+    def test_ordering_filter_with_id_tiebreaker(self) -> None:
+        rows = self.walk(self.url, limit="5", ordering="-vote")
+        expected = list(
+            PartyVote.objects.order_by("-vote", "id").values_list(
+                "id", flat=True
+            )
+        )
+        self.assertListEqual(expected, [row["id"] for row in rows])
+
+    def test_deep_pages_do_not_offset(self) -> None:
+        response = self.client.get(self.url, {"limit": "20"})
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(response.json()["next"])
+        self.assertEqual(4, len(response.json()["results"]))
+        for query in context.captured_queries:
+            self.assertNotIn("OFFSET", query["sql"])
+
+    def test_count_can_be_skipped(self) -> None:
+        data = self.client.get(self.url, {"limit": "5"}).json()
+        self.assertEqual(24, data["count"])
+
+        with CaptureQueriesContext(connection) as context:
+            data = self.client.get(
+                self.url, {"limit": "5", "count": "false"}
+            ).json()
+        self.assertIsNone(data["count"])
+        self.assertIn("count=false", data["next"])
+        for query in context.captured_queries:
+            self.assertNotIn("COUNT(", query["sql"])
+
+    def test_invalid_cursor(self) -> None:
+        next_url = self.client.get(self.url, {"limit": "5"}).json()["next"]
+        # A cursor is only valid for the ordering it was made with.
+        response = self.client.get(f"{next_url}&ordering=party")
+        self.assertEqual(404, response.status_code)
+        for cursor in ("abc", "W10=", "eyJvcmRlcmluZyI6IDF9"):
+            response = self.client.get(self.url, {"cursor": cursor})
+            self.assertEqual(404, response.status_code)
+
+    def test_loadings(self) -> None:
+        run_pca_analysis(n_components=2)
+        run_pca_analysis(n_components=3, force=True)
+        rows = self.walk(reverse("pcaitemloading-list"), limit="4")
+        expected = list(
+            PCAItemLoading.objects.order_by(
+                "analysis", "component", "id"
+            ).values_list("id", flat=True)
+        )
+        self.assertListEqual(expected, [row["id"] for row in rows])
+
+    def test_next_page_uses_index(self) -> None:
+        plan = explain(
+            PartyVote.objects.filter(
+                after(("parliamentary_item", "party"), (3, 2))
+            ).order_by("parliamentary_item", "party")[:100]
+        )
+        self.assertIn("scraper_vote_item_party_vote", plan)
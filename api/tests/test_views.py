@@ -1,22 +1,35 @@
 from typing import Any
 
 from django.utils.dateparse import parse_datetime
+from django.test import override_settings
 from rest_framework.test import APITestCase
 from django.urls import reverse
+from django.core.cache import cache
 from scraper.tests.utils.testing_utils import (
     generate_parties,
     generate_parliamentary_items,
     generate_party_votes,
 )
-from analyzer.analysis import run_pca_analysis
-from analyzer.models import PCAAnalysis, PCAComponentPartyScore, PCAItemLoading
+from analyzer.analysis import (
+    calculate_party_participation_rate,
+    run_pca_analysis,
+)
+from analyzer.models import (
+    KeyItemRanking,
+    PCAAnalysis,
+    PCAComponentPartyScore,
+    PCAItemLoading,
+)
 from scraper.models import Party, ParliamentaryItem, PartyVote, VoteType
 from scraper.tests.factories import ParliamentaryItemFactory
+from api.tests.utils.testing_utils import without_api_cache
 
 
+@without_api_cache()
 class TestPartyViewSet(APITestCase):
     def setUp(self) -> None:
         generate_parties()
+        cache.clear()
 
     def test_list_returns_200(self) -> None:
         url = reverse("party-list")
@@ -71,7 +84,49 @@ class TestPartyViewSet(APITestCase):
         abbreviations = [party["abbreviation"] for party in data]
         self.assertEqual(abbreviations, sorted(abbreviations, reverse=True))
 
+    def test_party_scores_of_latest_analysis(self) -> None:
+        generate_party_votes(
+            parliamentary_items=generate_parliamentary_items(10),
+            parties=Party.objects.all(),
+        )
+        run_pca_analysis(n_components=3)
+        run_pca_analysis(n_components=2)
+        latest = PCAAnalysis.objects.order_by("-created_at").first()
+        assert latest is not None
 
+        response = self.client.get(reverse("party-list"))
+        data: list[dict[str, Any]] = response.data.get("results", response.data)
+        self.assertEqual(response.status_code, 200)
+        for party in data:
+            self.assertEqual(len(party["party_scores"]), 2)
+            for score in party["party_scores"]:
+                self.assertEqual(score["analysis"], latest.id)
+                self.assertEqual(score["party"], party["id"])
+
+    def test_list_uses_a_fixed_number_of_queries(self) -> None:
+        generate_party_votes(
+            parliamentary_items=generate_parliamentary_items(10),
+            parties=Party.objects.all(),
+        )
+        run_pca_analysis(n_components=3)
+        url = reverse("party-list")
+        # Data versions, count, latest analysis, parties and prefetched
+        # scores.
+        with self.assertNumQueries(5):
+            self.client.get(url)
+        # The latest analysis id is cached now.
+        with self.assertNumQueries(4):
+            self.client.get(url)
+
+    def test_list_without_analysis(self) -> None:
+        response = self.client.get(reverse("party-list"))
+        data: list[dict[str, Any]] = response.data.get("results", response.data)
+        self.assertEqual(response.status_code, 200)
+        for party in data:
+            self.assertEqual(party["party_scores"], [])
+
+
+@without_api_cache()
 class TestPartyVoteViewSet(APITestCase):
     def setUp(self) -> None:
         generate_party_votes(
@@ -147,6 +202,7 @@ class TestPartyVoteViewSet(APITestCase):
         self.assertEqual(parties, sorted(parties))
 
 
+@without_api_cache()
 class TestParliamentaryItemViewSet(APITestCase):
     def setUp(self) -> None:
         generate_parliamentary_items()
@@ -236,6 +292,70 @@ class TestParliamentaryItemViewSet(APITestCase):
         self.assertEqual(dates, sorted(dates, reverse=True))
 
 
+@without_api_cache()
+class TestKeyParliamentaryItemViewSet(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.parties = generate_parties()
+        self.url = reverse("key-parliamentary-items-list")
+
+    def run_analysis(self, items: int) -> PCAAnalysis:
+        generate_party_votes(
+            parliamentary_items=generate_parliamentary_items(items),
+            parties=self.parties,
+        )
+        run_pca_analysis(n_components=3)
+        analysis = PCAAnalysis.objects.order_by("-created_at").first()
+        assert analysis is not None
+        return analysis
+
+    def test_no_analysis(self) -> None:
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 500)
+
+    def test_items_are_ordered_by_rank(self) -> None:
+        analysis = self.run_analysis(20)
+        response = self.client.get(self.url)
+        data: list[dict[str, Any]] = response.data.get("results", response.data)
+        self.assertEqual(response.status_code, 200)
+        expected = list(
+            KeyItemRanking.objects.filter(analysis=analysis, component=None)
+            .order_by("rank")
+            .values_list("parliamentary_item_id", flat=True)
+        )
+        self.assertEqual([item["id"] for item in data], expected)
+        self.assertEqual(len(data), 10)
+        for item in data:
+            self.assertEqual(len(item["loadings"]), 3)
+            self.assertEqual(len(item["votes"]), len(self.parties))
+
+    def test_filter_by_component(self) -> None:
+        analysis = self.run_analysis(20)
+        response = self.client.get(self.url, {"component": 2})
+        data: list[dict[str, Any]] = response.data.get("results", response.data)
+        self.assertEqual(response.status_code, 200)
+        expected = list(
+            KeyItemRanking.objects.filter(analysis=analysis, component=2)
+            .order_by("rank")
+            .values_list("parliamentary_item_id", flat=True)
+        )
+        self.assertEqual([item["id"] for item in data], expected)
+
+    def test_invalid_component(self) -> None:
+        self.run_analysis(5)
+        response = self.client.get(self.url, {"component": "first"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_queries_do_not_depend_on_loadings(self) -> None:
+        self.run_analysis(40)
+        self.client.get(self.url)
+        # Data versions, loading matrix, count, items, votes and loadings;
+        # not one query per item.
+        with self.assertNumQueries(6):
+            self.client.get(self.url)
+
+
+@without_api_cache()
 class TestPCAAnalysisViewSet(APITestCase):
     def setUp(self) -> None:
         generate_party_votes(
@@ -306,6 +426,72 @@ class TestPCAAnalysisViewSet(APITestCase):
             self.assertEqual(row_dt, analysis.created_at)
 
 
+@without_api_cache()
+class TestPCAAnalysisLoadings(APITestCase):
+    def setUp(self) -> None:
+        generate_party_votes(
+            parliamentary_items=generate_parliamentary_items(10),
+            parties=generate_parties(),
+        )
+
+    def get_loadings(self, **params: Any) -> Any:
+        analysis = PCAAnalysis.objects.get()
+        url = reverse("pcaanalysis-loadings", args=[analysis.id])
+        return self.client.get(url, params)
+
+    def assert_loadings(self) -> None:
+        item = ParliamentaryItem.objects.first()
+        assert item is not None
+        response = self.get_loadings(component=2)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["loadings"]), 10)
+
+        response = self.get_loadings(item=item.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.data["loadings"]), [1, 2, 3])
+        for component, loading in response.data["loadings"].items():
+            row = PCAItemLoading.objects.filter(
+                parliamentary_item=item, component=component
+            ).first()
+            if row is not None:
+                self.assertEqual(loading, row.loading)
+
+    def test_rows_storage(self) -> None:
+        run_pca_analysis(n_components=3)
+        self.assert_loadings()
+
+    @override_settings(ANALYZER_LOADINGS_STORAGE="db")
+    def test_db_storage(self) -> None:
+        run_pca_analysis(n_components=3)
+        self.assert_loadings()
+
+    @override_settings(ANALYZER_LOADINGS_STORAGE="db")
+    def test_key_items_with_db_storage(self) -> None:
+        cache.clear()
+        run_pca_analysis(n_components=3)
+        response = self.client.get(reverse("key-parliamentary-items-list"))
+        data: list[dict[str, Any]] = response.data.get("results", response.data)
+        self.assertEqual(response.status_code, 200)
+        for item in data:
+            self.assertEqual(len(item["loadings"]), 3)
+            self.assertEqual(
+                item["loadings"][0]["parliamentary_item"], item["id"]
+            )
+
+    def test_invalid_parameters(self) -> None:
+        run_pca_analysis(n_components=3)
+        self.assertEqual(self.get_loadings().status_code, 400)
+        self.assertEqual(
+            self.get_loadings(component=1, item=1).status_code, 400
+        )
+        self.assertEqual(self.get_loadings(component="x").status_code, 400)
+
+    def test_unknown_component(self) -> None:
+        run_pca_analysis(n_components=3)
+        self.assertEqual(self.get_loadings(component=4).status_code, 404)
+
+
+@without_api_cache()
 class TestPCAComponentPartyScoreViewSet(APITestCase):
     def setUp(self) -> None:
         generate_party_votes(
@@ -391,6 +577,7 @@ class TestPCAComponentPartyScoreViewSet(APITestCase):
         self.assertEqual(scores, sorted(scores))
 
 
+@without_api_cache()
 class TestPCAItemLoadingViewSet(APITestCase):
     def setUp(self) -> None:
         generate_party_votes(
@@ -421,6 +608,19 @@ class TestPCAItemLoadingViewSet(APITestCase):
         for row in data:
             self.assertEqual(row["analysis"], analysis.id)
 
+    @override_settings(ANALYZER_LOADINGS_STORAGE="db")
+    def test_filter_by_analysis_with_loading_matrix(self) -> None:
+        analysis = run_pca_analysis(n_components=3, force=True)
+        assert analysis is not None
+        loadings_url = reverse("pcaanalysis-loadings", args=[analysis.id])
+        for url in (
+            reverse("pcaitemloading-list"),
+            reverse("pcaitemloading-export"),
+        ):
+            response = self.client.get(url, {"analysis": analysis.id})
+            self.assertEqual(response.status_code, 409)
+            self.assertIn(loadings_url, response.json()["detail"])
+
     def test_filter_by_parliamentary_item_id(self) -> None:
         url = reverse("pcaitemloading-list")
         item = ParliamentaryItem.objects.first()
@@ -469,3 +669,81 @@ class TestPCAItemLoadingViewSet(APITestCase):
         self.assertEqual(response.status_code, 200)
         for row in data:
             self.assertEqual(row["loading"], pcal.loading)
+
+
+@without_api_cache()
+class TestPCAChartViewSet(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.parties = generate_parties(4)
+        generate_party_votes(
+            parliamentary_items=generate_parliamentary_items(10),
+            parties=self.parties,
+        )
+
+    def test_latest_analysis(self) -> None:
+        run_pca_analysis(n_components=3)
+        analysis = run_pca_analysis(n_components=2, force=True)
+        assert analysis is not None
+
+        response = self.client.get(reverse("pca-chart-list"))
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(analysis.id, data["analysis"])
+        self.assertListEqual([1, 2], data["components"])
+        self.assertEqual(
+            analysis.explained_variance, data["explained_variance"]
+        )
+        parties = sorted(self.parties, key=lambda party: party.abbreviation)
+        self.assertListEqual(
+            [party.abbreviation for party in parties], data["parties"]
+        )
+        score = PCAComponentPartyScore.objects.get(
+            analysis=analysis, party=parties[1], component=2
+        )
+        self.assertAlmostEqual(score.score, data["scores"][1][1])
+        self.assertEqual(4, len(data["participation_rates"]))
+
+    def test_given_analysis(self) -> None:
+        first = run_pca_analysis(n_components=3)
+        run_pca_analysis(n_components=2, force=True)
+        assert first is not None
+        url = reverse("pca-chart-detail", args=[first.id])
+        data = self.client.get(url).json()
+        self.assertEqual(first.id, data["analysis"])
+        self.assertEqual(3, len(data["scores"]))
+
+        response = self.client.get(reverse("pca-chart-detail", args=[0]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_participation_rates_of_the_analysis(self) -> None:
+        calculate_party_participation_rate()
+        first = run_pca_analysis(n_components=2)
+        assert first is not None
+        rates = list(Party.objects.values_list("participation_rate", flat=True))
+        Party.objects.update(participation_rate=0.0)
+        run_pca_analysis(n_components=2, force=True)
+
+        url = reverse("pca-chart-detail", args=[first.id])
+        data = self.client.get(url).json()
+        self.assertCountEqual(rates, data["participation_rates"])
+        latest = self.client.get(reverse("pca-chart-list")).json()
+        self.assertEqual([0.0] * 4, latest["participation_rates"])
+
+        # Analyses from before the rates were recorded have none.
+        PCAAnalysis.objects.filter(id=first.id).update(participation_rates={})
+        data = self.client.get(url).json()
+        self.assertEqual([None] * 4, data["participation_rates"])
+
+    def test_without_analysis(self) -> None:
+        response = self.client.get(reverse("pca-chart-list"))
+        self.assertEqual(response.status_code, 500)
+
+    def test_uses_a_fixed_number_of_queries(self) -> None:
+        calculate_party_participation_rate()
+        run_pca_analysis(n_components=3)
+        url = reverse("pca-chart-list")
+        self.client.get(url)
+        # Data versions, analysis and scores with their parties.
+        with self.assertNumQueries(3):
+            self.client.get(url)
@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.test.utils import override_settings
+from api.cache import API_CACHE
+
+
+def without_api_cache() -> override_settings:
+    """
+    Return settings overrides that replace the API response cache with a
+    dummy cache, for test databases: their data versions start over every
+    run, so a shared cache could return responses of a previous run.
+    """
+    return override_settings(
+        CACHES={
+            **settings.CACHES,
+            API_CACHE: {
+                "BACKEND": "django.core.cache.backends.dummy.DummyCache"
+            },
+        }
+    )
@@ -7,6 +7,8 @@ from api.views import (
     PCAAnalysisViewSet,
     PCAComponentPartyScoreViewSet,
     PCAItemLoadingViewSet,
+    PCAChartViewSet,
+    CacheMetricsView,
 )
 from django.urls import path, include
 
@@ -21,8 +23,10 @@ router.register(
 router.register("analysis", PCAAnalysisViewSet)
 router.register("pca-scores", PCAComponentPartyScoreViewSet)
 router.register("pca-loadings", PCAItemLoadingViewSet)
+router.register("pca-chart", PCAChartViewSet, basename="pca-chart")
 
 
 urlpatterns = [
     path("", include(router.urls)),
+    path("cache-metrics/", CacheMetricsView.as_view(), name="cache-metrics"),
 ]
@@ -1,31 +1,61 @@
-from django.db.models.functions import Abs
-from rest_framework.viewsets import ReadOnlyModelViewSet
+from rest_framework.viewsets import GenericViewSet, ReadOnlyModelViewSet
 from scraper.serializers import (
     PartySerializer,
     PartyVoteSerializer,
     ParliamentaryItemSerializer,
     KeyParliamentaryItemSerializer,
 )
-from api.errors import NoAnalysisFoundException
-from django.db.models import Sum, QuerySet
+from api.cache import CachedResponseMixin, get_cache_metrics
+from api.errors import LoadingsStoredAsMatrixException, NoAnalysisFoundException
+from api.export import ExportMixin
+from api.pagination import LoadingPagination, VotePagination
+from django.db.models import F, FilteredRelation, Prefetch, Q, QuerySet
+from typing import Any
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from rest_framework.views import APIView
+from analyzer.loadings import get_loading_matrix
+from analyzer.chart import chart_payload
 from analyzer.serializers import (
     PCAAnalysisSerializer,
     PCAComponentPartyScoreSerializer,
     PCAItemLoadingSerializer,
 )
-from analyzer.models import PCAAnalysis, PCAComponentPartyScore, PCAItemLoading
+from analyzer.models import (
+    PCAAnalysis,
+    PCAComponentPartyScore,
+    PCAItemLoading,
+    PCALoadingMatrix,
+)
 from scraper.models import Party, PartyVote, ParliamentaryItem
+from scraper.versions import ANALYSIS_DATA, IMPORT_DATA
 
 
-class PartyViewSet(ReadOnlyModelViewSet[Party]):
+class PartyViewSet(CachedResponseMixin, ReadOnlyModelViewSet[Party]):
     queryset = Party.objects.all()
     serializer_class = PartySerializer
     filterset_fields = ["id", "abbreviation", "name"]
 
+    def get_queryset(self) -> QuerySet[Party]:
+        # Prefetch the scores of the latest analysis for all parties at once.
+        analysis_id = self.latest_analysis_id(self.request)
+        scores = PCAComponentPartyScore.objects.filter(analysis_id=analysis_id)
+        return self.queryset.prefetch_related(
+            Prefetch("pca_scores", queryset=scores, to_attr="latest_pca_scores")
+        )
+
 
-class PartyVoteViewSet(ReadOnlyModelViewSet[PartyVote]):
+class PartyVoteViewSet(
+    CachedResponseMixin, ExportMixin, ReadOnlyModelViewSet[PartyVote]
+):
     queryset = PartyVote.objects.all()
     serializer_class = PartyVoteSerializer
+    pagination_class = VotePagination
+    data_versions = (IMPORT_DATA,)
+    export_fields = ("id", "party", "parliamentary_item", "vote")
     filterset_fields = {
         "id": ["exact"],
         "party": ["exact"],
@@ -35,9 +65,12 @@ class PartyVoteViewSet(ReadOnlyModelViewSet[PartyVote]):
     }
 
 
-class ParliamentaryItemViewSet(ReadOnlyModelViewSet[ParliamentaryItem]):
+class ParliamentaryItemViewSet(
+    CachedResponseMixin, ReadOnlyModelViewSet[ParliamentaryItem]
+):
     queryset = ParliamentaryItem.objects.all()
     serializer_class = ParliamentaryItemSerializer
+    data_versions = (IMPORT_DATA,)
     filterset_fields = {
         "id": ["exact"],
         "title": ["exact", "icontains"],
@@ -47,41 +80,118 @@ class ParliamentaryItemViewSet(ReadOnlyModelViewSet[ParliamentaryItem]):
     }
 
 
-# FIXME - test
-class KeyParliamentaryItemViewSet(ReadOnlyModelViewSet[ParliamentaryItem]):
+class KeyParliamentaryItemViewSet(
+    CachedResponseMixin, ReadOnlyModelViewSet[ParliamentaryItem]
+):
+    """
+    The key items of the latest analysis, as stored by `run_pca_analysis`.
+
+    Without parameters the ranking over all components is returned; use
+    `?component=<n>` for the ranking of a single component.
+    """
+
     serializer_class = KeyParliamentaryItemSerializer
     filterset_fields = {
         "id": ["exact"],
     }
 
     def get_queryset(self) -> QuerySet[ParliamentaryItem]:
-        latest_analysis = PCAAnalysis.objects.order_by("-created_at").first()
-        if not latest_analysis:
+        analysis_id = self.latest_analysis_id(self.request)
+        if analysis_id is None:
             raise NoAnalysisFoundException
 
+        component = self.request.query_params.get("component")
+        if component is None:
+            in_ranking = Q(key_rankings__component__isnull=True)
+        elif component.isdigit():
+            in_ranking = Q(key_rankings__component=int(component))
+        else:
+            raise ValidationError({"component": "Must be a component number."})
+
+        # Loadings stored as a matrix are read from it by the serializer.
+        self.analysis_id = analysis_id
+        self.loading_matrix = get_loading_matrix(analysis_id, from_rows=False)
+        loadings = PCAItemLoading.objects.filter(analysis_id=analysis_id)
+        if self.loading_matrix is not None:
+            loadings = loadings.none()
+
         queryset = (
-            ParliamentaryItem.objects.filter(
-                pca_loadings__analysis=latest_analysis
+            ParliamentaryItem.objects.annotate(
+                ranking=FilteredRelation(
+                    "key_rankings",
+                    condition=Q(key_rankings__analysis_id=analysis_id)
+                    & in_ranking,
+                )
+            )
+            .filter(ranking__isnull=False)
+            .annotate(total_loading=F("ranking__total_loading"))
+            .order_by("ranking__rank")
+            .prefetch_related(
+                "partyvote_set",
+                Prefetch("pca_loadings", queryset=loadings),
             )
-            .annotate(total_loading=Sum(Abs("pca_loadings__loading")))
-            .order_by("-total_loading")[:10]
         )
         return queryset
 
+    def get_serializer_context(self) -> dict[str, Any]:
+        return {
+            **super().get_serializer_context(),
+            "loading_matrix": getattr(self, "loading_matrix", None),
+            "analysis_id": getattr(self, "analysis_id", None),
+        }
+
 
-class PCAAnalysisViewSet(ReadOnlyModelViewSet[PCAAnalysis]):
+class PCAAnalysisViewSet(
+    CachedResponseMixin, ReadOnlyModelViewSet[PCAAnalysis]
+):
     queryset = PCAAnalysis.objects.all()
     serializer_class = PCAAnalysisSerializer
+    data_versions = (ANALYSIS_DATA,)
     filterset_fields = {
         "created_at": ["exact", "gte", "lte"],
     }
 
+    @action(detail=True)
+    def loadings(self, request: Request, pk: str | None = None) -> Response:
+        """
+        The loadings of an analysis, for `?component=<n>` by item ID or for
+        `?item=<id>` by component, however they are stored.
+        """
+        analysis = self.get_object()
+        component = request.query_params.get("component")
+        item = request.query_params.get("item")
+        if (component is None) == (item is None):
+            raise ValidationError("Pass either 'component' or 'item'.")
+        for name, value in (("component", component), ("item", item)):
+            if value is not None and not value.isdigit():
+                raise ValidationError({name: "Must be a number."})
+
+        matrix = get_loading_matrix(analysis.id)
+        try:
+            if matrix is None:
+                raise KeyError
+            if component is not None:
+                loadings = matrix.component(int(component))
+            else:
+                loadings = matrix.item(int(str(item)))
+        except KeyError:
+            raise NotFound("No loadings found.")
+        return Response(
+            {
+                "analysis": analysis.id,
+                "component": None if component is None else int(component),
+                "item": None if item is None else int(item),
+                "loadings": loadings,
+            }
+        )
+
 
 class PCAComponentPartyScoreViewSet(
-    ReadOnlyModelViewSet[PCAComponentPartyScore]
+    CachedResponseMixin, ReadOnlyModelViewSet[PCAComponentPartyScore]
 ):
     queryset = PCAComponentPartyScore.objects.all()
     serializer_class = PCAComponentPartyScoreSerializer
+    data_versions = (ANALYSIS_DATA,)
     filterset_fields = {
         "analysis": ["exact"],
         "party": ["exact"],
@@ -90,12 +200,85 @@ class PCAComponentPartyScoreViewSet(
     }
 
 
-class PCAItemLoadingViewSet(ReadOnlyModelViewSet[PCAItemLoading]):
+class PCAItemLoadingViewSet(
+    CachedResponseMixin, ExportMixin, ReadOnlyModelViewSet[PCAItemLoading]
+):
+    """
+    The loadings stored as rows. Analyses whose loadings are stored as a
+    matrix (see `analyzer.loadings`) have no rows: filtering on such an
+    analysis returns 409 Conflict with a link to the loadings endpoint of
+    the analysis, which reads them however they are stored.
+    """
+
     queryset = PCAItemLoading.objects.all()
     serializer_class = PCAItemLoadingSerializer
+    pagination_class = LoadingPagination
+    data_versions = (ANALYSIS_DATA,)
+    export_fields = (
+        "id",
+        "analysis",
+        "parliamentary_item",
+        "component",
+        "loading",
+    )
     filterset_fields = {
         "analysis": ["exact"],
         "parliamentary_item": ["exact"],
         "component": ["exact"],
         "loading": ["exact", "gte", "lte"],
     }
+
+    def get_queryset(self) -> QuerySet[PCAItemLoading]:
+        analysis = self.request.query_params.get("analysis", "")
+        if (
+            analysis.isdigit()
+            and PCALoadingMatrix.objects.filter(
+                analysis_id=int(analysis)
+            ).exists()
+        ):
+            url = reverse("pcaanalysis-loadings", args=[analysis])
+            raise LoadingsStoredAsMatrixException(
+                "The loadings of this analysis are stored as a matrix; read "
+                f"them from {url}?component=<n> or {url}?item=<id>."
+            )
+        return super().get_queryset()
+
+
+class PCAChartViewSet(CachedResponseMixin, GenericViewSet[PCAAnalysis]):
+    """
+    The party scores of the latest analysis, or of the analysis with the
+    given ID, as one compact payload for the scatter plot: party labels, a
+    components x parties score matrix, the explained variance and the
+    participation rates. See `chart_payload`.
+    """
+
+    queryset = PCAAnalysis.objects.all()
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return self.cached_response(self.latest_chart, request)
+
+    def retrieve(
+        self, request: Request, pk: str | None = None, **kwargs: Any
+    ) -> Response:
+        return self.cached_response(self.chart, request, pk)
+
+    def latest_chart(self, request: Request) -> Response:
+        analysis_id = self.latest_analysis_id(request)
+        if analysis_id is None:
+            raise NoAnalysisFoundException
+        return self.chart(request, str(analysis_id))
+
+    def chart(self, request: Request, pk: str | None) -> Response:
+        payload = chart_payload(int(pk)) if pk and pk.isdigit() else None
+        if payload is None:
+            raise NotFound("No PCA analysis found.")
+        return Response(payload)
+
+
+class CacheMetricsView(APIView):
+    """
+    Hits, misses and hit rate of the API response cache.
+    """
+
+    def get(self, request: Request) -> Response:
+        return Response(get_cache_metrics())
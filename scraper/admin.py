@@ -1,16 +1,64 @@
+from typing import Any
 from django.contrib import admin
-from scraper.models import Party, ParliamentaryItem, PartyVote
+from django.db.models import Model, QuerySet
+from django.http import HttpRequest
+from scraper.models import (
+    DataVersion,
+    ImportRun,
+    Party,
+    ParliamentaryItem,
+    PartyVote,
+)
+from scraper.versions import ANALYSIS_DATA, IMPORT_DATA, bump_data_version
+
+
+class VersionedDataAdmin(admin.ModelAdmin):
+    """
+    Model admin that bumps the versions of the data it edits on every
+    change and deletion, so the API does not keep serving the data from
+    before the edit (see `scraper.versions`).
+
+    Attributes:
+        data_versions (tuple[str, ...]): The data the model belongs to,
+            and the data its deletion cascades into.
+    """
+
+    data_versions: tuple[str, ...] = (IMPORT_DATA,)
+
+    def bump_data_versions(self) -> None:
+        for name in self.data_versions:
+            bump_data_version(name)
+
+    def save_model(
+        self, request: HttpRequest, obj: Model, form: Any, change: bool
+    ) -> None:
+        super().save_model(request, obj, form, change)
+        self.bump_data_versions()
+
+    def delete_model(self, request: HttpRequest, obj: Model) -> None:
+        super().delete_model(request, obj)
+        self.bump_data_versions()
+
+    def delete_queryset(
+        self, request: HttpRequest, queryset: QuerySet[Any]
+    ) -> None:
+        super().delete_queryset(request, queryset)
+        self.bump_data_versions()
 
 
 @admin.register(Party)
-class PartyAdmin(admin.ModelAdmin):
+class PartyAdmin(VersionedDataAdmin):
+    # Deletions cascade into the scores, loadings and rankings.
+    data_versions = (IMPORT_DATA, ANALYSIS_DATA)
     list_display = ["abbreviation", "name", "participation_rate"]
     search_fields = ["abbreviation", "name", "api_id"]
     readonly_fields = ["api_id", "participation_rate"]
 
 
 @admin.register(ParliamentaryItem)
-class ParliamentaryItemAdmin(admin.ModelAdmin):
+class ParliamentaryItemAdmin(VersionedDataAdmin):
+    # Deletions cascade into the scores, loadings and rankings.
+    data_versions = (IMPORT_DATA, ANALYSIS_DATA)
     list_display = ["title", "item_type", "status", "date"]
     list_filter = ["item_type", "status"]
     search_fields = ["title", "api_id"]
@@ -18,7 +66,7 @@ class ParliamentaryItemAdmin(admin.ModelAdmin):
 
 
 @admin.register(PartyVote)
-class PartyVoteAdmin(admin.ModelAdmin):
+class PartyVoteAdmin(VersionedDataAdmin):
     list_display = ["party", "parliamentary_item", "vote"]
     list_filter = ["vote", "party"]
     search_fields = [
@@ -27,3 +75,16 @@ class PartyVoteAdmin(admin.ModelAdmin):
         "parliamentary_item__title",
     ]
     raw_id_fields = ["party", "parliamentary_item"]
+
+
+@admin.register(ImportRun)
+class ImportRunAdmin(admin.ModelAdmin):
+    list_display = ["entity", "full", "started_at", "finished_at", "watermark"]
+    list_filter = ["entity", "full"]
+    readonly_fields = ["started_at", "finished_at", "watermark", "records"]
+
+
+@admin.register(DataVersion)
+class DataVersionAdmin(admin.ModelAdmin):
+    list_display = ["name", "version", "updated_at"]
+    readonly_fields = ["name", "version", "updated_at"]
@@ -0,0 +1,260 @@
+import asyncio
+import queue
+import threading
+from collections import deque
+from typing import Any, AsyncIterator
+from scraper.models import ImportRun, Party
+from scraper.utils import (
+    ImportStats,
+    ParliamentApi,
+    VoteImportResult,
+    chunked,
+)
+from django.db import transaction
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_QUEUE_SIZE: int = 8
+
+# A page of records for an entity, or None once all pages have been sent.
+PageMessage = tuple[str, list[dict[str, Any]]] | None
+
+
+class AsyncParliamentApi(ParliamentApi):
+    """
+    API client that fetches the parties and votes at the same time.
+
+    Both entity sets and their page ranges are fetched under one asyncio
+    event loop, which runs in a background thread. A semaphore caps the
+    number of requests in flight at `concurrency`. The requests themselves
+    go through the pooled session of `ParliamentApi` in worker threads, so
+    no async HTTP library is needed.
+
+    Parsed pages are handed to the calling thread through a bounded queue.
+    The calling thread writes them to the database like `ParliamentApi`
+    does, so all database work stays on the caller's connection. All party
+    pages are written before the first vote page.
+
+    Methods:
+        - fetch_pages_async: Asynchronous version of `fetch_pages`.
+        - import_all: Imports the parties and votes.
+    """
+
+    def __init__(
+        self, *args: Any, queue_size: int = DEFAULT_QUEUE_SIZE, **kwargs: Any
+    ) -> None:
+        """
+        Initialize the client.
+
+        Args:
+            queue_size (int): Maximum number of pages waiting to be written.
+            *args, **kwargs: Passed on to `ParliamentApi`.
+        """
+        super().__init__(*args, **kwargs)
+        self.queue_size: int = queue_size
+
+    async def get_page_async(
+        self, semaphore: asyncio.Semaphore, url: str, params: dict[str, str]
+    ) -> dict[str, Any]:
+        """
+        Fetch a single page in a worker thread, once the semaphore allows it.
+        """
+        async with semaphore:
+            return await asyncio.to_thread(self.get_page, url, params)
+
+    async def fetch_pages_async(
+        self,
+        semaphore: asyncio.Semaphore,
+        object_name: str,
+        filters: list[str] | None = None,
+        expand: list[str] | None = None,
+        order_by: str | None = None,
+        top: int | None = None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        Fetch data from the Dutch Parliament OData API, one page at a time.
+
+        Works like `fetch_pages`, but yields control to the event loop while
+        waiting, so several entity sets can be fetched at once. Every entity
+        set keeps at most `concurrency` pages in flight; the semaphore limits
+        the requests over all entity sets together.
+
+        Yields:
+            list[dict[str, Any]]: The records of a single page, in order.
+        """
+        url, params = self.build_request(
+            object_name, filters, expand, order_by, top
+        )
+        payload = await self.get_page_async(semaphore, url, params)
+        first_page: list[dict[str, Any]] = list(payload.get("value", []))
+        next_page = payload.get("@odata.nextLink")
+        total = payload.get("@odata.count")
+        page_size: int = len(first_page)
+
+        if "$count" in params and next_page and total is not None and page_size:
+            page_params = {k: v for k, v in params.items() if k != "$count"}
+            if "$orderby" not in page_params:
+                # The first page came in the server's default order.
+                page_params["$orderby"] = "Id"
+                payload = await self.get_page_async(semaphore, url, page_params)
+                first_page = list(payload.get("value", []))
+            yield first_page
+            in_flight: deque[asyncio.Task[dict[str, Any]]] = deque()
+            try:
+                for skip in range(page_size, int(total), page_size):
+                    in_flight.append(
+                        asyncio.create_task(
+                            self.get_page_async(
+                                semaphore,
+                                url,
+                                {**page_params, "$skip": str(skip)},
+                            )
+                        )
+                    )
+                    if len(in_flight) < self.concurrency:
+                        continue
+                    page = await in_flight.popleft()
+                    yield list(page.get("value", []))
+                while in_flight:
+                    page = await in_flight.popleft()
+                    yield list(page.get("value", []))
+            finally:
+                for task in in_flight:
+                    task.cancel()
+            return
+
+        yield first_page
+        while next_page:
+            payload = await self.get_page_async(semaphore, next_page, {})
+            yield list(payload.get("value", []))
+            next_page = payload.get("@odata.nextLink")
+
+    def import_all(
+        self, bulk: bool = True, full: bool = False
+    ) -> tuple[ImportStats, VoteImportResult]:
+        """
+        Import the active parties and the votes modified since the previous
+        import.
+
+        Has the same effect as `import_parties` followed by `import_votes`,
+        but fetches both entity sets at the same time.
+
+        Args:
+            bulk (bool): See `ParliamentApi.import_votes`.
+            full (bool): See `ParliamentApi.import_votes`.
+
+        Returns:
+            tuple[ImportStats, VoteImportResult]: The party and vote counts.
+
+        Raises:
+            requests.exceptions.RequestException: If an API request fails.
+        """
+        vote_request = self.vote_request(full=full)
+        import_run = ImportRun.objects.create(
+            entity=vote_request["object_name"], full=full
+        )
+
+        pages: queue.Queue[PageMessage] = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        errors: list[BaseException] = []
+
+        def produce() -> None:
+            try:
+                asyncio.run(self._produce(pages, stop, vote_request))
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                self._put(pages, None, stop)
+
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+
+        party_stats = ImportStats()
+        vote_result = VoteImportResult()
+        party_lookup: dict[str, Party] | None = None
+        try:
+            while (message := pages.get()) is not None:
+                entity, records = message
+                if entity == "Fractie":
+                    for chunk in chunked(records, self.batch_size):
+                        with transaction.atomic():
+                            self._bulk_import_parties(chunk, party_stats)
+                    continue
+
+                if party_lookup is None:
+                    # All party pages have been written at this point.
+                    self._fix_party_ids()
+                    party_lookup = {p.api_id: p for p in Party.objects.all()}
+                for chunk in chunked(records, self.batch_size):
+                    self._write_vote_chunk(
+                        chunk, party_lookup, vote_result, import_run, bulk=bulk
+                    )
+        finally:
+            stop.set()
+            producer.join()
+
+        if errors:
+            raise errors[0]
+        if party_lookup is None:
+            self._fix_party_ids()
+        self._finish_vote_import(import_run, vote_result)
+        return party_stats, vote_result
+
+    async def _produce(
+        self,
+        pages: queue.Queue[PageMessage],
+        stop: threading.Event,
+        vote_request: dict[str, Any],
+    ) -> None:
+        """
+        Fetch the party and vote pages and put them on the queue.
+
+        Vote pages are only put on the queue once all party pages are, but
+        the first vote pages are already fetched in the meantime.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        parties_done = asyncio.Event()
+
+        async def put(message: PageMessage) -> bool:
+            return await asyncio.to_thread(self._put, pages, message, stop)
+
+        async def produce_parties() -> None:
+            try:
+                async for page in self.fetch_pages_async(
+                    semaphore, **self.party_request()
+                ):
+                    if not await put(("Fractie", page)):
+                        return
+            finally:
+                parties_done.set()
+
+        async def produce_votes() -> None:
+            async for page in self.fetch_pages_async(semaphore, **vote_request):
+                await parties_done.wait()
+                if not await put((vote_request["object_name"], page)):
+                    return
+
+        await asyncio.gather(produce_parties(), produce_votes())
+
+    @staticmethod
+    def _put(
+        pages: queue.Queue[PageMessage],
+        message: PageMessage,
+        stop: threading.Event,
+    ) -> bool:
+        """
+        Put a message on the queue, unless the consumer has stopped.
+
+        Returns:
+            bool: Whether the message was put on the queue.
+        """
+        while not stop.is_set():
+            try:
+                pages.put(message, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
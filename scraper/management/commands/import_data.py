@@ -1,5 +1,12 @@
+from argparse import ArgumentParser
+from typing import Any
 from django.core.management.base import BaseCommand
-from scraper.utils import ParliamentApi
+from scraper.async_utils import AsyncParliamentApi
+from scraper.utils import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CONCURRENCY,
+    ParliamentApi,
+)
 
 
 class Command(BaseCommand):
@@ -8,10 +15,63 @@ class Command(BaseCommand):
     API.
     """
 
-    def handle(self, *args: list[str], **options: dict[str, str]) -> None:
-        api: ParliamentApi = ParliamentApi()
-        self.stdout.write(self.style.SUCCESS("Importing party data"))
-        api.import_parties()
-        self.stdout.write(self.style.SUCCESS("Importing vote data"))
-        api.import_votes()
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Number of rows prefetched and written per query.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=DEFAULT_CONCURRENCY,
+            help="Maximum number of API pages fetched at the same time.",
+        )
+        parser.add_argument(
+            "--row-by-row",
+            action="store_true",
+            help="Write every row separately instead of in bulk.",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Ignore the previous import watermark and import all votes "
+            "since IMPORT_START_DATE.",
+        )
+        parser.add_argument(
+            "--api-url",
+            help="Base url of the OData API. Defaults to PARLIAMENT_API_URL.",
+        )
+        parser.add_argument(
+            "--parallel",
+            action="store_true",
+            help="Fetch the parties and votes at the same time.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        api_options: dict[str, Any] = {
+            "batch_size": options["batch_size"],
+            "concurrency": options["concurrency"],
+            "api_url": options["api_url"],
+        }
+        bulk: bool = not options["row_by_row"]
+        if options["parallel"]:
+            self.stdout.write(
+                self.style.SUCCESS("Importing party and vote data")
+            )
+            _, result = AsyncParliamentApi(**api_options).import_all(
+                bulk=bulk, full=options["full"]
+            )
+        else:
+            api: ParliamentApi = ParliamentApi(**api_options)
+            self.stdout.write(self.style.SUCCESS("Importing party data"))
+            api.import_parties()
+            self.stdout.write(self.style.SUCCESS("Importing vote data"))
+            result = api.import_votes(bulk=bulk, full=options["full"])
+        for name, stats in (("Items", result.items), ("Votes", result.votes)):
+            self.stdout.write(
+                f"{name}: {stats.inserted} inserted, {stats.updated} updated, "
+                f"{stats.unchanged} unchanged"
+            )
         self.stdout.write(self.style.SUCCESS("Completed import"))
@@ -0,0 +1,134 @@
+import random
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Any
+from django.core.management.base import BaseCommand
+from scraper.odata_standin import (
+    DEFAULT_PAGE_SIZE,
+    ODataStandIn,
+    ODataStandInServer,
+)
+
+
+class Command(BaseCommand):
+    """
+    Management command to serve a local stand-in for the Parliament OData
+    API, to test and measure imports offline.
+
+    Serves a fixture file, or Fractie and Besluit records generated with the
+    test factories (which need the development requirements).
+    """
+
+    help = "Serve a local stand-in for the Parliament OData API."
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8001)
+        parser.add_argument(
+            "--fixture",
+            type=Path,
+            help="JSON file with a list of records per entity, e.g. "
+            '{"Fractie": [...], "Besluit": [...]}. Defaults to synthetic '
+            "records.",
+        )
+        parser.add_argument(
+            "--parties",
+            type=int,
+            default=15,
+            help="Number of synthetic parties.",
+        )
+        parser.add_argument(
+            "--items",
+            type=int,
+            default=1000,
+            help="Number of synthetic Besluit records.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Seed of the synthetic records and injected errors.",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=DEFAULT_PAGE_SIZE,
+            help="Maximum number of records per page.",
+        )
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.0,
+            help="Seconds every request is delayed.",
+        )
+        parser.add_argument(
+            "--error-rate",
+            type=float,
+            default=0.0,
+            help="Fraction of requests answered with --error-status.",
+        )
+        parser.add_argument(
+            "--error-status",
+            type=int,
+            default=503,
+            help="Status code of the injected errors.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        standin_options: dict[str, Any] = {
+            "page_size": options["page_size"],
+            "latency": options["latency"],
+            "error_rate": options["error_rate"],
+            "error_status": options["error_status"],
+            "seed": options["seed"],
+        }
+        if options["fixture"]:
+            standin = ODataStandIn.from_fixture(
+                options["fixture"], **standin_options
+            )
+        else:
+            standin = ODataStandIn(
+                self.synthetic_records(
+                    options["parties"], options["items"], options["seed"]
+                ),
+                **standin_options,
+            )
+
+        server = ODataStandInServer(
+            standin, host=options["host"], port=options["port"]
+        )
+        for entity, records in standin.records.items():
+            self.stdout.write(f"Serving {len(records)} {entity} records")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"OData stand-in running at {server.url}; import from it "
+                f"with manage.py import_data --api-url {server.url}"
+            )
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+    @staticmethod
+    def synthetic_records(
+        parties: int, items: int, seed: int
+    ) -> dict[str, list[dict[str, Any]]]:
+        # The factories are development requirements.
+        import factory.random
+        from scraper.tests.utils.testing_utils import (
+            build_parties,
+            generate_besluit_records,
+            generate_fractie_records,
+        )
+
+        factory.random.reseed_random(seed)  # type: ignore[no-untyped-call]
+        built = build_parties(parties)
+        return {
+            "Fractie": generate_fractie_records(built),
+            "Besluit": generate_besluit_records(
+                built, items, random.Random(seed)
+            ),
+        }
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.7 on 2026-10-18 13:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scraper", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImportRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("entity", models.CharField(max_length=50)),
+                (
+                    "full",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Whether the import ignored the previous watermark.",
+                    ),
+                ),
+                ("started_at", models.DateTimeField(auto_now_add=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "watermark",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="Highest GewijzigdOp seen during the import.",
+                        null=True,
+                    ),
+                ),
+                (
+                    "records",
+                    models.IntegerField(
+                        default=0,
+                        help_text="Number of records fetched from the API.",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Import Run",
+                "verbose_name_plural": "Import Runs",
+            },
+        ),
+    ]
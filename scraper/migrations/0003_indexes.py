@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-18 13:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scraper", "0002_importrun"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="partyvote",
+            name="parliamentary_item",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="scraper.parliamentaryitem",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="partyvote",
+            name="party",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="scraper.party",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="parliamentaryitem",
+            index=models.Index(fields=["-date"], name="scraper_item_date_desc"),
+        ),
+        migrations.AddIndex(
+            model_name="partyvote",
+            index=models.Index(
+                fields=["parliamentary_item", "party", "vote"],
+                name="scraper_vote_item_party_vote",
+            ),
+        ),
+    ]
@@ -51,6 +51,12 @@ class ParliamentaryItem(models.Model):
         default=ParliamentaryItemStatusTypes.PENDING,
     )
 
+    class Meta:
+        indexes = [
+            # Items are listed newest first, see `build_vote_matrix`.
+            models.Index(fields=["-date"], name="scraper_item_date_desc"),
+        ]
+
     def __str__(self) -> str:
         return f"{self.item_type} - {self.title} - {self.status}"
 
@@ -67,16 +73,75 @@ class VoteType(models.TextChoices):
 
 
 class PartyVote(models.Model):
-    party = models.ForeignKey(Party, on_delete=models.CASCADE)
+    # Both foreign keys are indexed by the unique and composite indexes.
+    party = models.ForeignKey(Party, on_delete=models.CASCADE, db_index=False)
     parliamentary_item = models.ForeignKey(
-        ParliamentaryItem, on_delete=models.CASCADE
+        ParliamentaryItem, on_delete=models.CASCADE, db_index=False
     )
     vote = models.CharField(max_length=10, choices=VoteType.choices)
 
     class Meta:
         unique_together = ("party", "parliamentary_item")
+        indexes = [
+            # Covers the vote matrix query, which reads the votes of a set
+            # of items without touching the table.
+            models.Index(
+                fields=["parliamentary_item", "party", "vote"],
+                name="scraper_vote_item_party_vote",
+            ),
+        ]
 
     def __str__(self) -> str:
         return (
             f"{self.party.name} - {self.parliamentary_item.title} - {self.vote}"
         )
+
+
+class ImportRun(models.Model):
+    """
+    Records an import of an OData entity from the Parliament API.
+
+    The watermark is the highest `GewijzigdOp` seen during the import. The
+    next import only requests records modified after it.
+    """
+
+    entity = models.CharField(max_length=50)
+    full = models.BooleanField(
+        default=False,
+        help_text=_("Whether the import ignored the previous watermark."),
+    )
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    watermark = models.DateTimeField(
+        help_text=_("Highest GewijzigdOp seen during the import."),
+        blank=True,
+        null=True,
+    )
+    records = models.IntegerField(
+        default=0, help_text=_("Number of records fetched from the API.")
+    )
+
+    class Meta:
+        verbose_name = "Import Run"
+        verbose_name_plural = "Import Runs"
+
+    def __str__(self) -> str:
+        return f"{self.entity} import at {self.started_at}"
+
+
+class DataVersion(models.Model):
+    """
+    Version number of a kind of data, bumped whenever an import or analysis
+    changes it. See `scraper.versions`.
+    """
+
+    name = models.CharField(max_length=32, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Data Version"
+        verbose_name_plural = "Data Versions"
+
+    def __str__(self) -> str:
+        return f"{self.name} data version {self.version}"
@@ -0,0 +1,411 @@
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Mapping, cast
+from urllib.parse import parse_qs, urlencode, urlparse
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE: int = 250
+DEFAULT_PATH: str = "/OData/v4/2.0/"
+
+COMPARISON = re.compile(r"^(\w+)\s+(eq|ne|gt|ge|lt|le)\s+(.+)$")
+OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "eq": lambda a, b: bool(a == b),
+    "ne": lambda a, b: bool(a != b),
+    "gt": lambda a, b: bool(a > b),
+    "ge": lambda a, b: bool(a >= b),
+    "lt": lambda a, b: bool(a < b),
+    "le": lambda a, b: bool(a <= b),
+}
+SUPPORTED_OPTIONS: frozenset[str] = frozenset(
+    {
+        "$count",
+        "$expand",
+        "$filter",
+        "$format",
+        "$orderby",
+        "$select",
+        "$skip",
+        "$top",
+    }
+)
+
+
+class ODataQueryError(ValueError):
+    """
+    Raised for query options the stand-in does not support.
+    """
+
+
+def split_top_level(value: str, separator: str) -> list[str]:
+    """
+    Split `value` on `separator`, except inside parentheses and quotes.
+    """
+    parts: list[str] = []
+    depth: int = 0
+    quoted: bool = False
+    start: int = 0
+    index: int = 0
+    while index < len(value):
+        char = value[index]
+        if char == "'":
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and value.startswith(separator, index):
+            parts.append(value[start:index])
+            index += len(separator)
+            start = index
+            continue
+        index += 1
+    parts.append(value[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+def parse_literal(value: str) -> Any:
+    """
+    Parse an OData literal: null, a boolean, a quoted string, a number or a
+    date and time.
+
+    Raises:
+        ODataQueryError: If the literal is not supported.
+    """
+    if value == "null":
+        return None
+    if value in ("true", "false"):
+        return value == "true"
+    if len(value) >= 2 and value[0] == value[-1] == "'":
+        return value[1:-1].replace("''", "'")
+    for parse in (int, float, datetime.fromisoformat):
+        try:
+            return parse(value)
+        except ValueError:
+            continue
+    raise ODataQueryError(f"Unsupported literal: {value}")
+
+
+def parse_filter(expression: str) -> Callable[[Mapping[str, Any]], bool]:
+    """
+    Parse a `$filter` of comparisons joined with `and`, such as
+    `GewijzigdOp gt 2025-11-01T00:00:00+01:00 and StemmingsSoort ne null`.
+
+    Missing fields compare as null.
+
+    Raises:
+        ODataQueryError: If the filter is not supported.
+    """
+    comparisons: list[tuple[str, Callable[[Any, Any], bool], Any]] = []
+    for part in split_top_level(expression, " and "):
+        match = COMPARISON.match(part)
+        if match is None:
+            raise ODataQueryError(f"Unsupported filter: {part}")
+        field, operator, literal = match.groups()
+        comparisons.append(
+            (field, OPERATORS[operator], parse_literal(literal.strip()))
+        )
+
+    def matches(record: Mapping[str, Any]) -> bool:
+        for field, compare, expected in comparisons:
+            value = record.get(field)
+            if isinstance(expected, datetime) and value is not None:
+                value = datetime.fromisoformat(str(value))
+            if (value is None or expected is None) and compare not in (
+                OPERATORS["eq"],
+                OPERATORS["ne"],
+            ):
+                return False
+            if not compare(value, expected):
+                return False
+        return True
+
+    return matches
+
+
+def parse_options(options: str) -> dict[str, str]:
+    """
+    Parse the `;` separated query options of an `$expand` item, such as
+    `$filter=Vergissing eq false;$select=Soort,Fractie_Id`.
+    """
+    parsed: dict[str, str] = {}
+    for option in split_top_level(options, ";"):
+        name, _, value = option.partition("=")
+        parsed[name.strip()] = value.strip()
+    return parsed
+
+
+def apply_options(
+    records: list[dict[str, Any]], options: Mapping[str, str]
+) -> list[dict[str, Any]]:
+    """
+    Apply `$filter`, `$orderby`, `$expand` and `$select` to a collection of
+    records. Collections nested in the records are navigation properties;
+    they are only returned when they are expanded.
+    """
+    if options.get("$filter"):
+        matches = parse_filter(options["$filter"])
+        records = [record for record in records if matches(record)]
+
+    for order in reversed(split_top_level(options.get("$orderby", ""), ",")):
+        field, _, direction = order.partition(" ")
+        records = sorted(
+            records,
+            key=lambda record: (record.get(field) is None, record.get(field)),
+            reverse=direction.strip() == "desc",
+        )
+
+    expand: dict[str, dict[str, str]] = {}
+    for item in split_top_level(options.get("$expand", ""), ","):
+        name, _, nested = item.partition("(")
+        expand[name.strip()] = parse_options(nested.removesuffix(")"))
+    select = split_top_level(options.get("$select", ""), ",")
+
+    result: list[dict[str, Any]] = []
+    for record in records:
+        output: dict[str, Any] = {}
+        for key, value in record.items():
+            if isinstance(value, list):
+                if key in expand:
+                    output[key] = apply_options(value, expand[key])
+            elif not select or key in select:
+                output[key] = value
+        result.append(output)
+    return result
+
+
+class ODataStandIn:
+    """
+    Local stand-in for the Dutch Parliament OData API.
+
+    Serves records per entity with the paging of the real API: `$top`,
+    `$skip`, `$count` and `@odata.nextLink`. `$filter` supports comparisons
+    joined with `and`; `$expand` (with nested `$filter` and `$select`),
+    `$select` and `$orderby` are supported as well. Requests with other
+    query options get a 400 response.
+
+    Attributes:
+        records (dict[str, list[dict[str, Any]]]): Records per entity name.
+            Lists in a record are its expandable navigation properties.
+        page_size (int): Maximum number of records per page.
+        latency (float): Seconds every request is delayed.
+        error_rate (float): Fraction of requests answered with
+            `error_status`, to test retries.
+        error_status (int): Status code of the injected errors.
+        requests (int): Number of requests served, including errors.
+        errors (int): Number of injected errors.
+    """
+
+    def __init__(
+        self,
+        records: Mapping[str, list[dict[str, Any]]],
+        page_size: int = DEFAULT_PAGE_SIZE,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int | None = None,
+    ) -> None:
+        self.records: dict[str, list[dict[str, Any]]] = dict(records)
+        self.page_size: int = page_size
+        self.latency: float = latency
+        self.error_rate: float = error_rate
+        self.error_status: int = error_status
+        self.requests: int = 0
+        self.errors: int = 0
+        self._random: random.Random = random.Random(seed)
+        self._lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def from_fixture(cls, path: Path, **kwargs: Any) -> "ODataStandIn":
+        """
+        Load the records from a JSON file with a list of records per entity
+        name, e.g. {"Fractie": [...], "Besluit": [...]}.
+        """
+        return cls(json.loads(path.read_text()), **kwargs)
+
+    def page(
+        self, url: str, params: Mapping[str, str]
+    ) -> tuple[int, dict[str, Any]]:
+        """
+        Return the status code and payload for a page request.
+
+        Args:
+            url (str): The request url, without the query string.
+            params (Mapping[str, str]): The query parameters.
+
+        Returns:
+            tuple[int, dict[str, Any]]: The status code and JSON payload.
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.requests += 1
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        if failed:
+            return self.error_status, self.error("Injected error")
+
+        entity = url.rstrip("/").rsplit("/", 1)[-1]
+        records = self.records.get(entity)
+        if records is None:
+            return 404, self.error(f"Unknown entity {entity}")
+        unsupported = set(params) - SUPPORTED_OPTIONS
+        if unsupported:
+            return 400, self.error(
+                f"Unsupported query options: {', '.join(sorted(unsupported))}"
+            )
+        try:
+            records = apply_options(records, params)
+            skip = int(params.get("$skip", 0))
+            top = int(params["$top"]) if params.get("$top") else None
+        except ValueError as e:
+            return 400, self.error(str(e))
+
+        window = records[skip : None if top is None else skip + top]
+        payload: dict[str, Any] = {"value": window[: self.page_size]}
+        if params.get("$count") == "true":
+            payload["@odata.count"] = len(records)
+        if len(window) > self.page_size:
+            next_params = {**params, "$skip": str(skip + self.page_size)}
+            next_params.pop("$count", None)
+            if top is not None:
+                next_params["$top"] = str(top - self.page_size)
+            payload["@odata.nextLink"] = f"{url}?{urlencode(next_params)}"
+        return 200, payload
+
+    @staticmethod
+    def error(message: str) -> dict[str, Any]:
+        return {"error": {"message": message}}
+
+
+def parse_query(query: str) -> dict[str, str]:
+    """
+    Parse a query string into its last value per parameter.
+    """
+    return {key: values[-1] for key, values in parse_qs(query).items()}
+
+
+class ODataStandInAdapter(BaseAdapter):
+    """
+    Transport adapter that answers the requests of a `requests.Session`
+    from an `ODataStandIn`, without opening a connection.
+
+    Mount it on the API url of a `ParliamentApi` session:
+
+        api.session.mount(api.api_url, ODataStandInAdapter(standin))
+    """
+
+    def __init__(self, standin: ODataStandIn) -> None:
+        super().__init__()
+        self.standin: ODataStandIn = standin
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: float | tuple[float, float] | tuple[float, None] | None = None,
+        verify: bool | str = True,
+        cert: Any = None,
+        proxies: Mapping[str, str] | None = None,
+    ) -> requests.Response:
+        parsed = urlparse(str(request.url))
+        url = parsed._replace(query="").geturl()
+        status_code, payload = self.standin.page(url, parse_query(parsed.query))
+
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = json.dumps(payload).encode()
+        response.headers = CaseInsensitiveDict(
+            {"Content-Type": "application/json"}
+        )
+        response.encoding = "utf-8"
+        response.url = str(request.url)
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+class ODataStandInHandler(BaseHTTPRequestHandler):
+    """
+    Answers GET requests of an `ODataStandInServer` from its stand-in.
+    """
+
+    server: "ODataStandInServer"
+
+    def do_GET(self) -> None:
+        parsed = urlparse(self.path)
+        url = f"http://{self.headers['Host']}{parsed.path}"
+        status_code, payload = self.server.standin.page(
+            url, parse_query(parsed.query)
+        )
+        body = json.dumps(payload).encode()
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(format % args)
+
+
+class ODataStandInServer(ThreadingHTTPServer):
+    """
+    HTTP server for an `ODataStandIn`, so that any client, including
+    `ParliamentApi` with `PARLIAMENT_API_URL` pointing at `url`, can import
+    from it. Requests are handled in threads, like concurrent page requests
+    to the real API.
+
+    Use it as a context manager to serve in a background thread:
+
+        with ODataStandInServer(standin) as server:
+            ParliamentApi(api_url=server.url).import_votes()
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        standin: ODataStandIn,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        path: str = DEFAULT_PATH,
+    ) -> None:
+        super().__init__((host, port), ODataStandInHandler)
+        self.standin: ODataStandIn = standin
+        self.path: str = path
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """
+        The API url, ending in a slash. Port 0 is replaced by the port the
+        server listens on.
+        """
+        host, port = cast(tuple[str, int], self.server_address[:2])
+        return f"http://{host}:{port}{self.path}"
+
+    def __enter__(self) -> "ODataStandInServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
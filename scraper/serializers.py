@@ -1,6 +1,6 @@
 from rest_framework import serializers
-from typing import Any
-from analyzer.models import PCAAnalysis
+from typing import Any, Iterable
+from analyzer.cache import query_latest_analysis_id
 from scraper.models import Party, PartyVote, ParliamentaryItem
 
 
@@ -15,11 +15,13 @@ class PartySerializer(serializers.ModelSerializer[Party]):
         # Avoid circular import.
         from analyzer.serializers import PCAComponentPartyScoreSerializer
 
-        # Get last PCA analysis scores for this party
-        last_analysis = PCAAnalysis.objects.order_by("-created_at").first()
-        if last_analysis is None:
-            return []
-        scores = obj.pca_scores.filter(analysis=last_analysis)
+        # Scores of the last PCA analysis, prefetched by `PartyViewSet`.
+        scores = getattr(obj, "latest_pca_scores", None)
+        if scores is None:
+            analysis_id = query_latest_analysis_id()
+            if analysis_id is None:
+                return []
+            scores = obj.pca_scores.filter(analysis_id=analysis_id)
         return PCAComponentPartyScoreSerializer(scores, many=True).data
 
 
@@ -62,7 +64,22 @@ class KeyParliamentaryItemSerializer(
 
     def get_loadings(self, obj: ParliamentaryItem) -> Any:
         # Avoid circular import.
+        from analyzer.models import PCAItemLoading
         from analyzer.serializers import PCAItemLoadingSerializer
 
-        loadings = obj.pca_loadings.all()
+        matrix = self.context.get("loading_matrix")
+        loadings: Iterable[PCAItemLoading]
+        if matrix is None:
+            loadings = obj.pca_loadings.all()
+        else:
+            # Loadings stored as a matrix have no rows, and thus no ID.
+            loadings = [
+                PCAItemLoading(
+                    analysis_id=self.context["analysis_id"],
+                    parliamentary_item=obj,
+                    component=component,
+                    loading=loading,
+                )
+                for component, loading in matrix.item(obj.id).items()
+            ]
         return PCAItemLoadingSerializer(loadings, many=True).data
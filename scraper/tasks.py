@@ -1,6 +1,8 @@
+from dataclasses import asdict
 from celery import shared_task
 from scraper.utils import ParliamentApi
 from analyzer.analysis import run_full_analysis
+from analyzer.retention import prune_analyses
 
 
 @shared_task
@@ -13,3 +15,9 @@ def import_votes() -> None:
 @shared_task
 def run_scheduled_pca_analysis() -> None:
     run_full_analysis(n_components=3)
+
+
+@shared_task
+def prune_pca_analyses() -> dict[str, int]:
+    stats = prune_analyses()
+    return {**asdict(stats), "total": stats.total}
@@ -0,0 +1,34 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from scraper.models import Party
+from scraper.tests.utils.testing_utils import generate_parties
+from scraper.versions import ANALYSIS_DATA, IMPORT_DATA, get_data_versions
+
+
+class TestVersionedDataAdmin(TestCase):
+    def setUp(self) -> None:
+        self.party: Party = generate_parties(1)[0]
+        self.client.force_login(
+            User.objects.create_superuser("admin", "admin@example.com", "pw")
+        )
+
+    def versions(self) -> dict[str, int]:
+        return get_data_versions([IMPORT_DATA, ANALYSIS_DATA])[0]
+
+    def test_change_bumps_import_version(self) -> None:
+        url = reverse("admin:scraper_party_change", args=[self.party.id])
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                url, {"name": "Renamed", "abbreviation": "RN"}
+            )
+        self.assertEqual(302, response.status_code)
+        self.assertEqual(1, self.versions()[IMPORT_DATA])
+
+    def test_delete_bumps_import_and_analysis_versions(self) -> None:
+        url = reverse("admin:scraper_party_delete", args=[self.party.id])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(url, {"post": "yes"})
+        self.assertFalse(Party.objects.exists())
+        # The deletion cascades into the analysis data.
+        self.assertEqual({IMPORT_DATA: 1, ANALYSIS_DATA: 1}, self.versions())
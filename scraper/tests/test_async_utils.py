@@ -0,0 +1,86 @@
+import asyncio
+from typing import Any
+from unittest import mock
+import requests
+from django.test import TestCase
+from scraper.async_utils import AsyncParliamentApi
+from scraper.models import ImportRun, Party, PartyVote, ParliamentaryItem
+from scraper.tests.fixtures.utils_fixtures import (
+    PARTY_API_RESPONSE,
+    BESLUIT_API_RESPONSE,
+)
+from scraper.tests.test_utils import MockedResponse
+
+
+def routed_response(
+    url: str, params: dict[str, str], **kwargs: Any
+) -> MockedResponse:
+    if url.endswith("Fractie"):
+        return MockedResponse({"value": PARTY_API_RESPONSE}, 200)
+    return MockedResponse({"value": BESLUIT_API_RESPONSE}, 200)
+
+
+class TestAsyncParliamentApi(TestCase):
+    @mock.patch("scraper.utils.requests.Session.get")
+    def test_import_all(self, mocked_get: mock.Mock) -> None:
+        mocked_get.side_effect = routed_response
+        api = AsyncParliamentApi(batch_size=2, queue_size=1)
+
+        party_stats, vote_result = api.import_all()
+        self.assertEqual(3, party_stats.inserted)
+        self.assertEqual(3, Party.objects.count())
+        self.assertEqual(4, vote_result.items.inserted)
+        self.assertEqual(4, ParliamentaryItem.objects.count())
+        # Votes for the imported parties are only kept when the parties
+        # were written first.
+        self.assertEqual(12, vote_result.votes.inserted)
+        self.assertEqual(12, PartyVote.objects.count())
+        import_run = ImportRun.objects.get()
+        self.assertIsNotNone(import_run.finished_at)
+        self.assertEqual(len(BESLUIT_API_RESPONSE), import_run.records)
+
+    @mock.patch("scraper.utils.requests.Session.get")
+    def test_fetch_pages_async_keeps_page_order(
+        self, mocked_get: mock.Mock
+    ) -> None:
+        def paged(
+            url: str, params: dict[str, str], **kwargs: Any
+        ) -> MockedResponse:
+            skip = int(params.get("$skip", 0))
+            payload: dict[str, Any] = {
+                "value": [{"Id": r} for r in range(skip, min(skip + 3, 10))],
+                "@odata.nextLink": f"{url}?$skip={skip + 3}",
+                "@odata.count": 10,
+            }
+            return MockedResponse(payload, 200)
+
+        mocked_get.side_effect = paged
+        api = AsyncParliamentApi(concurrency=2)
+
+        async def collect() -> list[int]:
+            semaphore = asyncio.Semaphore(api.concurrency)
+            ids: list[int] = []
+            async for page in api.fetch_pages_async(semaphore, "Besluit"):
+                ids.extend(record["Id"] for record in page)
+            return ids
+
+        self.assertListEqual(list(range(10)), asyncio.run(collect()))
+
+    @mock.patch("scraper.utils.time.sleep")
+    @mock.patch("scraper.utils.requests.Session.get")
+    def test_fetch_error_is_raised(
+        self, mocked_get: mock.Mock, mocked_sleep: mock.Mock
+    ) -> None:
+        def failing(
+            url: str, params: dict[str, str], **kwargs: Any
+        ) -> MockedResponse:
+            if url.endswith("Besluit"):
+                raise requests.ConnectionError()
+            return routed_response(url, params)
+
+        mocked_get.side_effect = failing
+        api = AsyncParliamentApi(max_retries=0)
+
+        with self.assertRaises(requests.ConnectionError):
+            api.import_all()
+        self.assertIsNone(ImportRun.objects.get().finished_at)
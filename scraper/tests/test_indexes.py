@@ -0,0 +1,39 @@
+from django.test import TestCase
+from scraper.models import ParliamentaryItem, PartyVote
+from scraper.tests.utils.testing_utils import explain
+
+
+class TestIndexes(TestCase):
+    """
+    The hot queries use the composite indexes, on SQLite and PostgreSQL.
+    """
+
+    def test_items_by_date(self) -> None:
+        plan = explain(
+            ParliamentaryItem.objects.order_by("-date").values_list(
+                "id", flat=True
+            )
+        )
+        self.assertIn("scraper_item_date_desc", plan)
+
+    def test_votes_by_item(self) -> None:
+        # Only the covering index leads with the item.
+        plan = explain(
+            PartyVote.objects.filter(parliamentary_item_id=1).values_list(
+                "party_id", "vote"
+            )
+        )
+        self.assertIn("scraper_vote_item_party_vote", plan)
+
+    def test_votes_by_party(self) -> None:
+        plan = explain(PartyVote.objects.filter(party_id=2))
+        self.assertIn("scraper_partyvote_party_id_parliamentary_item_id", plan)
+
+    def test_vote_matrix_is_covered(self) -> None:
+        items = ParliamentaryItem.objects.order_by("-date").values("id")
+        plan = explain(
+            PartyVote.objects.filter(
+                party_id__in=[1, 2], parliamentary_item__in=items
+            ).values_list("parliamentary_item_id", "party_id", "vote")
+        )
+        self.assertIn("scraper_vote_item_party_vote", plan)
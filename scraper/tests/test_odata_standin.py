@@ -0,0 +1,148 @@
+import random
+from typing import Any
+from django.test import TestCase, override_settings
+from scraper.models import Party, PartyVote, ParliamentaryItem
+from scraper.odata_standin import (
+    ODataStandIn,
+    ODataStandInAdapter,
+    ODataStandInServer,
+    apply_options,
+)
+from scraper.tests.utils.testing_utils import (
+    build_parties,
+    generate_besluit_records,
+    generate_fractie_records,
+)
+from scraper.utils import ParliamentApi
+
+
+class TestODataStandIn(TestCase):
+    def setUp(self) -> None:
+        self.records = [{"Id": str(number)} for number in range(23)]
+        self.standin = ODataStandIn({"Besluit": self.records}, page_size=5)
+
+    def api(self, concurrency: int, **kwargs: Any) -> ParliamentApi:
+        api = ParliamentApi(concurrency=concurrency, **kwargs)
+        api.session.mount(api.api_url, ODataStandInAdapter(self.standin))
+        return api
+
+    def test_serial_fetch_follows_next_link(self) -> None:
+        records = self.api(concurrency=1).fetch(object_name="Besluit")
+        self.assertListEqual(self.records, records)
+        self.assertEqual(5, self.standin.requests)
+
+    def test_concurrent_fetch_pages_with_skip(self) -> None:
+        records = self.api(concurrency=3).fetch(object_name="Besluit")
+        self.assertListEqual(
+            sorted(self.records, key=lambda record: record["Id"]), records
+        )
+        # The first page is requested again, ordered by Id.
+        self.assertEqual(6, self.standin.requests)
+
+    def test_top_limits_records_over_pages(self) -> None:
+        records = self.api(concurrency=1).fetch(object_name="Besluit", top=7)
+        self.assertListEqual(self.records[:7], records)
+        self.assertEqual(2, self.standin.requests)
+
+    def test_unknown_entity_is_not_found(self) -> None:
+        status_code, _ = self.standin.page("http://standin/Zaak", {})
+        self.assertEqual(404, status_code)
+
+    def test_unsupported_query_is_bad_request(self) -> None:
+        for params in ({"$filter": "Id in ('1')"}, {"$search": "motie"}):
+            status_code, _ = self.standin.page("http://standin/Besluit", params)
+            self.assertEqual(400, status_code)
+
+    def test_injected_errors_are_retried(self) -> None:
+        self.standin.error_rate = 0.5
+        self.standin._random = random.Random(1)
+        api = self.api(concurrency=1, max_retries=10, backoff=0)
+
+        records = api.fetch(object_name="Besluit")
+        self.assertListEqual(self.records, records)
+        self.assertGreater(self.standin.errors, 0)
+        self.assertEqual(5 + self.standin.errors, self.standin.requests)
+
+
+class TestApplyOptions(TestCase):
+    def setUp(self) -> None:
+        self.records: list[dict[str, Any]] = [
+            {
+                "Id": "a",
+                "GewijzigdOp": "2025-12-16T16:19:59.787+01:00",
+                "StemmingsSoort": None,
+                "Zaak": [{"Id": "z1", "Soort": "Motie"}],
+                "Stemming": [
+                    {"Soort": "Voor", "Fractie_Id": "p1", "Vergissing": False},
+                    {"Soort": "Tegen", "Fractie_Id": "p2", "Vergissing": True},
+                ],
+            },
+            {
+                "Id": "b",
+                "GewijzigdOp": "2025-10-01T12:00:00+02:00",
+                "StemmingsSoort": "Met handopsteken",
+                "Zaak": [{"Id": "z2", "Soort": "Wetgeving"}],
+                "Stemming": [],
+            },
+        ]
+
+    def test_filter(self) -> None:
+        after = apply_options(
+            self.records,
+            {"$filter": "GewijzigdOp gt 2025-11-01T00:00:00+01:00"},
+        )
+        self.assertListEqual(["a"], [record["Id"] for record in after])
+        voted = apply_options(
+            self.records, {"$filter": "StemmingsSoort ne null and Id eq 'b'"}
+        )
+        self.assertListEqual(["b"], [record["Id"] for record in voted])
+
+    def test_navigation_properties_are_only_returned_when_expanded(
+        self,
+    ) -> None:
+        records = apply_options(self.records, {"$expand": "Zaak"})
+        self.assertIn("Zaak", records[0])
+        self.assertNotIn("Stemming", records[0])
+
+    def test_expand_with_nested_options(self) -> None:
+        records = apply_options(
+            self.records,
+            {
+                "$expand": "Zaak($filter=Soort eq 'Motie'),"
+                "Stemming($filter=Vergissing eq false;$select=Soort,Fractie_Id)",
+                "$orderby": "Id desc",
+            },
+        )
+        self.assertListEqual(
+            [[], []], [records[0]["Zaak"], records[0]["Stemming"]]
+        )
+        self.assertListEqual(
+            [{"Soort": "Voor", "Fractie_Id": "p1"}], records[1]["Stemming"]
+        )
+
+
+class TestODataStandInServer(TestCase):
+    def test_import_from_server(self) -> None:
+        parties = build_parties(5)
+        standin = ODataStandIn(
+            {
+                "Fractie": generate_fractie_records(parties),
+                "Besluit": generate_besluit_records(parties, 30),
+            },
+            page_size=10,
+        )
+        with ODataStandInServer(standin) as server:
+            api = ParliamentApi(api_url=server.url)
+            api.import_parties()
+            result = api.import_votes()
+
+        self.assertEqual(5, Party.objects.count())
+        self.assertEqual(30, result.items.inserted)
+        self.assertEqual(30, ParliamentaryItem.objects.count())
+        self.assertEqual(30 * 5, PartyVote.objects.count())
+
+    @override_settings(PARLIAMENT_API_URL="http://127.0.0.1:8001/OData")
+    def test_api_url_defaults_to_setting(self) -> None:
+        self.assertEqual(
+            "http://127.0.0.1:8001/OData/", ParliamentApi().api_url
+        )
@@ -1,7 +1,17 @@
-from typing import Any
+from datetime import datetime, timedelta
+from typing import Any, Callable
+from urllib.parse import parse_qs, urlparse
+import requests
 from django.test import TestCase
 from scraper.utils import ParliamentApi
-from scraper.models import Party, PartyVote, ParliamentaryItem
+from scraper.versions import IMPORT_DATA, get_data_versions
+from scraper.models import (
+    ImportRun,
+    Party,
+    PartyVote,
+    ParliamentaryItem,
+    VoteType,
+)
 from unittest import mock
 from scraper.tests.fixtures.utils_fixtures import (
     PARTY_API_RESPONSE,
@@ -25,7 +35,7 @@ class TestParliamentApi(TestCase):
     def setUp(self) -> None:
         self.api = ParliamentApi()
 
-    @mock.patch("scraper.utils.requests.get")
+    @mock.patch("scraper.utils.requests.Session.get")
     def test_party_import(self, mocked_get: mock.Mock) -> None:
         mocked_get.return_value = MockedResponse(
             {"value": PARTY_API_RESPONSE}, 200
@@ -38,7 +48,7 @@ class TestParliamentApi(TestCase):
         self.assertEqual(PARTY_API_RESPONSE[2]["NaamNL"], pvdd.name)
         self.api.import_votes()
 
-    @mock.patch("scraper.utils.requests.get")
+    @mock.patch("scraper.utils.requests.Session.get")
     def test_import_votes(self, mocked_get: mock.Mock) -> None:
         mocked_get.side_effect = [
             MockedResponse({"value": PARTY_API_RESPONSE}, 200),
@@ -48,3 +58,339 @@ class TestParliamentApi(TestCase):
         self.api.import_votes()
         self.assertEqual(4, ParliamentaryItem.objects.count())
         self.assertEqual(12, PartyVote.objects.count())
+
+    @mock.patch("scraper.utils.requests.Session.get")
+    def test_bulk_import_votes_reports_counts(
+        self, mocked_get: mock.Mock
+    ) -> None:
+        mocked_get.side_effect = [
+            MockedResponse({"value": PARTY_API_RESPONSE}, 200),
+            MockedResponse({"value": BESLUIT_API_RESPONSE}, 200),
+            MockedResponse({"value": BESLUIT_API_RESPONSE}, 200),
+        ]
+        self.api.import_parties()
+        result = self.api.import_votes()
+        self.assertEqual(4, result.items.inserted)
+        self.assertEqual(12, result.votes.inserted)
+
+        # Change a vote, a second import only rewrites that row.
+        vote = PartyVote.objects.first()
+        assert vote is not None
+        original = vote.vote
+        vote.vote = (
+            VoteType.FOR if original != VoteType.FOR else VoteType.AGAINST
+        )
+        vote.save()
+        result = self.api.import_votes()
+        self.assertEqual(0, result.items.inserted + result.items.updated)
+        self.assertEqual(4, result.items.unchanged)
+        self.assertEqual(0, result.votes.inserted)
+        self.assertEqual(1, result.votes.updated)
+        self.assertEqual(11, result.votes.unchanged)
+        vote.refresh_from_db()
+        self.assertEqual(original, vote.vote)
+        self.assertEqual(12, PartyVote.objects.count())
+
+    @mock.patch("scraper.utils.requests.Session.get")
+    def test_import_bumps_data_version_on_changes(
+        self, mocked_get: mock.Mock
+    ) -> None:
+        mocked_get.side_effect = [
+            MockedResponse({"value": PARTY_API_RESPONSE}, 200),
+            MockedResponse({"value": BESLUIT_API_RESPONSE}, 200),
+            MockedResponse({"value": BESLUIT_API_RESPONSE}, 200),
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.api.import_parties()
+            self.api.import_votes()
+        versions, _ = get_data_versions([IMPORT_DATA])
+        self.assertEqual(2, versions[IMPORT_DATA])
+
+        # An import without changes keeps the version.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.api.import_votes()
+        self.assertEqual(versions, get_data_versions([IMPORT_DATA])[0])
+
+    @mock.patch("scraper.utils.requests.Session.get")
+    def test_bulk_import_matches_row_import(
+        self, mocked_get: mock.Mock
+    ) -> None:
+        mocked_get.side_effect = [
+            MockedResponse({"value": PARTY_API_RESPONSE}, 200),
+            MockedResponse({"value": BESLUIT_API_RESPONSE}, 200),
+        ]
+        self.api.import_parties()
+        self.api.import_votes(bulk=False)
+        row_votes = set(
+            PartyVote.objects.values_list(
+                "parliamentary_item__api_id", "party__api_id", "vote"
+            )
+        )
+        row_items = set(
+            ParliamentaryItem.objects.values_list(
+                "api_id", "title", "date", "status"
+            )
+        )
+        PartyVote.objects.all().delete()
+        ParliamentaryItem.objects.all().delete()
+
+        mocked_get.side_effect = [
+            MockedResponse({"value": BESLUIT_API_RESPONSE}, 200),
+        ]
+        ParliamentApi(batch_size=2).import_votes(bulk=True)
+        bulk_votes = set(
+            PartyVote.objects.values_list(
+                "parliamentary_item__api_id", "party__api_id", "vote"
+            )
+        )
+        bulk_items = set(
+            ParliamentaryItem.objects.values_list(
+                "api_id", "title", "date", "status"
+            )
+        )
+        self.assertSetEqual(row_votes, bulk_votes)
+        self.assertSetEqual(row_items, bulk_items)
+
+
+class TestImportWatermark(TestCase):
+    def setUp(self) -> None:
+        self.api = ParliamentApi()
+
+    def requested_filter(self, mocked_get: mock.Mock) -> str:
+        return str(mocked_get.call_args.kwargs["params"]["$filter"])
+
+    @mock.patch("scraper.utils.requests.Session.get")
+    def test_first_import_starts_at_import_start_date(
+        self, mocked_get: mock.Mock
+    ) -> None:
+        mocked_get.return_value = MockedResponse(
+            {"value": BESLUIT_API_RESPONSE}, 200
+        )
+        self.api.import_votes()
+        self.assertIn(
+            "GewijzigdOp gt 2025-11-01T00:00:00+01:00",
+            self.requested_filter(mocked_get),
+        )
+
+        import_run = ImportRun.objects.get()
+        self.assertEqual("Besluit", import_run.entity)
+        self.assertEqual(len(BESLUIT_API_RESPONSE), import_run.records)
+        self.assertIsNotNone(import_run.finished_at)
+        self.assertEqual(
+            datetime.fromisoformat("2025-12-17T13:18:36.047+01:00"),
+            import_run.watermark,
+        )
+
+    @mock.patch("scraper.utils.requests.Session.get")
+    def test_next_import_starts_at_watermark_minus_overlap(
+        self, mocked_get: mock.Mock
+    ) -> None:
+        mocked_get.return_value = MockedResponse(
+            {"value": BESLUIT_API_RESPONSE}, 200
+        )
+        self.api.import_votes()
+        mocked_get.return_value = MockedResponse({"value": []}, 200)
+        with self.settings(IMPORT_WATERMARK_OVERLAP=timedelta(hours=1)):
+            self.api.import_votes()
+        self.assertIn(
+            "GewijzigdOp gt 2025-12-17T11:18:36+00:00",
+            self.requested_filter(mocked_get),
+        )
+
+        # An empty import keeps the previous watermark in effect.
+        with self.settings(IMPORT_WATERMARK_OVERLAP=timedelta(hours=1)):
+            self.api.import_votes()
+        self.assertIn(
+            "GewijzigdOp gt 2025-12-17T11:18:36+00:00",
+            self.requested_filter(mocked_get),
+        )
+
+    @mock.patch("scraper.utils.requests.Session.get")
+    def test_full_import_ignores_watermark(self, mocked_get: mock.Mock) -> None:
+        mocked_get.return_value = MockedResponse(
+            {"value": BESLUIT_API_RESPONSE}, 200
+        )
+        self.api.import_votes()
+        self.api.import_votes(full=True)
+        self.assertIn(
+            "GewijzigdOp gt 2025-11-01T00:00:00+01:00",
+            self.requested_filter(mocked_get),
+        )
+        self.assertTrue(ImportRun.objects.filter(full=True).exists())
+
+
+class TestFetch(TestCase):
+    def paged_response(
+        self, records: list[int], page_size: int
+    ) -> Callable[..., MockedResponse]:
+        def get(
+            url: str, params: dict[str, str], **kwargs: Any
+        ) -> MockedResponse:
+            # The next link carries $skip in the url instead of the params.
+            query = parse_qs(urlparse(url).query)
+            skip = int(params.get("$skip", query.get("$skip", [0])[0]))
+            payload: dict[str, Any] = {
+                "value": [{"Id": r} for r in records[skip : skip + page_size]]
+            }
+            if skip + page_size < len(records):
+                base_url = url.split("?")[0]
+                payload["@odata.nextLink"] = (
+                    f"{base_url}?$skip={skip + page_size}"
+                )
+            if params.get("$count") == "true":
+                payload["@odata.count"] = len(records)
+            return MockedResponse(payload, 200)
+
+        return get
+
+    @mock.patch("scraper.utils.requests.Session.get")
+    def test_concurrent_fetch_keeps_page_order(
+        self, mocked_get: mock.Mock
+    ) -> None:
+        records = list(range(23))
+        mocked_get.side_effect = self.paged_response(records, page_size=5)
+        api = ParliamentApi(concurrency=3)
+
+        items = api.fetch(object_name="Besluit")
+        self.assertListEqual(records, [item["Id"] for item in items])
+        # A count request in the server's order, the first page again
+        # ordered by Id and four pages requested with $skip.
+        self.assertEqual(6, mocked_get.call_count)
+        calls = [call.kwargs["params"] for call in mocked_get.call_args_list]
+        self.assertNotIn("$orderby", calls[0])
+        self.assertTrue(all(params["$orderby"] == "Id" for params in calls[1:]))
+        skips = sorted(int(params["$skip"]) for params in calls[2:])
+        self.assertListEqual([5, 10, 15, 20], skips)
+
+    @mock.patch("scraper.utils.requests.Session.get")
+    def test_concurrent_fetch_keeps_given_order(
+        self, mocked_get: mock.Mock
+    ) -> None:
+        mocked_get.side_effect = self.paged_response(list(range(12)), 5)
+        api = ParliamentApi(concurrency=3)
+
+        api.fetch(object_name="Besluit", order_by="GewijzigdOp")
+        # No extra request for the first page.
+        self.assertEqual(3, mocked_get.call_count)
+        for call in mocked_get.call_args_list:
+            self.assertEqual("GewijzigdOp", call.kwargs["params"]["$orderby"])
+
+    @mock.patch("scraper.utils.requests.Session.get")
+    def test_single_page_keeps_server_order(
+        self, mocked_get: mock.Mock
+    ) -> None:
+        mocked_get.side_effect = self.paged_response(list(range(4)), 5)
+        api = ParliamentApi(concurrency=3)
+
+        self.assertEqual(4, len(api.fetch(object_name="Besluit")))
+        self.assertEqual(1, mocked_get.call_count)
+        self.assertNotIn(
+            "$orderby", mocked_get.call_args_list[0].kwargs["params"]
+        )
+
+    @mock.patch("scraper.utils.requests.Session.get")
+    def test_serial_fetch_follows_next_link(
+        self, mocked_get: mock.Mock
+    ) -> None:
+        records = list(range(12))
+        mocked_get.side_effect = self.paged_response(records, page_size=5)
+        api = ParliamentApi(concurrency=1)
+
+        items = api.fetch(object_name="Besluit")
+        self.assertListEqual(records, [item["Id"] for item in items])
+        self.assertEqual(3, mocked_get.call_count)
+        self.assertNotIn(
+            "$count", mocked_get.call_args_list[0].kwargs["params"]
+        )
+
+    @mock.patch("scraper.utils.time.sleep")
+    @mock.patch("scraper.utils.requests.Session.get")
+    def test_failed_page_is_retried_with_backoff(
+        self, mocked_get: mock.Mock, mocked_sleep: mock.Mock
+    ) -> None:
+        mocked_get.side_effect = [
+            MockedResponse({}, 503),
+            requests.ConnectionError(),
+            MockedResponse({"value": PARTY_API_RESPONSE}, 200),
+        ]
+        api = ParliamentApi(max_retries=2, backoff=0.5)
+
+        items = api.fetch(object_name="Fractie")
+        self.assertEqual(len(PARTY_API_RESPONSE), len(items))
+        self.assertListEqual(
+            [mock.call(0.5), mock.call(1.0)], mocked_sleep.call_args_list
+        )
+
+    @mock.patch("scraper.utils.time.sleep")
+    @mock.patch("scraper.utils.requests.Session.get")
+    def test_retries_are_limited(
+        self, mocked_get: mock.Mock, mocked_sleep: mock.Mock
+    ) -> None:
+        mocked_get.side_effect = requests.ConnectionError()
+        api = ParliamentApi(max_retries=2)
+
+        with self.assertRaises(requests.ConnectionError):
+            api.fetch(object_name="Fractie")
+        self.assertEqual(3, mocked_get.call_count)
+
+    @mock.patch("scraper.utils.requests.Session.get")
+    def test_fetch_iter_requests_pages_lazily(
+        self, mocked_get: mock.Mock
+    ) -> None:
+        records = list(range(12))
+        mocked_get.side_effect = self.paged_response(records, page_size=5)
+        api = ParliamentApi(concurrency=1)
+
+        iterator = api.fetch_iter(object_name="Besluit")
+        self.assertEqual(0, mocked_get.call_count)
+        self.assertEqual(0, next(iterator)["Id"])
+        self.assertEqual(1, mocked_get.call_count)
+        self.assertListEqual(records[1:], [item["Id"] for item in iterator])
+        self.assertEqual(3, mocked_get.call_count)
+
+
+class TestChunkedImport(TestCase):
+    @mock.patch("scraper.utils.requests.Session.get")
+    def test_import_votes_writes_in_chunks(self, mocked_get: mock.Mock) -> None:
+        mocked_get.side_effect = [
+            MockedResponse({"value": PARTY_API_RESPONSE}, 200),
+            MockedResponse({"value": BESLUIT_API_RESPONSE}, 200),
+        ]
+        api = ParliamentApi(batch_size=2)
+        api.import_parties()
+        with mock.patch.object(
+            ParliamentApi,
+            "_bulk_import_votes",
+            autospec=True,
+            side_effect=ParliamentApi._bulk_import_votes,
+        ) as mocked_import:
+            result = api.import_votes()
+
+        chunk_sizes = [
+            len(call.args[1]) for call in mocked_import.call_args_list
+        ]
+        self.assertListEqual([2, 2, 1], chunk_sizes)
+        self.assertEqual(4, result.items.inserted)
+        self.assertEqual(12, result.votes.inserted)
+        self.assertEqual(
+            len(BESLUIT_API_RESPONSE), ImportRun.objects.get().records
+        )
+
+    @mock.patch("scraper.utils.requests.Session.get")
+    def test_party_with_used_abbreviation_is_skipped(
+        self, mocked_get: mock.Mock
+    ) -> None:
+        taken = PARTY_API_RESPONSE[0]
+        Party.objects.create(
+            api_id="another-id",
+            name="Another name",
+            abbreviation=str(taken["Afkorting"]),
+        )
+        mocked_get.return_value = MockedResponse(
+            {"value": PARTY_API_RESPONSE}, 200
+        )
+        with self.assertLogs("scraper.utils", level="WARNING"):
+            stats = ParliamentApi().import_parties()
+
+        self.assertEqual(len(PARTY_API_RESPONSE) - 1, stats.inserted)
+        self.assertFalse(Party.objects.filter(api_id=taken["Id"]).exists())
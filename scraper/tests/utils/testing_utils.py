@@ -1,4 +1,9 @@
+from datetime import datetime, timedelta
+from typing import Any, Iterable
+from django.conf import settings
+from django.db import connection, transaction
 from django.db.models import QuerySet
+from django.utils import timezone
 
 from scraper.tests.factories import (
     PartyFactory,
@@ -9,16 +14,39 @@ from analyzer.analysis import calculate_party_participation_rate
 from scraper.models import Party, VoteType, ParliamentaryItem
 from scraper.tests.fixtures.utils_fixtures import PARTIES
 import random
+import uuid
 
 
-def generate_parties() -> QuerySet[Party]:
-    """Will generate 15 parties defined in PARTIES dict"""
-    for abbreviation, name in PARTIES.items():
+def party_names(count: int | None = None) -> list[tuple[str, str]]:
+    """
+    Abbreviations and names of the 15 parties defined in PARTIES dict, or of
+    `count` parties: the PARTIES first, followed by numbered parties.
+    """
+    names = list(PARTIES.items())
+    if count is None:
+        return names
+    return names[:count] + [
+        (f"P{number}", f"Party {number}")
+        for number in range(len(names) + 1, count + 1)
+    ]
+
+
+def generate_parties(count: int | None = None) -> QuerySet[Party]:
+    """Will generate the parties of `party_names`"""
+    for abbreviation, name in party_names(count):
         PartyFactory(abbreviation=abbreviation, name=name)
 
     return Party.objects.all()
 
 
+def build_parties(count: int | None = None) -> list[Party]:
+    """Will build unsaved parties of `party_names`"""
+    return [
+        PartyFactory.build(abbreviation=abbreviation, name=name)
+        for abbreviation, name in party_names(count)
+    ]
+
+
 def generate_parliamentary_items(count: int = 5) -> QuerySet[ParliamentaryItem]:
     for _ in range(count):
         ParliamentaryItemFactory()
@@ -64,3 +92,99 @@ def generate_party_votes(
 
     if calculate_participation_rate:
         calculate_party_participation_rate()
+
+
+def generate_besluit_records(
+    parties: Iterable[Party], count: int, rng: random.Random | None = None
+) -> list[dict[str, Any]]:
+    """
+    Generate Besluit records in the format of the OData API, each with a
+    Motie Zaak built by ParliamentaryItemFactory and a vote of every party.
+    The records are modified after IMPORT_START_DATE, so a first import
+    requests all of them.
+
+    :param parties: Iterable[Party]: The parties that vote
+    :param count: int: The number of records
+    :param rng: random.Random | None: Source of the votes and dates, for
+        reproducible records
+    :return: list[dict[str, Any]]: The records
+    """
+    rng = rng or random.Random()
+    api_ids = [party.api_id for party in parties]
+    start: datetime = settings.IMPORT_START_DATE
+    span = max((timezone.now() - start).total_seconds(), 0)
+    records: list[dict[str, Any]] = []
+    for _ in range(count):
+        item = ParliamentaryItemFactory.build(
+            date=start + timedelta(seconds=rng.uniform(1, span))
+        )
+        date = item.date.isoformat()
+        votes = [rng.choice(["Voor", "Tegen"]) for _ in api_ids]
+        passed = votes.count("Voor") > len(votes) / 2
+        records.append(
+            {
+                "Id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "Agendapunt_Id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "BesluitSoort": (
+                    "Stemmen - aangenomen" if passed else "Stemmen - verworpen"
+                ),
+                "BesluitTekst": "Aangenomen." if passed else "Verworpen.",
+                "GewijzigdOp": date,
+                "StemmingsSoort": "Met handopsteken",
+                "Zaak": [
+                    {
+                        "Id": item.api_id,
+                        "Soort": "Motie",
+                        "Titel": item.title,
+                        "Onderwerp": item.title,
+                        "Vergaderjaar": f"{item.date.year}-{item.date.year + 1}",
+                        "GestartOp": date,
+                        "GewijzigdOp": date,
+                    }
+                ],
+                "Stemming": [
+                    {"Fractie_Id": api_id, "Soort": vote, "Vergissing": False}
+                    for api_id, vote in zip(api_ids, votes)
+                ],
+                "Verwijderd": False,
+            }
+        )
+    return records
+
+
+def generate_fractie_records(parties: Iterable[Party]) -> list[dict[str, Any]]:
+    """
+    Generate active Fractie records in the format of the OData API.
+
+    :param parties: Iterable[Party]: The parties
+    :return: list[dict[str, Any]]: The records
+    """
+    return [
+        {
+            "Id": party.api_id,
+            "Afkorting": party.abbreviation,
+            "NaamNL": party.name,
+            "NaamEN": party.name,
+            "AantalZetels": 1,
+            "AantalStemmen": 10000,
+            "DatumActief": "2001-03-15T00:00:00+01:00",
+            "DatumInactief": None,
+            "GewijzigdOp": "2023-12-14T10:21:08+01:00",
+            "Verwijderd": False,
+        }
+        for party in parties
+    ]
+
+
+def explain(queryset: QuerySet[Any]) -> str:
+    """
+    Return the query plan of a QuerySet.
+
+    On PostgreSQL sequential scans are disabled for the query, since the
+    planner prefers them on the tiny tables of the test database.
+    """
+    if connection.vendor != "postgresql":
+        return queryset.explain()
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
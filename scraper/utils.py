@@ -1,24 +1,107 @@
-from typing import Any
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from typing import Any, Iterable, Iterator, Mapping, TypeVar
+import time
 import requests
-from scraper.models import Party, PartyVote, ParliamentaryItem
+from requests.adapters import HTTPAdapter
+from scraper.models import ImportRun, Party, PartyVote, ParliamentaryItem
 from scraper.dto import (
     FractieDTO,
     AgendapuntZaakBesluitVolgordeDTO,
     StemmingDTO,
 )
+from scraper.versions import IMPORT_DATA, bump_data_version
 from scraper.mapper import (
     party_from_dto,
     parliamentary_item_from_dto,
     party_vote_from_dto,
 )
+from django.conf import settings
 from django.db import transaction
+from django.db.models import Max, Q
+from django.utils import timezone
 import logging
 
 
 logger = logging.getLogger(__name__)
 
 
-API_URL: str = "https://gegevensmagazijn.tweedekamer.nl/OData/v4/2.0/"
+DEFAULT_BATCH_SIZE: int = 500
+DEFAULT_CONCURRENCY: int = 4
+DEFAULT_MAX_RETRIES: int = 3
+DEFAULT_BACKOFF: float = 1.0
+DEFAULT_TIMEOUT: float = 60.0
+RETRY_STATUS_CODES: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+
+T = TypeVar("T")
+
+
+def chunked(iterable: Iterable[T], size: int) -> Iterator[list[T]]:
+    """
+    Yield successive lists of at most `size` elements from `iterable`.
+    """
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def build_session(pool_size: int = DEFAULT_CONCURRENCY) -> requests.Session:
+    """
+    Create an HTTP session that keeps up to `pool_size` connections alive.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(
+        {"Accept": "application/json", "Accept-Encoding": "gzip, deflate"}
+    )
+    return session
+
+
+def max_modified(
+    records: Iterable[Mapping[str, Any]], current: datetime | None = None
+) -> datetime | None:
+    """
+    Return the highest `GewijzigdOp` of `records`, or `current` when that is
+    higher or no record has one.
+    """
+    values: list[datetime] = [
+        datetime.fromisoformat(str(data["GewijzigdOp"]))
+        for data in records
+        if data.get("GewijzigdOp")
+    ]
+    if current is not None:
+        values.append(current)
+    return max(values, default=None)
+
+
+@dataclass
+class ImportStats:
+    """
+    Number of rows inserted, updated and left unchanged by an import.
+    """
+
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+
+@dataclass
+class VoteImportResult:
+    """
+    Result of `ParliamentApi.import_votes`.
+
+    Attributes:
+        items (ImportStats): Counts for `ParliamentaryItem` rows.
+        votes (ImportStats): Counts for `PartyVote` rows.
+    """
+
+    items: ImportStats = field(default_factory=ImportStats)
+    votes: ImportStats = field(default_factory=ImportStats)
 
 
 class ParliamentApi:
@@ -34,22 +117,134 @@ class ParliamentApi:
             parliamentary items and party votes.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        timeout: float = DEFAULT_TIMEOUT,
+        api_url: str | None = None,
+    ) -> None:
         """
         Initialize the ParliamentApi client with the base API URL.
+
+        Args:
+            batch_size (int): Number of rows prefetched and written per
+                query by the bulk import.
+            concurrency (int): Maximum number of pages fetched at the same
+                time. Use 1 to follow `@odata.nextLink` one page at a time.
+            max_retries (int): Number of times a failed page request is
+                retried.
+            backoff (float): Seconds to wait before the first retry. The wait
+                doubles with every retry.
+            timeout (float): Seconds to wait for a response.
+            api_url (str | None): Base url of the OData API. Defaults to the
+                `PARLIAMENT_API_URL` setting.
         """
-        self.api_url: str = API_URL
+        api_url = api_url or settings.PARLIAMENT_API_URL
+        self.api_url: str = api_url.rstrip("/") + "/"
+        self.batch_size: int = batch_size
+        self.concurrency: int = max(1, concurrency)
+        self.max_retries: int = max_retries
+        self.backoff: float = backoff
+        self.timeout: float = timeout
+        self.session: requests.Session = build_session(self.concurrency)
 
-    def fetch(
+    def get_page(self, url: str, params: dict[str, str]) -> dict[str, Any]:
+        """
+        Fetch a single page, retrying failed requests with exponential
+        backoff.
+
+        Connection errors, timeouts and the status codes in
+        `RETRY_STATUS_CODES` are retried up to `max_retries` times.
+
+        Raises:
+            requests.exceptions.RequestException: If the last attempt fails.
+        """
+        attempt: int = 0
+        while True:
+            error: str
+            try:
+                r = self.session.get(url, params=params, timeout=self.timeout)
+                if (
+                    r.status_code not in RETRY_STATUS_CODES
+                    or attempt >= self.max_retries
+                ):
+                    r.raise_for_status()
+                    payload: dict[str, Any] = r.json()
+                    return payload
+                error = f"HTTP {r.status_code}"
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.max_retries:
+                    raise
+                error = str(e)
+
+            logger.warning(
+                f"Retrying page request for {url}",
+                extra={"url": url, "attempt": attempt, "error": error},
+            )
+            time.sleep(self.backoff * 2**attempt)
+            attempt += 1
+
+    def build_request(
         self,
         object_name: str,
         filters: list[str] | None = None,
         expand: list[str] | None = None,
         order_by: str | None = None,
         top: int | None = None,
-    ) -> list[dict[str, str | int | None | bool]]:
+    ) -> tuple[str, dict[str, str]]:
         """
-        Fetch data from the Dutch Parliament OData API.
+        Build the url and query parameters for the first page of a request.
+
+        When `concurrency` is above 1 and there is no `top`, the total count
+        is requested as well (`$count`), see `fetch_pages`. The ordering is
+        left as given.
+
+        See `fetch_pages` for a description of the arguments.
+        """
+        # Get base url
+        url = f"{self.api_url}{object_name}"
+
+        # Include url parameters
+        optional_params = {
+            "$format": "application/json",
+            "$filter": " and ".join(filters) if filters else None,
+            "$expand": ",".join(expand) if expand else None,
+            "$orderby": order_by if order_by else None,
+            "$top": str(top) if top else None,
+        }
+        params = {k: v for k, v in optional_params.items() if v is not None}
+        if self.concurrency > 1 and not top:
+            params["$count"] = "true"
+        return url, params
+
+    def fetch_pages(
+        self,
+        object_name: str,
+        filters: list[str] | None = None,
+        expand: list[str] | None = None,
+        order_by: str | None = None,
+        top: int | None = None,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """
+        Fetch data from the Dutch Parliament OData API, one page at a time.
+
+        When `concurrency` is above 1, the first page also requests the total
+        count (`$count`). If the server returns it, the remaining pages are
+        requested with `$skip` over a pool of `concurrency` workers, with at
+        most `concurrency` pages in flight. Otherwise `@odata.nextLink` is
+        followed one page at a time. Either way the pages are yielded in
+        order.
+
+        Pages requested with `$skip` only line up with a stable ordering. So
+        when the caller gave no `order_by` and the result spans more than
+        one page, the first page is requested again ordered by `Id`. All
+        pages are then requested with `$orderby=Id`, next to the `$filter`
+        and `$expand` of the request, and the records come in `Id` order
+        instead of the server's default order. Single page results and the
+        serial path keep the requested ordering.
 
         Args:
             object_name (str): The name of the object to fetch (e.g.,
@@ -60,76 +255,132 @@ class ParliamentApi:
             order_by (str | None): Optional field to order the results by.
             top (int | None): Optional limit on the number of results to fetch.
 
-        Returns:
-            list[dict[str, str | int | None | bool]]: A list of dictionaries
-            representing the fetched data.
+        Yields:
+            list[dict[str, Any]]: The records of a single page.
 
         Raises:
             requests.exceptions.RequestException: If the API request fails.
         """
+        url, params = self.build_request(
+            object_name, filters, expand, order_by, top
+        )
+        payload = self.get_page(url, params)
+        first_page: list[dict[str, Any]] = list(payload.get("value", []))
+        next_page = payload.get("@odata.nextLink")
+        total = payload.get("@odata.count")
+        page_size: int = len(first_page)
 
-        # Get base url
-        url = f"{self.api_url}{object_name}"
+        if "$count" in params and next_page and total is not None and page_size:
+            page_params = {k: v for k, v in params.items() if k != "$count"}
+            if "$orderby" not in page_params:
+                # The first page came in the server's default order.
+                page_params["$orderby"] = "Id"
+                payload = self.get_page(url, page_params)
+                first_page = list(payload.get("value", []))
+            yield first_page
+            skips = iter(range(page_size, int(total), page_size))
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                in_flight: deque[Future[dict[str, Any]]] = deque()
+                for skip in skips:
+                    in_flight.append(
+                        executor.submit(
+                            self.get_page,
+                            url,
+                            {**page_params, "$skip": str(skip)},
+                        )
+                    )
+                    if len(in_flight) < self.concurrency:
+                        continue
+                    yield list(in_flight.popleft().result().get("value", []))
+                while in_flight:
+                    yield list(in_flight.popleft().result().get("value", []))
+            return
 
-        # Include url parameters
-        params = {
-            "$format": "application/json",
-            "$filter": " and ".join(filters) if filters else None,
-            "$expand": ",".join(expand) if expand else None,
-            "$orderby": order_by if order_by else None,
-            "$top": str(top) if top else None,
-        }
-        params = {k: v for k, v in params.items() if v is not None}
+        yield first_page
+        while next_page:
+            payload = self.get_page(next_page, {})
+            yield list(payload.get("value", []))
+            next_page = payload.get("@odata.nextLink")
 
-        # Iterate over pages
-        items: list[dict[str, Any]] = []
-        while True:
-            r = requests.get(url, params=params)
-            r.raise_for_status()
-            payload = r.json()
-            items.extend(payload.get("value", []))
+    def fetch_iter(
+        self,
+        object_name: str,
+        filters: list[str] | None = None,
+        expand: list[str] | None = None,
+        order_by: str | None = None,
+        top: int | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Fetch data from the Dutch Parliament OData API, one record at a time.
 
-            next_page = payload.get("@odata.nextLink")
-            if not next_page:
-                break
+        Pages are only requested as the records are consumed, so at most a
+        few pages are held in memory. See `fetch_pages` for the arguments.
+        """
+        for page in self.fetch_pages(
+            object_name, filters, expand, order_by, top
+        ):
+            yield from page
 
-            url, params = next_page, {}
+    def fetch(
+        self,
+        object_name: str,
+        filters: list[str] | None = None,
+        expand: list[str] | None = None,
+        order_by: str | None = None,
+        top: int | None = None,
+    ) -> list[dict[str, str | int | None | bool]]:
+        """
+        Fetch data from the Dutch Parliament OData API.
 
-        return items
+        See `fetch_pages` for the arguments and how pages are requested.
 
-    def import_parties(self) -> None:
+        Returns:
+            list[dict[str, str | int | None | bool]]: A list of dictionaries
+            representing the fetched data.
+
+        Raises:
+            requests.exceptions.RequestException: If the API request fails.
+        """
+        return list(
+            self.fetch_iter(object_name, filters, expand, order_by, top)
+        )
+
+    def import_parties(self) -> ImportStats:
         """
         Import active parties from the API into the local database.
 
         Fetches party data from the API, converts it into DTOs, and updates or
         creates corresponding `Party` model instances in the database.
 
-        Ensures database integrity by using an atomic transaction.
+        The records are consumed in chunks of `batch_size`; every chunk is
+        written with a single bulk upsert in its own atomic transaction.
+
+        Returns:
+            ImportStats: The inserted, updated and unchanged party counts.
         """
-        filters: list[str] = ["Verwijderd eq false", "DatumInactief eq null"]
-        party_data: list[dict[str, str | int | None | bool]] = self.fetch(
-            object_name="Fractie", filters=filters, order_by=None
-        )
-        with transaction.atomic():
-            for data in party_data:
-                fractie_dto: FractieDTO = FractieDTO.from_api(data)
+        stats = ImportStats()
+        for chunk in chunked(
+            self.fetch_iter(**self.party_request()), self.batch_size
+        ):
+            with transaction.atomic():
+                self._bulk_import_parties(chunk, stats)
 
-                try:
-                    Party.objects.update_or_create(
-                        api_id=fractie_dto.Id,
-                        defaults=party_from_dto(fractie_dto),
-                    )
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to import party data for {fractie_dto.NaamNL} with id {fractie_dto.Id}",
-                        extra={
-                            "party_id": fractie_dto.Id,
-                            "party_name": fractie_dto.NaamNL,
-                            "error": str(e),
-                        },
-                    )
-                    continue
+        self._fix_party_ids()
+        return stats
+
+    @staticmethod
+    def party_request() -> dict[str, Any]:
+        """
+        Return the `fetch` arguments for the active parties.
+        """
+        return {
+            "object_name": "Fractie",
+            "filters": ["Verwijderd eq false", "DatumInactief eq null"],
+            "order_by": None,
+        }
 
+    @staticmethod
+    def _fix_party_ids() -> None:
         # FIXME - remove when bug fixed
         try:
             vijftigplus = Party.objects.get(abbreviation="50PLUS")
@@ -138,7 +389,107 @@ class ParliamentApi:
         except Party.DoesNotExist:
             pass
 
-    def import_votes(self) -> None:
+    def _bulk_import_parties(
+        self, party_data: list[dict[str, Any]], stats: ImportStats
+    ) -> None:
+        """
+        Insert or update a chunk of parties, keyed by `api_id`.
+
+        Parties whose name or abbreviation is already used by another party
+        are skipped with a warning, since they would violate the unique
+        constraints.
+        """
+        update_fields: list[str] = ["name", "abbreviation"]
+        dtos: list[FractieDTO] = [
+            FractieDTO.from_api(data) for data in party_data
+        ]
+        values: dict[str, dict[str, str]] = {
+            dto.Id: party_from_dto(dto) for dto in dtos
+        }
+        existing: dict[str, Party] = {
+            party.api_id: party
+            for party in Party.objects.filter(api_id__in=values.keys())
+        }
+        # Owner (api_id) of every name and abbreviation that is in use.
+        owners: dict[tuple[str, str], str] = {}
+        for api_id, name, abbreviation in Party.objects.filter(
+            Q(name__in=[v["name"] for v in values.values()])
+            | Q(abbreviation__in=[v["abbreviation"] for v in values.values()])
+        ).values_list("api_id", "name", "abbreviation"):
+            owners[("name", name)] = api_id
+            owners[("abbreviation", abbreviation)] = api_id
+
+        to_write: list[Party] = []
+        for dto in dtos:
+            fields = values[dto.Id]
+            conflicts = [
+                name
+                for name in update_fields
+                if owners.get((name, fields[name]), dto.Id) != dto.Id
+            ]
+            if conflicts:
+                logger.warning(
+                    f"Failed to import party data for {dto.NaamNL} with id {dto.Id}",
+                    extra={
+                        "party_id": dto.Id,
+                        "party_name": dto.NaamNL,
+                        "error": f"{', '.join(conflicts)} already in use",
+                    },
+                )
+                continue
+            for name in update_fields:
+                owners[(name, fields[name])] = dto.Id
+
+            current = existing.get(dto.Id)
+            if current is None:
+                stats.inserted += 1
+            elif all(
+                getattr(current, name) == fields[name] for name in update_fields
+            ):
+                stats.unchanged += 1
+                continue
+            else:
+                stats.updated += 1
+            to_write.append(Party(**fields))
+
+        if to_write:
+            bump_data_version(IMPORT_DATA)
+            Party.objects.bulk_create(
+                to_write,
+                update_conflicts=True,
+                unique_fields=["api_id"],
+                update_fields=update_fields,
+            )
+
+    @staticmethod
+    def get_modified_since(entity: str, full: bool = False) -> datetime:
+        """
+        Return the `GewijzigdOp` lower bound for the next import of `entity`.
+
+        This is the watermark of the previous finished import minus
+        `IMPORT_WATERMARK_OVERLAP`, or `IMPORT_START_DATE` for the first
+        import and for full imports.
+
+        Args:
+            entity (str): The OData entity name (e.g., "Besluit").
+            full (bool): Ignore the previous watermark.
+
+        Returns:
+            datetime: Records modified after this moment should be imported.
+        """
+        start: datetime = settings.IMPORT_START_DATE
+        if full:
+            return start
+        watermark: datetime | None = ImportRun.objects.filter(
+            entity=entity, finished_at__isnull=False
+        ).aggregate(watermark=Max("watermark"))["watermark"]
+        if watermark is None:
+            return start
+        return max(start, watermark - settings.IMPORT_WATERMARK_OVERLAP)
+
+    def import_votes(
+        self, bulk: bool = True, full: bool = False
+    ) -> VoteImportResult:
         """
         Fetch parliamentary decisions and associated votes from the API.
 
@@ -146,56 +497,333 @@ class ParliamentApi:
         and updates or creates corresponding `ParliamentaryItem` and `PartyVote` model
         instances in the database.
 
-        Ensures database integrity by using an atomic transaction.
+        The records are consumed in chunks of `batch_size`, so only a few
+        pages are held in memory. Every chunk is written in its own atomic
+        transaction. The watermark is only recorded once all chunks are
+        written, so an interrupted import is repeated by the next run.
         Skips votes for unknown parties.
 
         Parties that did not vote (and are not included in the data, even as
         abstains) are marked as abstaining.
+
+        Only decisions modified since the previous import are requested (see
+        `get_modified_since`). The import is recorded as an `ImportRun` with
+        the highest `GewijzigdOp` seen as its watermark.
+
+        Args:
+            bulk (bool): Prefetch the existing rows and write the inserts and
+                changes with `bulk_create` in batches of `batch_size`. When
+                False, every row is written with `update_or_create`.
+            full (bool): Ignore the previous watermark and request every
+                decision modified since `IMPORT_START_DATE`.
+
+        Returns:
+            VoteImportResult: The inserted, updated and unchanged row counts.
         """
-        filters: list[str] = [
-            "GewijzigdOp gt 2025-11-01T00:00:00+01:00",
-            "StemmingsSoort ne null",
-        ]
-        order_by: str = ""
-        expand: list[str] = [
-            "Zaak($filter=Soort eq 'Motie')",
-            "Stemming($filter=Vergissing eq false;$select=Soort,Fractie_Id)",
-        ]
-        vote_data = self.fetch(
-            object_name="Besluit",
-            filters=filters,
-            order_by=order_by,
-            expand=expand,
+        request = self.vote_request(full=full)
+        # Created up front, so failed imports remain visible as unfinished.
+        import_run = ImportRun.objects.create(
+            entity=request["object_name"], full=full
         )
         party_lookup = {p.api_id: p for p in Party.objects.all()}
 
+        result = VoteImportResult()
+        for chunk in chunked(self.fetch_iter(**request), self.batch_size):
+            self._write_vote_chunk(
+                chunk, party_lookup, result, import_run, bulk=bulk
+            )
+
+        self._finish_vote_import(import_run, result)
+        return result
+
+    def vote_request(self, full: bool = False) -> dict[str, Any]:
+        """
+        Return the `fetch` arguments for the decisions and votes modified
+        since the previous import (see `get_modified_since`).
+        """
+        entity: str = "Besluit"
+        modified_since: datetime = self.get_modified_since(entity, full=full)
+        return {
+            "object_name": entity,
+            "filters": [
+                f"GewijzigdOp gt {modified_since.isoformat(timespec='seconds')}",
+                "StemmingsSoort ne null",
+            ],
+            "order_by": "",
+            "expand": [
+                "Zaak($filter=Soort eq 'Motie')",
+                "Stemming($filter=Vergissing eq false;$select=Soort,Fractie_Id)",
+            ],
+        }
+
+    def _write_vote_chunk(
+        self,
+        chunk: list[dict[str, Any]],
+        party_lookup: dict[str, Party],
+        result: VoteImportResult,
+        import_run: ImportRun,
+        bulk: bool = True,
+    ) -> None:
+        """
+        Write a chunk of decisions in one atomic transaction and track it on
+        the import run.
+        """
         with transaction.atomic():
-            for data in vote_data:
-                # Skip if no Zaak linked
-                if not data.get("Zaak"):
+            if bulk:
+                self._bulk_import_votes(chunk, party_lookup, result)
+            else:
+                self._row_import_votes(chunk, party_lookup, result)
+
+        import_run.records += len(chunk)
+        import_run.watermark = max_modified(chunk, import_run.watermark)
+
+    @staticmethod
+    def _finish_vote_import(
+        import_run: ImportRun, result: VoteImportResult
+    ) -> None:
+        """
+        Mark the import run as finished, which makes its watermark effective,
+        and bump the import data version if anything changed.
+        """
+        import_run.finished_at = timezone.now()
+        import_run.save()
+        if any(
+            stats.inserted or stats.updated
+            for stats in (result.items, result.votes)
+        ):
+            bump_data_version(IMPORT_DATA)
+
+        logger.info(
+            "Imported vote data",
+            extra={
+                "items_inserted": result.items.inserted,
+                "items_updated": result.items.updated,
+                "items_unchanged": result.items.unchanged,
+                "votes_inserted": result.votes.inserted,
+                "votes_updated": result.votes.updated,
+                "votes_unchanged": result.votes.unchanged,
+            },
+        )
+
+    @staticmethod
+    def _vote_party(
+        stemming_dto: StemmingDTO, party_lookup: dict[str, Party]
+    ) -> Party | None:
+        """
+        Return the party of a vote, or None for a party that is not imported,
+        which is logged.
+        """
+        party = party_lookup.get(stemming_dto.Fractie_Id)
+        if party is None:
+            logger.info(
+                "Skipping unknown party with id "
+                f"{stemming_dto.Fractie_Id} during vote import",
+                extra={"party_id": stemming_dto.Fractie_Id},
+            )
+        return party
+
+    def _row_import_votes(
+        self,
+        vote_data: list[dict[str, Any]],
+        party_lookup: dict[str, Party],
+        result: VoteImportResult,
+    ) -> None:
+        """
+        Write the vote data one row at a time with `update_or_create`.
+
+        Rows that were not created are counted as updated, since
+        `update_or_create` does not report whether anything changed.
+        """
+        for data in vote_data:
+            # Skip if no Zaak linked
+            if not data.get("Zaak"):
+                continue
+            azb_dto: AgendapuntZaakBesluitVolgordeDTO = (
+                AgendapuntZaakBesluitVolgordeDTO.from_api(data)
+            )
+            parliamentary_item, created = (
+                ParliamentaryItem.objects.update_or_create(
+                    api_id=azb_dto.Zaak[0].Id,
+                    defaults=parliamentary_item_from_dto(azb_dto),
+                )
+            )
+            if created:
+                result.items.inserted += 1
+            else:
+                result.items.updated += 1
+
+            stemming_dto: StemmingDTO
+            for stemming_dto in azb_dto.Stemming:
+                party = self._vote_party(stemming_dto, party_lookup)
+                if party is None:
                     continue
-                azb_dto: AgendapuntZaakBesluitVolgordeDTO = (
-                    AgendapuntZaakBesluitVolgordeDTO.from_api(data)
+
+                _, created = PartyVote.objects.update_or_create(
+                    party=party,
+                    parliamentary_item=parliamentary_item,
+                    defaults=party_vote_from_dto(stemming_dto),
                 )
-                parliamentary_item: ParliamentaryItem = (
-                    ParliamentaryItem.objects.update_or_create(
-                        api_id=azb_dto.Zaak[0].Id,
-                        defaults=parliamentary_item_from_dto(azb_dto),
-                    )[0]
+                if created:
+                    result.votes.inserted += 1
+                else:
+                    result.votes.updated += 1
+
+    def _bulk_import_votes(
+        self,
+        vote_data: list[dict[str, Any]],
+        party_lookup: dict[str, Party],
+        result: VoteImportResult,
+    ) -> None:
+        """
+        Write the vote data with batched prefetches and `bulk_create` upserts.
+
+        The data is first reduced in memory to one set of values per
+        parliamentary item and per (item, party) pair. When the same item
+        occurs more than once, the last occurrence wins, just like it does
+        when writing row by row.
+        """
+        items: dict[str, dict[str, Any]] = {}
+        votes: dict[tuple[str, int], str] = {}
+        for data in vote_data:
+            # Skip if no Zaak linked
+            if not data.get("Zaak"):
+                continue
+            azb_dto: AgendapuntZaakBesluitVolgordeDTO = (
+                AgendapuntZaakBesluitVolgordeDTO.from_api(data)
+            )
+            item_api_id: str = azb_dto.Zaak[0].Id
+            items[item_api_id] = parliamentary_item_from_dto(azb_dto)
+
+            stemming_dto: StemmingDTO
+            for stemming_dto in azb_dto.Stemming:
+                party = self._vote_party(stemming_dto, party_lookup)
+                if party is None:
+                    continue
+                votes[(item_api_id, party.id)] = party_vote_from_dto(
+                    stemming_dto
+                )["vote"]
+
+        item_ids = self._bulk_upsert_items(items, result.items)
+        self._bulk_upsert_votes(
+            {
+                (item_ids[item_api_id], party_id): vote
+                for (item_api_id, party_id), vote in votes.items()
+            },
+            result.votes,
+        )
+
+    def _bulk_upsert_items(
+        self, items: dict[str, dict[str, Any]], stats: ImportStats
+    ) -> dict[str, int]:
+        """
+        Insert or update parliamentary items, keyed by `api_id`.
+
+        Args:
+            items (dict[str, dict[str, Any]]): Model field values per api_id.
+            stats (ImportStats): Counts to update.
+
+        Returns:
+            dict[str, int]: The database id for every api_id in `items`.
+        """
+        update_fields: list[str] = ["title", "date", "item_type", "status"]
+        item_ids: dict[str, int] = {}
+        for batch in chunked(items.items(), self.batch_size):
+            existing: dict[str, ParliamentaryItem] = {
+                item.api_id: item
+                for item in ParliamentaryItem.objects.filter(
+                    api_id__in=[api_id for api_id, _ in batch]
+                ).only("id", "api_id", *update_fields)
+            }
+            to_write: list[ParliamentaryItem] = []
+            for api_id, values in batch:
+                current = existing.get(api_id)
+                if current is None:
+                    stats.inserted += 1
+                elif all(
+                    getattr(current, name) == values[name]
+                    for name in update_fields
+                ):
+                    stats.unchanged += 1
+                    item_ids[api_id] = current.id
+                    continue
+                else:
+                    stats.updated += 1
+                    item_ids[api_id] = current.id
+                to_write.append(ParliamentaryItem(**values))
+
+            if not to_write:
+                continue
+            ParliamentaryItem.objects.bulk_create(
+                to_write,
+                update_conflicts=True,
+                unique_fields=["api_id"],
+                update_fields=update_fields,
+            )
+            # Not every database returns primary keys for upserted rows.
+            missing: list[str] = []
+            for item in to_write:
+                if item.pk is not None:
+                    item_ids.setdefault(item.api_id, item.pk)
+                elif item.api_id not in item_ids:
+                    missing.append(item.api_id)
+            if missing:
+                item_ids.update(
+                    ParliamentaryItem.objects.filter(
+                        api_id__in=missing
+                    ).values_list("api_id", "id")
                 )
-                stemming_dto: StemmingDTO
-                for stemming_dto in azb_dto.Stemming:
-
-                    party = party_lookup.get(stemming_dto.Fractie_Id)
-                    if party is None:
-                        logger.info(
-                            f"Skipping unknown party with id {stemming_dto.Fractie_Id} during vote import",
-                            extra={"party_id": stemming_dto.Fractie_Id},
-                        )
-                        continue
+        return item_ids
+
+    def _bulk_upsert_votes(
+        self, votes: dict[tuple[int, int], str], stats: ImportStats
+    ) -> None:
+        """
+        Insert or update party votes, keyed by (parliamentary_item, party).
+
+        Args:
+            votes (dict[tuple[int, int], str]): Vote per (item id, party id).
+            stats (ImportStats): Counts to update.
+        """
+        votes_per_item: dict[int, list[tuple[int, str]]] = {}
+        for (item_id, party_id), vote in votes.items():
+            votes_per_item.setdefault(item_id, []).append((party_id, vote))
 
-                    PartyVote.objects.update_or_create(
-                        party=party_lookup[stemming_dto.Fractie_Id],
-                        parliamentary_item=parliamentary_item,
-                        defaults=party_vote_from_dto(stemming_dto),
+        # Batches hold roughly `batch_size` votes, but never split an item.
+        if not votes_per_item:
+            return
+        votes_per_item_avg: int = max(1, len(votes) // len(votes_per_item))
+        items_per_batch: int = max(1, self.batch_size // votes_per_item_avg)
+        for item_batch in chunked(votes_per_item.keys(), items_per_batch):
+            existing: dict[tuple[int, int], str] = {
+                (item_id, party_id): vote
+                for item_id, party_id, vote in PartyVote.objects.filter(
+                    parliamentary_item_id__in=item_batch
+                ).values_list("parliamentary_item_id", "party_id", "vote")
+            }
+            to_write: list[PartyVote] = []
+            for item_id in item_batch:
+                for party_id, vote in votes_per_item[item_id]:
+                    current = existing.get((item_id, party_id))
+                    if current is None:
+                        stats.inserted += 1
+                    elif current == vote:
+                        stats.unchanged += 1
+                        continue
+                    else:
+                        stats.updated += 1
+                    to_write.append(
+                        PartyVote(
+                            parliamentary_item_id=item_id,
+                            party_id=party_id,
+                            vote=vote,
+                        )
                     )
+
+            if to_write:
+                PartyVote.objects.bulk_create(
+                    to_write,
+                    batch_size=self.batch_size,
+                    update_conflicts=True,
+                    unique_fields=["party", "parliamentary_item"],
+                    update_fields=["vote"],
+                )
@@ -0,0 +1,60 @@
+from datetime import datetime
+from typing import Iterable
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from scraper.models import DataVersion
+
+
+# Parties, items and votes, changed by the imports.
+IMPORT_DATA: str = "import"
+# PCA analyses and their scores, loadings and rankings.
+ANALYSIS_DATA: str = "analysis"
+
+
+def bump_data_version(name: str) -> None:
+    """
+    Increment the version of the `name` data once the current transaction
+    commits, or right away outside a transaction.
+    """
+    transaction.on_commit(lambda: increment_data_version(name))
+
+
+def increment_data_version(name: str) -> None:
+    """
+    Increment the version of the `name` data with a single update, creating
+    the version the first time.
+    """
+    now = timezone.now()
+    updated = DataVersion.objects.filter(name=name).update(
+        version=F("version") + 1, updated_at=now
+    )
+    if updated:
+        return
+    try:
+        with transaction.atomic():
+            DataVersion.objects.create(name=name, version=1, updated_at=now)
+    except IntegrityError:
+        # Created by a concurrent bump in the meantime.
+        increment_data_version(name)
+
+
+def get_data_versions(
+    names: Iterable[str],
+) -> tuple[dict[str, int], datetime | None]:
+    """
+    Return the versions of the given data with one query.
+
+    Returns:
+        tuple[dict[str, int], datetime | None]: The version per name, 0 for
+        data that was never bumped, and the last time any of them changed.
+    """
+    names = list(names)
+    versions: dict[str, int] = dict.fromkeys(names, 0)
+    updated_at: datetime | None = None
+    for name, version, changed_at in DataVersion.objects.filter(
+        name__in=names
+    ).values_list("name", "version", "updated_at"):
+        versions[name] = version
+        updated_at = max(changed_at, updated_at or changed_at)
+    return versions, updated_at